@@ -0,0 +1,63 @@
+"""
+Benchmark of calculate_factorial and the factorials batch API.
+
+The "loop" column is the multiply loop calculate_factorial used to run, the
+"binary split" column the current calculate_factorial and the "math" column
+math.factorial. The batch rows compare computing a run of nearby inputs one
+by one with a single factorials() call.
+
+Usage:
+    python benchmarks/factorial.py [--n N ...] [--loop-limit N] [--batch N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+# Add the project root to the path so we can import the utilities
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import calculate_factorial, factorials
+
+
+def loop_factorial(n: int) -> int:
+    """The multiply loop calculate_factorial used before binary splitting."""
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+def seconds(function, *args) -> float:
+    """Time one call."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Print seconds per factorial for each implementation."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="inputs to time")
+    parser.add_argument("--loop-limit", type=int, default=100_000, help="largest input timed with the loop")
+    parser.add_argument("--batch", type=int, default=50, help="number of consecutive inputs in the batch rows")
+    args = parser.parse_args()
+    
+    print(f"{'n':>10}{'loop':>12}{'binary split':>14}{'math':>12}")
+    for n in args.n:
+        loop = f"{seconds(loop_factorial, n):.3f}" if n <= args.loop_limit else "-"
+        print(f"{n:>10}{loop:>12}{seconds(calculate_factorial, n):>14.3f}{seconds(math.factorial, n):>12.3f}")
+    
+    base = min(args.n)
+    batch = list(range(base, base + args.batch))
+    one_by_one = seconds(lambda: [calculate_factorial(n) for n in batch])
+    print()
+    print(f"{'batch of ' + str(args.batch) + ' from ' + str(base):<28}{'seconds':>10}")
+    print(f"{'calculate_factorial each':<28}{one_by_one:>10.3f}")
+    print(f"{'factorials()':<28}{seconds(factorials, batch):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Benchmark of the git overhead of an orchestrated task.
+
+Each simulated task writes a file, creates or switches to a branch, stages
+everything and commits, which is what the OrchestratorAgent asks the GitAgent
+to do. The "before" column replays the git commands the GitAgent used to run
+(a `git rev-parse` check before every operation and a second checkout when
+the branch already exists); the "after" column uses the current GitAgent.
+
+Usage:
+    python benchmarks/git_overhead.py [--tasks N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the project root to the path so we can import the agents
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.git_agent import GitAgent
+
+BRANCHES = ["feature/factorial-function", "feature/calculator-page", "feature/create-api-agent"]
+
+
+class SpawnCounter:
+    """Counts git processes started through subprocess.run."""
+    
+    def __init__(self):
+        self.count = 0
+        self._run = subprocess.run
+    
+    def __enter__(self):
+        def counting_run(*args, **kwargs):
+            self.count += 1
+            return self._run(*args, **kwargs)
+        subprocess.run = counting_run
+        return self
+    
+    def __exit__(self, *exc_info):
+        subprocess.run = self._run
+
+
+def git(repo: str, *args: str) -> subprocess.CompletedProcess:
+    """Run a git command the way the GitAgent used to."""
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=repo)
+
+
+def legacy_task(repo: str, branch_name: str, message: str) -> None:
+    """Replay the git commands of one task before the cached repository view."""
+    git(repo, "rev-parse", "--is-inside-work-tree")
+    if git(repo, "checkout", "-b", branch_name).returncode != 0:
+        git(repo, "checkout", branch_name)
+    git(repo, "rev-parse", "--is-inside-work-tree")
+    git(repo, "add", ".")
+    git(repo, "rev-parse", "--is-inside-work-tree")
+    git(repo, "commit", "-m", message)
+
+
+def current_task(agent: GitAgent, branch_name: str, message: str) -> None:
+    """Run the git operations of one task through the GitAgent."""
+    agent.create_new_branch(branch_name)
+    agent.add_all_changes_to_staging()
+    agent.commit_changes(message)
+
+
+def make_repository(directory: str) -> str:
+    """Create a repository with one commit."""
+    repo = os.path.join(directory, "repo")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    git(repo, "config", "user.email", "bench@example.com")
+    git(repo, "config", "user.name", "bench")
+    with open(os.path.join(repo, "README.md"), "w") as file:
+        file.write("benchmark\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "initial")
+    return repo
+
+
+def measure(tasks: int, use_agent: bool) -> tuple:
+    """Run the simulated tasks and return (spawns per task, milliseconds per task)."""
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repository(directory)
+        agent = GitAgent(repo)
+        
+        # The GitAgent reports every operation with print(); keep the table readable
+        with SpawnCounter() as counter, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for index in range(tasks):
+                with open(os.path.join(repo, f"task_{index}.py"), "w") as file:
+                    file.write(f"VALUE = {index}\n")
+                branch_name = BRANCHES[index % len(BRANCHES)]
+                message = f"feat: task {index}"
+                if use_agent:
+                    current_task(agent, branch_name, message)
+                else:
+                    legacy_task(repo, branch_name, message)
+            elapsed = time.perf_counter() - start
+    
+    return counter.count / tasks, elapsed * 1000 / tasks
+
+
+def main():
+    """Print git overhead per task before and after."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=30, help="number of simulated tasks")
+    args = parser.parse_args()
+    
+    before = measure(args.tasks, use_agent=False)
+    after = measure(args.tasks, use_agent=True)
+    
+    print(f"{'':<22}{'before':>10}{'after':>10}")
+    print(f"{'git processes / task':<22}{before[0]:>10.2f}{after[0]:>10.2f}")
+    print(f"{'ms / task':<22}{before[1]:>10.1f}{after[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,47 +2,142 @@
 ApiAgent for the Genesis AI Framework.
 
 This agent is responsible for:
-1. Making GET requests to APIs
-2. Handling API responses
+1. Making GET requests to APIs over pooled, keep-alive connections with timeouts
+2. Answering repeated requests from the HTTP cache or revalidating them
+3. Making many GET requests concurrently, streaming their results back
+4. Streaming large responses under a size cap, spooling them to temporary files
+5. Handling API responses
 """
 
 import requests
-from typing import Dict, Any
-from google.adk.agents import Agent
+from typing import Dict, Any, Iterable, Iterator, Optional, Union
+from src.agents.registry import registry
+from src.tools.http_tools import (
+    DEFAULT_FETCH_WORKERS,
+    DEFAULT_INLINE_BYTES,
+    NDJSON_TYPES,
+    HttpClient,
+    HttpResponse,
+    http_client,
+    is_json_type
+)
+
+# Items of a spooled JSON array or NDJSON body included in a result as a preview
+PREVIEW_ITEMS = 10
 
 
 class ApiAgent:
     """Agent specialized in making API requests."""
     
-    def __init__(self):
-        """Initialize the API agent."""
-        pass
+    def __init__(self, client: Optional[HttpClient] = None):
+        """
+        Initialize the API agent.
+        
+        Args:
+            client (HttpClient, optional): Client sending the requests; defaults to the
+                shared pooled, caching client
+        """
+        self.client = client or http_client
     
-    def make_get_request(self, url: str) -> Dict[str, Any]:
+    def make_get_request(self, url: str, stream: bool = False, max_inline_bytes: int = DEFAULT_INLINE_BYTES,
+                         max_bytes: Optional[int] = None) -> Dict[str, Any]:
         """
         Make a GET request to the specified URL.
         
+        In streaming mode the body is read in chunks. A body larger than
+        max_inline_bytes is spooled to a temporary file, and the result carries its
+        "path" and "size" instead of the data, plus a "preview" of the first items
+        of a JSON array or NDJSON body. The caller deletes the file.
+        
         Args:
             url (str): The URL to make the GET request to
+            stream (bool): Whether to stream the body instead of caching it in memory
+            max_inline_bytes (int): Largest streamed body returned inline
+            max_bytes (int, optional): Largest streamed body accepted; None for no limit
             
         Returns:
-            Dict[str, Any]: The response from the API
+            Dict[str, Any]: The response from the API; "cache" says whether it was a
+                cache "hit", "revalidated" with the server, a "miss" or a streamed "bypass"
         """
         try:
-            response = requests.get(url)
+            if stream:
+                return self._result(self.client.stream(url, max_inline_bytes=max_inline_bytes, max_bytes=max_bytes))
+            return self._result(self.client.get(url))
+        except requests.exceptions.RequestException as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def make_get_requests(self, urls: Iterable[Union[str, Dict[str, Any]]], max_workers: int = DEFAULT_FETCH_WORKERS,
+                          per_host: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Make many GET requests concurrently, yielding each result as soon as it arrives.
+        
+        Duplicate URLs are requested once, and at most per_host requests run against
+        the same host at a time, so the whole batch takes about as long as its
+        slowest request.
+        
+        Args:
+            urls (Iterable[Union[str, Dict[str, Any]]]): URLs, or dicts with a "url" and
+                optional "headers" and "timeout"
+            max_workers (int): Requests running at the same time
+            per_host (int, optional): Requests running at the same time per host
+            
+        Yields:
+            Dict[str, Any]: The result of make_get_request plus the request's "index" and "url"
+        """
+        for fetched in self.client.fetch_many(urls, max_workers=max_workers, per_host=per_host):
+            if fetched.response is not None:
+                result = self._result(fetched.response)
+            else:
+                result = {"success": False, "error": fetched.error}
+            yield {"index": fetched.index, "url": fetched.url, **result}
+    
+    def _result(self, response: HttpResponse) -> Dict[str, Any]:
+        """
+        Turn a response into the result returned to callers.
+        
+        Args:
+            response (HttpResponse): The response
+            
+        Returns:
+            Dict[str, Any]: The result
+        """
+        is_json = is_json_type(response.content_type)
+        is_ndjson = response.content_type in NDJSON_TYPES
+        try:
             response.raise_for_status()  # Raise an exception for bad status codes
             
+            if response.path is not None:
+                return {
+                    "success": True,
+                    "status_code": response.status_code,
+                    "path": response.path,
+                    "size": response.size,
+                    "content_type": response.content_type,
+                    "preview": response.preview_json(PREVIEW_ITEMS),
+                    "cache": response.cache_status
+                }
+            if is_json:
+                data = response.json()
+            elif is_ndjson:
+                data = list(response.iter_json())
+            else:
+                data = response.text
             return {
                 "success": True,
                 "status_code": response.status_code,
-                "data": response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
+                "data": data,
+                "cache": response.cache_status
             }
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            response.discard()
             return {
                 "success": False,
                 "error": str(e)
             }
 
 
-# Create a global instance of the API agent
-api_agent = ApiAgent()
+# Create the global instance of the API agent on first use
+__getattr__ = registry.provide(__name__, api_agent=ApiAgent)
@@ -3,21 +3,107 @@ CodeGenerationAgent for the Genesis AI Framework.
 
 This agent is responsible for:
 1. Writing new Python code based on specifications
-2. Creating application code, test code, and new agent code
+2. Creating application code, test code, and new agent code from the
+   templates in src/templates
 3. Using file system tools to write output
+4. Generating many files per call, written as a single batch
 """
 
-from typing import Dict, Any
-from google.adk.agents import Agent
-from src.agents.file_system_agent import file_system_agent
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from src.agents.file_system_agent import FileSystemAgent
+from src.agents.registry import registry
+from src.intent_router import IntentRouter
+from src.tools.template_tools import TemplateEngine, TemplateError, template_engine
 
 
 class CodeGenerationAgent:
     """Agent specialized in generating Python code."""
     
-    def __init__(self):
-        """Initialize the code generation agent."""
-        self.file_system = file_system_agent
+    def __init__(self, file_system: Optional[FileSystemAgent] = None, templates: Optional[TemplateEngine] = None):
+        """
+        Initialize the code generation agent.
+        
+        Args:
+            file_system (FileSystemAgent, optional): Agent used to write generated files;
+                defaults to the shared FileSystemAgent
+            templates (TemplateEngine, optional): Engine rendering the code templates;
+                defaults to the shared engine for src/templates
+        """
+        self.file_system = file_system or registry.get("file_system_agent")
+        self.templates = templates or template_engine
+        
+        # Instructions are routed by keywords matched in a single pass. The test file
+        # routes outrank the code routes whose file names they contain.
+        self.router = IntentRouter()
+        self._register_template("factorial_code", ("calculate_factorial", "src/utils.py"), "src/utils.py",
+                                "factorial.py", function_name="calculate_factorial")
+        self._register_template("factorial_test", ("test case", "test_utils.py"), "tests/test_utils.py",
+                                "factorial_test.py", priority=1, module="src.utils",
+                                function_name="calculate_factorial")
+        self._register_template("api_agent_code", ("api_agent.py",), "src/agents/api_agent.py",
+                                "api_agent.py", class_name="ApiAgent", instance_name="api_agent")
+        self._register_template("api_agent_test", ("test_api_agent.py",), "tests/test_api_agent.py",
+                                "api_agent_test.py", priority=1, module="src.agents.api_agent", class_name="ApiAgent")
+        self.router.register("requirements", "requirements.txt", "requests", handler=self._render_requirements)
+        self._register_template("calculator_html", ("calculator.html",), "src/calculator.html", "calculator.html")
+        self._register_template("calculator_css", ("calculator.css",), "src/calculator.css", "calculator.css")
+        self._register_template("calculator_js", ("calculator.js",), "src/calculator.js", "calculator.js")
+    
+    def _register_template(self, name: str, keywords: Tuple[str, ...], filepath: str, template: str,
+                           priority: int = 0, **parameters: Any) -> None:
+        """
+        Register a route that renders one file from a template.
+        
+        Args:
+            name (str): Name of the route
+            keywords (Tuple[str, ...]): Keywords that must all appear in the instruction
+            filepath (str): File the rendered code is written to
+            template (str): Name of the template in src/templates
+            priority (int): Priority of the route when several match
+            **parameters: Values for the template's placeholders
+        """
+        self.router.register(name, *keywords, priority=priority,
+                             handler=lambda: (filepath, self.templates.render(template, **parameters)))
+    
+    def generate_file(self, template: str, filepath: str, /, **parameters: Any) -> bool:
+        """
+        Render a template and write the result to a file.
+        
+        Args:
+            template (str): Name of the template, e.g. "factorial.py"
+            filepath (str): File to write
+            **parameters: Values for the template's placeholders
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            code = self.templates.render(template, **parameters)
+        except TemplateError as e:
+            print(f"Error rendering template for {filepath}: {str(e)}")
+            return False
+        return self.file_system.write_to_file(filepath, code)
+    
+    def generate_files(self, template: str, files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Render one template for many files and write them as a single batch.
+        
+        Args:
+            template (str): Name of the template, e.g. "api_agent.py"
+            files (Dict[str, Dict[str, Any]]): Placeholder values per file to write
+            
+        Returns:
+            Dict[str, Any]: The FileSystemAgent's write_files result
+        """
+        try:
+            compiled = self.templates.get(template)
+            contents = {filepath: compiled.render(parameters) for filepath, parameters in files.items()}
+        except TemplateError as e:
+            print(f"Error rendering template {template}: {str(e)}")
+            return {"success": False, "written": [], "unchanged": [], "errors": {"*": str(e)}}
+        return self.file_system.write_files(contents)
     
     def execute_task(self, instruction: str) -> Dict[str, Any]:
         """
@@ -33,29 +119,14 @@ class CodeGenerationAgent:
         
         # In a full implementation, this would use an LLM to generate
         # appropriate code based on the instruction
-        if "calculate_factorial" in instruction and "src/utils.py" in instruction:
-            code = self._generate_factorial_code()
-            success = self.file_system.write_to_file("src/utils.py", code)
-        elif "test case" in instruction and "test_utils.py" in instruction:
-            code = self._generate_factorial_test()
-            success = self.file_system.write_to_file("tests/test_utils.py", code)
-        elif "api_agent.py" in instruction:
-            code = self._generate_api_agent_code()
-            success = self.file_system.write_to_file("src/agents/api_agent.py", code)
-        elif "requirements.txt" in instruction and "requests" in instruction:
-            success = self._add_requests_to_requirements()
-        elif "test_api_agent.py" in instruction:
-            code = self._generate_api_agent_test()
-            success = self.file_system.write_to_file("tests/test_api_agent.py", code)
-        elif "calculator.html" in instruction:
-            code = self._generate_calculator_html()
-            success = self.file_system.write_to_file("src/calculator.html", code)
-        elif "calculator.css" in instruction:
-            code = self._generate_calculator_css()
-            success = self.file_system.write_to_file("src/calculator.css", code)
-        elif "calculator.js" in instruction:
-            code = self._generate_calculator_js()
-            success = self.file_system.write_to_file("src/calculator.js", code)
+        match = self.router.route(instruction)
+        if match is not None:
+            try:
+                filepath, code = match.handler()
+                success = self.file_system.write_to_file(filepath, code)
+            except Exception as e:
+                print(f"Error generating code for {match.name}: {str(e)}")
+                success = False
         else:
             # Generic handler for other code generation tasks
             success = True
@@ -65,379 +136,101 @@ class CodeGenerationAgent:
             "message": f"Executed code generation task: {instruction}"
         }
     
-    def _generate_factorial_code(self) -> str:
-        """Generate the factorial function code."""
-        return '''"""
-Utility functions for the Genesis AI Framework.
-"""
-
-def calculate_factorial(n: int) -> int:
-    """
-    Calculate the factorial of a non-negative integer.
-    
-    Args:
-        n (int): A non-negative integer
+    def execute_batch(self, instructions: List[str]) -> Dict[str, Any]:
+        """
+        Execute several code generation tasks and write their files as one batch.
         
-    Returns:
-        int: The factorial of n
+        Identical instructions are generated once. The files are generated
+        concurrently and handed to the FileSystemAgent in a single write_files
+        call, so either every changed file is replaced or none is.
         
-    Raises:
-        ValueError: If n is negative
-    """
-    if n < 0:
-        raise ValueError("Factorial is not defined for negative numbers")
-    
-    if n == 0 or n == 1:
-        return 1
-    
-    result = 1
-    for i in range(2, n + 1):
-        result *= i
-    
-    return result
-'''
-    
-    def _generate_factorial_test(self) -> str:
-        """Generate the factorial function test code."""
-        return '''"""
-Test cases for utility functions.
-"""
-
-import pytest
-from src.utils import calculate_factorial
-
-
-def test_calculate_factorial():
-    """Test the calculate_factorial function."""
-    # Test base cases
-    assert calculate_factorial(0) == 1
-    assert calculate_factorial(1) == 1
-    
-    # Test normal cases
-    assert calculate_factorial(5) == 120
-    
-    # Test edge cases
-    with pytest.raises(ValueError):
-        calculate_factorial(-1)
-'''
-    
-    def _generate_api_agent_code(self) -> str:
-        """Generate the API agent code."""
-        return '''"""
-ApiAgent for the Genesis AI Framework.
-
-This agent is responsible for:
-1. Making GET requests to APIs
-2. Handling API responses
-"""
-
-import requests
-from typing import Dict, Any
-from google.adk.agents import Agent
-
-
-class ApiAgent:
-    """Agent specialized in making API requests."""
-    
-    def __init__(self):
-        """Initialize the API agent."""
-        pass
+        Args:
+            instructions (List[str]): Natural language instructions
+            
+        Returns:
+            Dict[str, Any]: "success", a "results" entry per distinct instruction with
+                its "path" (None if it writes no file), and the "written",
+                "unchanged" and "errors" of the batch write
+        """
+        print(f"CodeGenerationAgent executing {len(instructions)} tasks as a batch")
+        
+        distinct = list(dict.fromkeys(re.sub(r"\s+", " ", instruction).strip() for instruction in instructions))
+        with ThreadPoolExecutor(max_workers=max(1, min(len(distinct), 8))) as executor:
+            generated = list(executor.map(self._generate, distinct))
+        
+        results: List[Dict[str, Any]] = []
+        files: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        for instruction, (filepath, code, error) in zip(distinct, generated):
+            if error is None and filepath is not None:
+                if filepath in files and files[filepath] != code:
+                    error = f"Another instruction in the batch generates different content for {filepath}"
+                else:
+                    files[filepath] = code
+            if error is not None:
+                errors[filepath or instruction] = error
+            results.append({"instruction": instruction, "path": filepath, "success": error is None})
+        
+        written: Dict[str, Any] = {"success": True, "written": [], "unchanged": [], "errors": {}}
+        if files:
+            written = self.file_system.write_files(files)
+        errors.update(written["errors"])
+        for result in results:
+            if result["path"] in written["errors"]:
+                result["success"] = False
+        
+        return {
+            "success": not errors,
+            "results": results,
+            "written": written["written"],
+            "unchanged": written["unchanged"],
+            "errors": errors,
+            "message": f"Executed {len(results)} code generation tasks, wrote {len(written['written'])} files"
+        }
     
-    def make_get_request(self, url: str) -> Dict[str, Any]:
+    def _generate(self, instruction: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
-        Make a GET request to the specified URL.
+        Generate the file for one instruction without writing it.
+        
+        A model-backed generator would override this per-instruction step, or
+        execute_batch as a whole to pack every instruction into a single call.
         
         Args:
-            url (str): The URL to make the GET request to
+            instruction (str): Natural language instruction
             
         Returns:
-            Dict[str, Any]: The response from the API
+            Tuple[Optional[str], Optional[str], Optional[str]]: The file path and its
+                content, both None if the instruction writes no file, and an error message
         """
+        match = self.router.route(instruction)
+        if match is None:
+            return None, None, None
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "data": response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
-            }
-        except requests.exceptions.RequestException as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
-
-
-# Create a global instance of the API agent
-api_agent = ApiAgent()
-'''
-    
-    def _add_requests_to_requirements(self) -> bool:
-        """Add requests library to requirements.txt."""
-        try:
-            # Read current requirements
-            try:
-                with open("requirements.txt", "r") as f:
-                    current_requirements = f.read().strip().split("\\n")
-            except FileNotFoundError:
-                current_requirements = []
-            
-            # Add requests if not already present
-            if "requests" not in "\\n".join(current_requirements):
-                current_requirements.append("requests>=2.28.0")
-            
-            # Write back to file
-            with open("requirements.txt", "w") as f:
-                f.write("\\n".join(current_requirements))
-            
-            return True
+            filepath, code = match.handler()
+            return filepath, code, None
         except Exception as e:
-            print(f"Error updating requirements.txt: {str(e)}")
-            return False
-    
-    def _generate_api_agent_test(self) -> str:
-        """Generate the API agent test code."""
-        return '''"""
-Test cases for the ApiAgent.
-"""
-
-import pytest
-from src.agents.api_agent import ApiAgent
-
-
-def test_api_agent_initialization():
-    """Test that the ApiAgent can be initialized."""
-    agent = ApiAgent()
-    assert isinstance(agent, ApiAgent)
+            return None, None, f"Error generating code for {match.name}: {str(e)}"
     
-    
-def test_make_get_request():
-    """Test the make_get_request method."""
-    agent = ApiAgent()
-    # This is a basic test - in a real scenario, we would mock the requests
-    assert hasattr(agent, 'make_get_request')
-'''
-
-    def _generate_calculator_html(self) -> str:
-        """Generate the calculator HTML page."""
-        return '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Calculator</title>
-    <link rel="stylesheet" href="calculator.css">
-</head>
-<body>
-    <div class="calculator">
-        <div class="display">
-            <input type="text" id="display" readonly>
-        </div>
-        <div class="buttons">
-            <button onclick="clearDisplay()">C</button>
-            <button onclick="deleteLast()">←</button>
-            <button onclick="appendToDisplay('/')">/</button>
-            <button onclick="appendToDisplay('*')">×</button>
-            
-            <button onclick="appendToDisplay('7')">7</button>
-            <button onclick="appendToDisplay('8')">8</button>
-            <button onclick="appendToDisplay('9')">9</button>
-            <button onclick="appendToDisplay('-')">-</button>
-            
-            <button onclick="appendToDisplay('4')">4</button>
-            <button onclick="appendToDisplay('5')">5</button>
-            <button onclick="appendToDisplay('6')">6</button>
-            <button onclick="appendToDisplay('+')">+</button>
-            
-            <button onclick="appendToDisplay('1')">1</button>
-            <button onclick="appendToDisplay('2')">2</button>
-            <button onclick="appendToDisplay('3')">3</button>
-            <button class="equals" onclick="calculate()" rowspan="2">=</button>
-            
-            <button onclick="appendToDisplay('0')" colspan="2">0</button>
-            <button onclick="appendToDisplay('.')">.</button>
-        </div>
-    </div>
-    
-    <script src="calculator.js"></script>
-</body>
-</html>'''
-
-    def _generate_calculator_css(self) -> str:
-        """Generate the calculator CSS."""
-        return '''body {
-    font-family: Arial, sans-serif;
-    display: flex;
-    justify-content: center;
-    align-items: center;
-    height: 100vh;
-    background-color: #f0f0f0;
-    margin: 0;
-}
-
-.calculator {
-    background-color: #333;
-    border-radius: 10px;
-    padding: 20px;
-    box-shadow: 0 4px 10px rgba(0, 0, 0, 0.3);
-}
-
-.display {
-    margin-bottom: 15px;
-}
-
-.display input {
-    width: 100%;
-    height: 60px;
-    font-size: 2rem;
-    text-align: right;
-    padding: 0 15px;
-    border: none;
-    background-color: #222;
-    color: white;
-    border-radius: 5px;
-    box-sizing: border-box;
-}
-
-.buttons {
-    display: grid;
-    grid-template-columns: repeat(4, 1fr);
-    grid-gap: 10px;
-}
-
-button {
-    height: 60px;
-    font-size: 1.5rem;
-    border: none;
-    border-radius: 5px;
-    background-color: #666;
-    color: white;
-    cursor: pointer;
-    transition: background-color 0.2s;
-}
-
-button:hover {
-    background-color: #777;
-}
-
-button:active {
-    background-color: #555;
-}
-
-.equals {
-    grid-row: span 2;
-    background-color: #ff9500;
-}
-
-.equals:hover {
-    background-color: #ffad33;
-}
-
-.equals:active {
-    background-color: #e68600;
-}'''
-
-    def _generate_calculator_js(self) -> str:
-        """Generate the calculator JavaScript."""
-        return '''let display = document.getElementById('display');
-let currentInput = '0';
-let operator = null;
-let previousInput = null;
-
-function appendToDisplay(value) {
-    if (currentInput === '0' && value !== '.') {
-        currentInput = value;
-    } else {
-        // Prevent multiple decimal points
-        if (value === '.' && currentInput.includes('.')) {
-            return;
-        }
-        currentInput += value;
-    }
-    updateDisplay();
-}
-
-function clearDisplay() {
-    currentInput = '0';
-    operator = null;
-    previousInput = null;
-    updateDisplay();
-}
-
-function deleteLast() {
-    if (currentInput.length === 1) {
-        currentInput = '0';
-    } else {
-        currentInput = currentInput.slice(0, -1);
-    }
-    updateDisplay();
-}
-
-function calculate() {
-    if (operator && previousInput !== null) {
-        let result;
-        const prev = parseFloat(previousInput);
-        const current = parseFloat(currentInput);
+    def _render_requirements(self) -> Tuple[str, str]:
+        """
+        Add the requests library to requirements.txt, without writing it yet.
         
-        switch (operator) {
-            case '+':
-                result = prev + current;
-                break;
-            case '-':
-                result = prev - current;
-                break;
-            case '*':
-                result = prev * current;
-                break;
-            case '/':
-                if (current === 0) {
-                    result = 'Error';
-                } else {
-                    result = prev / current;
-                }
-                break;
-            default:
-                return;
-        }
+        Returns:
+            Tuple[str, str]: The path of requirements.txt and its new content
+        """
+        # Read current requirements
+        try:
+            with open(self.file_system.resolve_path("requirements.txt"), "r") as f:
+                current_requirements = f.read().strip().split("\n")
+        except FileNotFoundError:
+            current_requirements = []
         
-        currentInput = result.toString();
-        operator = null;
-        previousInput = null;
-        updateDisplay();
-    }
-}
-
-function updateDisplay() {
-    display.value = currentInput;
-}
+        # Add requests if not already present
+        if "requests" not in "\n".join(current_requirements):
+            current_requirements.append("requests>=2.28.0")
+        
+        return "requirements.txt", "\n".join(current_requirements)
 
-// Add event listeners for keyboard input
-document.addEventListener('keydown', function(event) {
-    if (event.key >= '0' && event.key <= '9' || event.key === '.') {
-        appendToDisplay(event.key);
-    } else if (event.key === '+' || event.key === '-' || event.key === '*' || event.key === '/') {
-        // Handle operator input
-        if (currentInput !== '0') {
-            if (previousInput === null) {
-                previousInput = currentInput;
-                operator = event.key === '*' ? '*' : event.key;
-                currentInput = '0';
-            } else {
-                calculate();
-                operator = event.key === '*' ? '*' : event.key;
-                previousInput = currentInput;
-                currentInput = '0';
-            }
-        }
-    } else if (event.key === 'Enter' || event.key === '=') {
-        calculate();
-    } else if (event.key === 'Escape') {
-        clearDisplay();
-    } else if (event.key === 'Backspace') {
-        deleteLast();
-    }
-});'''
 
-# Create a global instance of the code generation agent
-code_generation_agent = CodeGenerationAgent()
\ No newline at end of file
+# Create the global instance of the code generation agent on first use
+__getattr__ = registry.provide(__name__, code_generation_agent=CodeGenerationAgent)
\ No newline at end of file
@@ -3,22 +3,48 @@ FileSystemAgent for the Genesis AI Framework.
 
 This agent is responsible for:
 1. Navigating the project's file structure
-2. Reading file contents
-3. Writing to files
-4. Listing directory contents
+2. Reading file contents through a cache, whole or by line or byte range
+3. Writing to files atomically, skipping files whose content is unchanged
+4. Listing directory contents and walking directory trees
+5. Keeping an index of the project's files, Python symbols and imports
 """
 
 import os
-from typing import List, Dict, Any
-from google.adk.agents import Agent
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Set
+from src.agents.registry import registry
+from src.intent_router import IntentRouter
+from src.tools.file_system_tools import (
+    FileHashStore,
+    FileReadCache,
+    WalkEntry,
+    atomic_write,
+    atomic_write_batch,
+    walk_tree
+)
+from src.tools.project_index import ProjectIndex
 
 
 class FileSystemAgent:
     """Agent specialized in file system operations."""
     
-    def __init__(self):
-        """Initialize the file system agent."""
-        pass
+    def __init__(self, root: str = "."):
+        """
+        Initialize the file system agent.
+        
+        Args:
+            root (str): Directory that relative paths are resolved against
+        """
+        self.root = root
+        self.hashes = FileHashStore()
+        self.read_cache = FileReadCache()
+        self.index = ProjectIndex(root)
+        self._touched_paths: Set[str] = set()
+        self._touched_lock = threading.Lock()
+        
+        # Instructions are routed by keywords matched in a single pass
+        self.router = IntentRouter()
+        self.router.register("project_structure", "project structure", handler=self.analyze_project_structure)
     
     def read_file(self, filepath: str) -> str:
         """
@@ -30,16 +56,54 @@ class FileSystemAgent:
         Returns:
             str: Content of the file
         """
+        result = self.read_file_range(filepath)
+        if not result["success"]:
+            return f"Error reading file {filepath}: {result['error']}"
+        return result["content"]
+    
+    def read_file_range(self, filepath: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+                        offset: Optional[int] = None, length: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read a file, or only a range of its lines or bytes.
+        
+        Unchanged files are served from the read cache, and large files are
+        memory-mapped so a range is read without loading the rest.
+        
+        Args:
+            filepath (str): Path to the file to read
+            start_line (int, optional): First line to read, counting from 1
+            end_line (int, optional): Last line to read, inclusive
+            offset (int, optional): First byte to read; takes precedence over lines
+            length (int, optional): Number of bytes to read from offset
+            
+        Returns:
+            Dict[str, Any]: "success", the "content", the file's "size" in bytes,
+                and the lines read as "start_line" and "end_line" for line reads,
+                or an "error" message
+        """
+        path = self.resolve_path(filepath)
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                return file.read()
+            size = os.path.getsize(path)
+            if offset is not None or length is not None:
+                data = self.read_cache.read_range(path, offset or 0, length)
+                # A range may cut a multi-byte character in half
+                return {"success": True, "content": data.decode("utf-8", errors="replace"), "size": size}
+            if start_line is not None or end_line is not None:
+                data, last_line = self.read_cache.read_lines(path, start_line or 1, end_line)
+                return {"success": True, "content": data.decode("utf-8"), "size": size,
+                        "start_line": start_line or 1, "end_line": last_line}
+            return {"success": True, "content": self.read_cache.read(path).decode("utf-8"), "size": size}
         except Exception as e:
-            return f"Error reading file {filepath}: {str(e)}"
+            return {"success": False, "error": str(e)}
     
     def write_to_file(self, filepath: str, content: str) -> bool:
         """
         Write or overwrite a file.
         
+        The file is replaced atomically through a temporary file. If it already
+        has this content it is left alone, so its modification time is kept; it
+        is still reported as touched, since it may differ from the last commit.
+        
         Args:
             filepath (str): Path to the file to write
             content (str): Content to write to the file
@@ -48,16 +112,49 @@ class FileSystemAgent:
             bool: True if successful, False otherwise
         """
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            with open(filepath, 'w', encoding='utf-8') as file:
-                file.write(content)
+            if atomic_write(self.resolve_path(filepath), content.encode("utf-8"), self.hashes):
+                self.read_cache.invalidate(self.resolve_path(filepath))
+            self._record_touched(filepath)
             return True
         except Exception as e:
             print(f"Error writing to file {filepath}: {str(e)}")
             return False
     
+    def write_files(self, files: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Write several files at once, e.g. all files of a plan.
+        
+        Changed files are written to temporary files, synced to disk with a
+        single barrier and then renamed into place. If any of them can't be
+        written, none is replaced.
+        
+        Args:
+            files (Dict[str, str]): Content per file path
+            
+        Returns:
+            Dict[str, Any]: "success", the "written" and "unchanged" paths, and
+                "errors" with a message per path that failed
+        """
+        resolved = {self.resolve_path(filepath): filepath for filepath in files}
+        try:
+            result = atomic_write_batch(
+                {path: files[filepath].encode("utf-8") for path, filepath in resolved.items()},
+                self.hashes
+            )
+        except Exception as e:
+            print(f"Error writing files: {str(e)}")
+            return {"success": False, "written": [], "unchanged": [], "errors": {"*": str(e)}}
+        
+        result["written"] = [resolved[path] for path in result["written"]]
+        result["unchanged"] = [resolved[path] for path in result["unchanged"]]
+        result["errors"] = {resolved.get(path, path): error for path, error in result["errors"].items()}
+        for filepath in result["written"]:
+            self.read_cache.invalidate(self.resolve_path(filepath))
+        # Unchanged files may still differ from the last commit, so they are staged too
+        for filepath in result["written"] + result["unchanged"]:
+            self._record_touched(filepath)
+        return result
+    
     def list_directory(self, path: str) -> List[str]:
         """
         List the contents of a directory.
@@ -69,10 +166,101 @@ class FileSystemAgent:
             List[str]: List of items in the directory
         """
         try:
-            return os.listdir(path)
+            return os.listdir(self.resolve_path(path))
         except Exception as e:
             return [f"Error listing directory {path}: {str(e)}"]
     
+    def walk(self, path: str = ".", include_dirs: bool = False, use_gitignore: bool = True,
+             workers: int = 1) -> Iterator[WalkEntry]:
+        """
+        Walk a directory tree lazily, e.g. to enumerate a whole repository.
+        
+        Version control directories, caches and virtualenvs are skipped, as is
+        everything excluded by .gitignore files inside the walked tree.
+        
+        Args:
+            path (str): Directory to walk
+            include_dirs (bool): Whether to yield directories as well as files
+            use_gitignore (bool): Whether to honor .gitignore files
+            workers (int): Number of threads scanning subtrees; with more than one,
+                entries come in no particular order
+            
+        Yields:
+            WalkEntry: Entries whose "path" is relative to the walked directory and
+                whose stat() is cached
+        """
+        return walk_tree(self.resolve_path(path), include_dirs=include_dirs,
+                         use_gitignore=use_gitignore, workers=workers)
+    
+    def resolve_path(self, filepath: str) -> str:
+        """
+        Resolve a path against the agent's root directory.
+        
+        Args:
+            filepath (str): A path relative to the root, or an absolute path
+            
+        Returns:
+            str: The path to use with the operating system
+        """
+        if self.root == "." or os.path.isabs(filepath):
+            return filepath
+        return os.path.join(self.root, filepath)
+    
+    def touched_paths(self) -> List[str]:
+        """
+        Return the files written since the last call to pop_touched_paths.
+        
+        Returns:
+            List[str]: Sorted paths of the files written by write_to_file or write_files
+        """
+        with self._touched_lock:
+            return sorted(self._touched_paths)
+    
+    def pop_touched_paths(self) -> List[str]:
+        """
+        Return the files written since the last call and start a new set.
+        
+        Returns:
+            List[str]: Sorted paths of the files written by write_to_file or write_files
+        """
+        with self._touched_lock:
+            paths = sorted(self._touched_paths)
+            self._touched_paths.clear()
+        return paths
+    
+    def _record_touched(self, filepath: str) -> None:
+        """
+        Remember that a file was written so it can be staged later.
+        
+        Args:
+            filepath (str): Path of the written file
+        """
+        with self._touched_lock:
+            self._touched_paths.add(os.path.normpath(filepath))
+    
+    def analyze_project_structure(self) -> Dict[str, Any]:
+        """
+        Describe the project from the index, including how its agents are structured.
+        
+        Returns:
+            Dict[str, Any]: "success", a "message" and the index "summary", plus the
+                project's agent classes as "agents"
+        """
+        try:
+            refreshed = self.index.refresh()
+            summary = self.index.summary()
+        except Exception as e:
+            return {"success": False, "message": f"Error analyzing project structure: {str(e)}"}
+        
+        agents = [symbol for symbol in summary["classes"] if symbol["name"].endswith("Agent")]
+        return {
+            "success": True,
+            "message": f"Indexed {summary['files']} files ({refreshed['added'] + refreshed['updated']} re-read), "
+                       f"found {len(agents)} agent classes",
+            "summary": summary,
+            "agents": agents
+        }
+    
     def execute_task(self, instruction: str) -> Dict[str, Any]:
         """
         Execute a file system task based on natural language instruction.
@@ -87,6 +275,10 @@ class FileSystemAgent:
         # and call the appropriate method
         print(f"FileSystemAgent executing task: {instruction}")
         
+        match = self.router.route(instruction)
+        if match is not None:
+            return match.handler()
+        
         # For now, we'll just return a success message
         return {
             "success": True,
@@ -94,5 +286,5 @@ class FileSystemAgent:
         }
 
 
-# Create a global instance of the file system agent
-file_system_agent = FileSystemAgent()
\ No newline at end of file
+# Create the global instance of the file system agent on first use
+__getattr__ = registry.provide(__name__, file_system_agent=FileSystemAgent)
\ No newline at end of file
@@ -11,16 +11,22 @@ This agent is responsible for:
 import subprocess
 import sys
 import os
-from typing import Dict, Any, Union
-from google.adk.agents import Agent
+from typing import Dict, Any, Union, List
+from src.agents.registry import registry
+from src.tools.git_tools import GitRepository
 
 
 class GitAgent:
     """Agent specialized in Git operations."""
     
-    def __init__(self):
-        """Initialize the Git agent."""
-        pass
+    def __init__(self, repository_path: str = "."):
+        """
+        Initialize the Git agent.
+        
+        Args:
+            repository_path (str): Directory inside the working tree to operate on
+        """
+        self.repository = GitRepository(repository_path)
     
     def create_new_branch(self, branch_name: str) -> str:
         """
@@ -37,27 +43,20 @@ class GitAgent:
             if not self._is_git_repository():
                 return "Error: Not in a git repository"
             
+            # If branch already exists, just switch to it
+            if self.repository.branch_exists(branch_name):
+                result = self.repository.run("checkout", branch_name)
+                if result.returncode == 0:
+                    return f"Switched to existing branch: {branch_name}"
+                return f"Error creating/switching to branch: {result.stderr}"
+            
             # Create and checkout the new branch
-            result = subprocess.run(
-                ["git", "checkout", "-b", branch_name],
-                capture_output=True,
-                text=True
-            )
+            result = self.repository.run("checkout", "-b", branch_name)
             
             if result.returncode == 0:
                 return f"Successfully created and switched to branch: {branch_name}"
             else:
-                # If branch already exists, just switch to it
-                switch_result = subprocess.run(
-                    ["git", "checkout", branch_name],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if switch_result.returncode == 0:
-                    return f"Switched to existing branch: {branch_name}"
-                else:
-                    return f"Error creating/switching to branch: {result.stderr}"
+                return f"Error creating/switching to branch: {result.stderr}"
                     
         except Exception as e:
             return f"Error creating branch {branch_name}: {str(e)}"
@@ -75,11 +74,7 @@ class GitAgent:
                 print("Error: Not in a git repository")
                 return False
             
-            result = subprocess.run(
-                ["git", "add", "."],
-                capture_output=True,
-                text=True
-            )
+            result = self.repository.run("add", ".")
             
             if result.returncode == 0:
                 print("Successfully staged all changes")
@@ -92,6 +87,56 @@ class GitAgent:
             print(f"Error staging changes: {str(e)}")
             return False
     
+    def stage_paths(self, paths: List[str]) -> bool:
+        """
+        Stage only the given files with one batched `git check-ignore` and `git update-index`.
+        
+        Unlike `git add .`, this never scans the rest of the working tree, so
+        its cost depends on the number of changed files rather than the size
+        of the repository. Deleted files are removed from the index. Files
+        that .gitignore excludes are left out, as `git add` would leave them.
+        
+        Args:
+            paths (List[str]): Paths of the changed files, relative to the working directory
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            # Check if we're in a git repository
+            if not self._is_git_repository():
+                print("Error: Not in a git repository")
+                return False
+            
+            if not paths:
+                return True
+            
+            # update-index doesn't honor .gitignore, so drop ignored files first
+            ignored = self.repository.run("check-ignore", "-z", "--stdin", input="".join(path + "\0" for path in paths))
+            if ignored.returncode not in (0, 1):
+                print(f"Error staging changes: {ignored.stderr}")
+                return False
+            skipped = set(ignored.stdout.split("\0"))
+            paths = [path for path in paths if path not in skipped]
+            if not paths:
+                return True
+            
+            result = self.repository.run(
+                "update-index", "--add", "--remove", "-z", "--stdin",
+                input="".join(path + "\0" for path in paths)
+            )
+            
+            if result.returncode == 0:
+                print(f"Successfully staged {len(paths)} changed file(s)")
+                return True
+            else:
+                print(f"Error staging changes: {result.stderr}")
+                return False
+                
+        except Exception as e:
+            print(f"Error staging changes: {str(e)}")
+            return False
+    
     def commit_changes(self, commit_message: str) -> bool:
         """
         Execute git commit with the provided message.
@@ -108,11 +153,7 @@ class GitAgent:
                 print("Error: Not in a git repository")
                 return False
             
-            result = subprocess.run(
-                ["git", "commit", "-m", commit_message],
-                capture_output=True,
-                text=True
-            )
+            result = self.repository.run("commit", "-m", commit_message)
             
             if result.returncode == 0:
                 print(f"Successfully committed changes: {commit_message}")
@@ -129,18 +170,12 @@ class GitAgent:
         """
         Check if the current directory is a git repository.
         
+        The check runs git once and is cached by the repository view.
+        
         Returns:
             bool: True if in a git repository, False otherwise
         """
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--is-inside-work-tree"],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return self.repository.is_repository()
     
     def execute_task(self, instruction: str) -> Dict[str, Any]:
         """
@@ -162,5 +197,5 @@ class GitAgent:
         }
 
 
-# Create a global instance of the Git agent
-git_agent = GitAgent()
\ No newline at end of file
+# Create the global instance of the Git agent on first use
+__getattr__ = registry.provide(__name__, git_agent=GitAgent)
\ No newline at end of file
@@ -9,79 +9,242 @@ This agent is responsible for:
 5. Communicating results back to the user
 """
 
-from typing import Dict, Any
-from google.adk.agents import Agent
-from src.agents.file_system_agent import file_system_agent
-from src.agents.code_generation_agent import code_generation_agent
-from src.agents.testing_agent import testing_agent
-from src.agents.git_agent import git_agent
+import os
+import uuid
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+from src.agents.file_system_agent import FileSystemAgent
+from src.agents.code_generation_agent import CodeGenerationAgent
+from src.agents.testing_agent import TestingAgent
+from src.agents.git_agent import GitAgent
+from src.agents.registry import registry
+from src.event_bus import event_bus
+from src.intent_router import IntentRouter
+from src.plan_cache import PlanCache
+from src.plan_scheduler import PlanScheduler
+from src.state import state_path
+from src.task_history import TaskHistoryStore
+from src.tools.git_tools import WorktreePool
+from src.tools.template_tools import TemplateEngine
 
 
-class OrchestratorAgent:
-    """Main orchestrator that manages the AI development workflow."""
+class TaskContext:
+    """The specialist agents and bookkeeping for a single task."""
     
-    def __init__(self):
-        """Initialize the orchestrator with all specialist agents."""
+    def __init__(self, task_id: str, file_system_agent: FileSystemAgent,
+                 code_generation_agent: CodeGenerationAgent, testing_agent: TestingAgent,
+                 git_agent: GitAgent, should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Initialize the task context.
+        
+        Args:
+            task_id (str): Identifier attached to the task's progress events
+            file_system_agent (FileSystemAgent): File system agent for the task's working tree
+            code_generation_agent (CodeGenerationAgent): Code generation agent writing into that tree
+            testing_agent (TestingAgent): Testing agent running in that tree
+            git_agent (GitAgent): Git agent operating on that tree
+            should_stop (Callable[[], bool], optional): Cancellation check polled between steps
+        """
+        self.task_id = task_id
         self.file_system_agent = file_system_agent
         self.code_generation_agent = code_generation_agent
         self.testing_agent = testing_agent
         self.git_agent = git_agent
-        self.task_history = []
+        self.should_stop = should_stop
+    
+    @classmethod
+    def for_root(cls, task_id: str, root: str,
+                 should_stop: Optional[Callable[[], bool]] = None) -> "TaskContext":
+        """
+        Create a context whose agents are all scoped to one working tree.
+        
+        Args:
+            task_id (str): Identifier attached to the task's progress events
+            root (str): The working tree, e.g. a leased git worktree
+            should_stop (Callable[[], bool], optional): Cancellation check polled between steps
+            
+        Returns:
+            TaskContext: The new context
+        """
+        file_system = FileSystemAgent(root)
+        # Render the templates of the tree the task works in, not the main tree's
+        templates_dir = os.path.join(root, "src", "templates")
+        templates = TemplateEngine(templates_dir) if os.path.isdir(templates_dir) else None
+        return cls(
+            task_id,
+            file_system,
+            CodeGenerationAgent(file_system, templates),
+            TestingAgent(root),
+            GitAgent(root),
+            should_stop
+        )
+    
+    def cancelled(self) -> bool:
+        """
+        Check whether the task was asked to stop.
+        
+        Returns:
+            bool: True if the task should stop
+        """
+        return self.should_stop is not None and self.should_stop()
+
+
+class OrchestratorAgent:
+    """Main orchestrator that manages the AI development workflow."""
+    
+    def __init__(self, max_parallel_steps: int = 4, history_path: Optional[str] = None,
+                 worktree_pool: Optional[WorktreePool] = None, test_impact_analysis: bool = True,
+                 full_suite_before_commit: bool = False, plan_cache: Optional[PlanCache] = None):
+        """
+        Initialize the orchestrator with all specialist agents.
+        
+        Args:
+            max_parallel_steps (int): Maximum number of independent plan steps run at once
+            history_path (str, optional): SQLite file for the task history; defaults to
+                history.sqlite3 in the state directory
+            worktree_pool (WorktreePool, optional): When given, every task runs in its own
+                leased git worktree, so tasks can run concurrently. Otherwise tasks share
+                the current working directory and must run one at a time.
+            test_impact_analysis (bool): Testing steps only run the tests affected by the
+                files the task wrote
+            full_suite_before_commit (bool): With test impact analysis, also run the full
+                suite once before committing
+            plan_cache (PlanCache, optional): Reuses plans made earlier for the same goal
+                and repository state; without it every task is planned from scratch
+        """
+        self.file_system_agent = registry.get("file_system_agent")
+        self.code_generation_agent = registry.get("code_generation_agent")
+        self.testing_agent = registry.get("testing_agent")
+        self.git_agent = registry.get("git_agent")
+        self.event_bus = event_bus
+        self.scheduler = PlanScheduler(max_workers=max_parallel_steps)
+        self.task_history = TaskHistoryStore(history_path or state_path("history.sqlite3"))
+        self.worktree_pool = worktree_pool
+        self.test_impact_analysis = test_impact_analysis
+        self.full_suite_before_commit = full_suite_before_commit
+        self.plan_cache = plan_cache
+        
+        # Goals are routed by keywords matched in a single pass
+        self.goal_router = IntentRouter()
+        self.goal_router.register("meta_development", "create a new agent", handler=self._handle_meta_development_task)
+        self.goal_router.register("meta_development", "self-expansion", handler=self._handle_meta_development_task)
+        
+        self.plan_router = IntentRouter()
+        self.plan_router.register("factorial", "calculate_factorial", "utils.py", handler=self._create_factorial_plan)
+        self.plan_router.register("calculator", "hesapmakinesi", handler=self._create_calculator_plan)
+        self.plan_router.register("calculator", "calculator", handler=self._create_calculator_plan)
     
-    def receive_task(self, user_goal: str) -> Dict[str, Any]:
+    @property
+    def max_concurrent_tasks(self) -> int:
+        """Number of tasks that can safely run at the same time."""
+        return self.worktree_pool.max_size if self.worktree_pool else 1
+    
+    def receive_task(self, user_goal: str, should_stop: Optional[Callable[[], bool]] = None,
+                     task_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Receive a high-level user goal and process it.
         
         Args:
             user_goal (str): The user's high-level goal
+            should_stop (Callable[[], bool], optional): Polled between plan steps;
+                returning True cancels the task before anything is committed
+            task_id (str, optional): Identifier attached to the task's progress events
             
         Returns:
             Dict[str, Any]: Result of the task execution
         """
+        task_id = task_id or uuid.uuid4().hex
         print(f"Orchestrator received task: {user_goal}")
-        self.task_history.append({"task": user_goal, "status": "started"})
+        self.task_history.record_started(task_id, user_goal)
+        self._emit("task_started", task_id, task=user_goal)
         
-        # Determine if this is a standard development task or meta-development task
-        if "create a new agent" in user_goal.lower() or "self-expansion" in user_goal.lower():
-            result = self._handle_meta_development_task(user_goal)
-        else:
-            result = self._handle_standard_development_task(user_goal)
+        try:
+            if self.worktree_pool is not None:
+                with self.worktree_pool.lease() as worktree:
+                    self._emit("worktree_leased", task_id, path=worktree)
+                    result = self._dispatch(user_goal, TaskContext.for_root(task_id, worktree, should_stop))
+            else:
+                result = self._dispatch(user_goal, TaskContext(
+                    task_id,
+                    self.file_system_agent,
+                    self.code_generation_agent,
+                    self.testing_agent,
+                    self.git_agent,
+                    should_stop
+                ))
+        except Exception as e:
+            failure = {"success": False, "error": str(e)}
+            self.task_history.record_completed(task_id, user_goal, failure, status="failed")
+            self._emit("task_completed", task_id, result=failure)
+            raise
             
-        self.task_history.append({"task": user_goal, "status": "completed", "result": result})
+        self.task_history.record_completed(task_id, user_goal, result)
+        self._emit("task_completed", task_id, result=result)
         return result
     
-    def _handle_standard_development_task(self, user_goal: str) -> Dict[str, Any]:
+    def _dispatch(self, user_goal: str, context: TaskContext) -> Dict[str, Any]:
+        """
+        Route a goal to the standard or meta-development workflow.
+        
+        Args:
+            user_goal (str): The user's high-level goal
+            context (TaskContext): The task's agents and bookkeeping
+            
+        Returns:
+            Dict[str, Any]: Result of the task execution
+        """
+        # Determine if this is a standard development task or meta-development task
+        match = self.goal_router.route(user_goal)
+        if match is not None:
+            return match.handler(user_goal, context)
+        return self._handle_standard_development_task(user_goal, context)
+    
+    def _handle_standard_development_task(self, user_goal: str, context: TaskContext) -> Dict[str, Any]:
         """
         Handle a standard development task following the Code-Test-Correct loop.
         
         Args:
             user_goal (str): The user's goal
+            context (TaskContext): The task's agents and bookkeeping
             
         Returns:
             Dict[str, Any]: Result of the task execution
         """
         # Create a plan based on the user goal
-        plan = self._create_plan(user_goal)
+        plan = self._plan(user_goal, "standard", self._create_plan, context)
+        
+        # Only files written from here on are staged for this task
+        context.file_system_agent.pop_touched_paths()
         
         # Create a new branch for this feature
         branch_name = plan.get("branch_name", "feature/new-task")
-        self.git_agent.create_new_branch(branch_name)
+        failure = self._create_branch(branch_name, context)
+        if failure is not None:
+            return failure
         
-        # Execute each step in the plan
-        for step in plan.get("steps", []):
+        # Execute the plan, running independent steps concurrently
+        def execute_step(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             if step["agent"] == "code_generation":
-                self.code_generation_agent.execute_task(step["instruction"])
+                self._generate_code(step, context)
             elif step["agent"] == "testing":
-                test_result = self.testing_agent.run_pytest_suite()
+                test_result = self._run_tests(context)
                 if not test_result["success"]:
                     # Enter correction loop
-                    correction_result = self._handle_test_failure(test_result, plan)
+                    correction_result = self._handle_test_failure(test_result, plan, context)
                     if not correction_result["success"]:
                         return correction_result
+            return None
+        
+        failure = self._execute_plan(plan, execute_step, context)
+        if failure is not None:
+            return failure
+        if context.cancelled():
+            return self._cancelled_result(branch_name)
+        failure = self._run_full_suite_before_commit(plan, context)
+        if failure is not None:
+            return failure
         
         # If we get here, all tests passed
-        self.git_agent.add_all_changes_to_staging()
-        self.git_agent.commit_changes(plan.get("commit_message", "feat: Complete task"))
+        self._commit(plan.get("commit_message", "feat: Complete task"), context)
         
         return {
             "success": True,
@@ -89,40 +252,55 @@ class OrchestratorAgent:
             "branch": branch_name
         }
     
-    def _handle_meta_development_task(self, user_goal: str) -> Dict[str, Any]:
+    def _handle_meta_development_task(self, user_goal: str, context: TaskContext) -> Dict[str, Any]:
         """
         Handle a meta-development task for self-expansion.
         
         Args:
             user_goal (str): The user's goal for creating new agents
+            context (TaskContext): The task's agents and bookkeeping
             
         Returns:
             Dict[str, Any]: Result of the task execution
         """
         # Create a plan for self-expansion
-        plan = self._create_meta_plan(user_goal)
+        plan = self._plan(user_goal, "meta", self._create_meta_plan, context)
+        
+        # Only files written from here on are staged for this task
+        context.file_system_agent.pop_touched_paths()
         
         # Create a new branch for this feature
         branch_name = plan.get("branch_name", "feature/self-expansion")
-        self.git_agent.create_new_branch(branch_name)
+        failure = self._create_branch(branch_name, context)
+        if failure is not None:
+            return failure
         
-        # Execute each step in the plan
-        for step in plan.get("steps", []):
+        # Execute the plan, running independent steps concurrently
+        def execute_step(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             if step["agent"] == "file_system":
-                self.file_system_agent.execute_task(step["instruction"])
+                context.file_system_agent.execute_task(step["instruction"])
             elif step["agent"] == "code_generation":
-                self.code_generation_agent.execute_task(step["instruction"])
+                self._generate_code(step, context)
             elif step["agent"] == "testing":
-                test_result = self.testing_agent.run_pytest_suite()
+                test_result = self._run_tests(context)
                 if not test_result["success"]:
                     return {
                         "success": False,
-                        "message": f"Tests failed during self-expansion: {test_result['output']}"
+                        "message": f"Tests failed during self-expansion:\n{TestingAgent.describe_failures(test_result)}"
                     }
+            return None
+        
+        failure = self._execute_plan(plan, execute_step, context)
+        if failure is not None:
+            return failure
+        if context.cancelled():
+            return self._cancelled_result(branch_name)
+        failure = self._run_full_suite_before_commit(plan, context)
+        if failure is not None:
+            return failure
         
         # If we get here, all tests passed
-        self.git_agent.add_all_changes_to_staging()
-        self.git_agent.commit_changes(plan.get("commit_message", "feat: Add new agent capability"))
+        self._commit(plan.get("commit_message", "feat: Add new agent capability"), context)
         
         return {
             "success": True,
@@ -130,6 +308,239 @@ class OrchestratorAgent:
             "branch": branch_name
         }
     
+    def _execute_plan(self, plan: Dict[str, Any],
+                      execute_step: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                      context: TaskContext) -> Optional[Dict[str, Any]]:
+        """
+        Run a plan through the scheduler, publishing step start and finish events.
+        
+        Args:
+            plan (Dict[str, Any]): The execution plan
+            execute_step (Callable): Runs one step; returning a dict stops the plan
+            context (TaskContext): The task's agents and bookkeeping
+            
+        Returns:
+            Optional[Dict[str, Any]]: The result that stopped the plan, or None if every step ran
+        """
+        steps = self._batch_code_generation_steps(plan.get("steps", []))
+        positions = {id(step): index for index, step in enumerate(steps)}
+        self._emit("plan_created", context.task_id, branch=plan.get("branch_name"), cached=plan.get("cached", False),
+                   steps=[{"agent": step["agent"], "instruction": step["instruction"]} for step in steps])
+        
+        def run_step(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            index = positions[id(step)]
+            self._emit("step_started", context.task_id, step=index, agent=step["agent"], instruction=step["instruction"])
+            result = execute_step(step)
+            self._emit("step_finished", context.task_id, step=index, agent=step["agent"], success=result is None)
+            return result
+        
+        return self.scheduler.run(steps, run_step, context.should_stop)
+    
+    def _run_tests(self, context: TaskContext, full_suite: bool = False) -> Dict[str, Any]:
+        """
+        Run the tests, streaming their output and per-test results as events.
+        
+        With test impact analysis only the tests affected by the files the task
+        has written so far are run.
+        
+        Args:
+            context (TaskContext): The task's agents and bookkeeping
+            full_suite (bool): Run the whole suite even with test impact analysis
+            
+        Returns:
+            Dict[str, Any]: The test results from the TestingAgent
+        """
+        on_output = lambda line: self._emit("test_output", context.task_id, line=line)
+        on_event = lambda event: self._emit("test_case", context.task_id, test=event["nodeid"],
+                                            outcome=event["outcome"], duration=event.get("duration"))
+        if self.test_impact_analysis and not full_suite:
+            test_result = context.testing_agent.run_impacted_tests(
+                context.file_system_agent.touched_paths(), on_output=on_output, on_event=on_event
+            )
+        else:
+            # A full run is collected by pytest and never reuses cached results
+            test_result = context.testing_agent.run_pytest_suite(on_output=on_output, on_event=on_event)
+        self._emit("test_result", context.task_id, success=test_result["success"],
+                   summary=test_result.get("summary"), selected_tests=test_result.get("selected_tests"),
+                   timing=test_result.get("timing"))
+        return test_result
+    
+    def _run_full_suite_before_commit(self, plan: Dict[str, Any], context: TaskContext) -> Optional[Dict[str, Any]]:
+        """
+        Run the full suite before committing when the plan's testing steps only ran affected tests.
+        
+        Args:
+            plan (Dict[str, Any]): The execution plan
+            context (TaskContext): The task's agents and bookkeeping
+            
+        Returns:
+            Optional[Dict[str, Any]]: The failure result, or None if the commit can go ahead
+        """
+        if not (self.test_impact_analysis and self.full_suite_before_commit):
+            return None
+        if not any(step["agent"] == "testing" for step in plan.get("steps", [])):
+            return None
+        
+        test_result = self._run_tests(context, full_suite=True)
+        if test_result["success"]:
+            return None
+        return {
+            "success": False,
+            "message": f"Full test suite failed before commit:\n{TestingAgent.describe_failures(test_result)}"
+        }
+    
+    def _create_branch(self, branch_name: str, context: TaskContext) -> Optional[Dict[str, Any]]:
+        """
+        Create the task's branch and publish the outcome.
+        
+        The task must not go on without its branch: in a worktree the branch
+        can't be checked out while another tree has it, and work committed on
+        the detached HEAD instead would be lost when the worktree is recycled.
+        
+        Args:
+            branch_name (str): Name of the branch to create
+            context (TaskContext): The task's agents and bookkeeping
+            
+        Returns:
+            Optional[Dict[str, Any]]: The failure result, or None if the branch is checked out
+        """
+        result = context.git_agent.create_new_branch(branch_name)
+        self._emit("git_result", context.task_id, operation="create_branch", branch=branch_name, result=result)
+        if not result.startswith("Error"):
+            return None
+        return {
+            "success": False,
+            "message": f"Could not check out branch {branch_name}: {result}",
+            "branch": branch_name
+        }
+    
+    def _commit(self, commit_message: str, context: TaskContext) -> None:
+        """
+        Stage the files the task wrote, commit them and publish the outcome.
+        
+        Args:
+            commit_message (str): The commit message
+            context (TaskContext): The task's agents and bookkeeping
+        """
+        paths = context.file_system_agent.pop_touched_paths()
+        staged = context.git_agent.stage_paths(paths)
+        self._emit("git_result", context.task_id, operation="stage", paths=paths, success=staged)
+        committed = context.git_agent.commit_changes(commit_message)
+        self._emit("git_result", context.task_id, operation="commit", message=commit_message, success=committed)
+    
+    def _batch_code_generation_steps(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge consecutive code generation steps into batch steps.
+        
+        A batch step carries all "instructions" and "targets" of the merged
+        steps, so the CodeGenerationAgent generates them in one call and writes
+        them as one batch. Steps without known targets are barriers and aren't
+        merged, a step sharing a target with the current batch starts a new one
+        so it still runs after the steps it builds on, and plans referring to
+        steps by index or id are left unchanged.
+        
+        Args:
+            steps (List[Dict[str, Any]]): The plan steps
+            
+        Returns:
+            List[Dict[str, Any]]: The steps with runs of code generation steps merged
+        """
+        if any("depends_on" in step or "id" in step for step in steps):
+            return steps
+        
+        # Each group is (mergeable, its steps, their targets)
+        groups: List[Tuple[bool, List[Dict[str, Any]], Set[str]]] = []
+        for step in steps:
+            targets = self.scheduler.extract_targets(step) if step["agent"] == "code_generation" else set()
+            mergeable = step["agent"] == "code_generation" and not step.get("barrier") and bool(targets)
+            if mergeable and groups and groups[-1][0] and not targets & groups[-1][2]:
+                groups[-1][1].append(step)
+                groups[-1][2].update(targets)
+            else:
+                groups.append((mergeable, [step], targets))
+        
+        batched = []
+        for _, group, targets in groups:
+            if len(group) == 1:
+                batched.append(group[0])
+                continue
+            batched.append({
+                "agent": "code_generation",
+                "instruction": "\n".join(step["instruction"] for step in group),
+                "instructions": [step["instruction"] for step in group],
+                "targets": sorted(targets)
+            })
+        return batched
+    
+    def _generate_code(self, step: Dict[str, Any], context: TaskContext) -> None:
+        """
+        Run a code generation step, as a batch if it merges several steps.
+        
+        Args:
+            step (Dict[str, Any]): The plan step
+            context (TaskContext): The task's agents and bookkeeping
+        """
+        if "instructions" in step:
+            context.code_generation_agent.execute_batch(step["instructions"])
+        else:
+            context.code_generation_agent.execute_task(step["instruction"])
+    
+    def _emit(self, event_type: str, task_id: Optional[str], **data: Any) -> None:
+        """
+        Publish a progress event for a task.
+        
+        Args:
+            event_type (str): The kind of event
+            task_id (Optional[str]): The task the event belongs to
+            **data: Event payload
+        """
+        self.event_bus.publish(event_type, task_id=task_id, **data)
+    
+    def _cancelled_result(self, branch_name: str) -> Dict[str, Any]:
+        """
+        Build the result reported for a task that was cancelled mid-plan.
+        
+        Args:
+            branch_name (str): The branch the task was working on
+            
+        Returns:
+            Dict[str, Any]: Result of the cancelled task
+        """
+        return {
+            "success": False,
+            "cancelled": True,
+            "message": f"Task was cancelled before completion on branch {branch_name}",
+            "branch": branch_name
+        }
+    
+    def _plan(self, user_goal: str, kind: str, create_plan: Callable[[str], Dict[str, Any]],
+              context: TaskContext) -> Dict[str, Any]:
+        """
+        Get the plan for a goal from the plan cache, or create and cache it.
+        
+        Plans are cached per goal and HEAD commit of the task's working tree, so
+        new commits invalidate them.
+        
+        Args:
+            user_goal (str): The user's goal
+            kind (str): Kind of plan, "standard" or "meta"
+            create_plan (Callable[[str], Dict[str, Any]]): Creates the plan on a cache miss
+            context (TaskContext): The task's agents and bookkeeping
+            
+        Returns:
+            Dict[str, Any]: The execution plan, with "cached" telling whether it came from the cache
+        """
+        if self.plan_cache is None:
+            return create_plan(user_goal)
+        
+        fingerprint = context.git_agent.repository.head_commit() or ""
+        plan = self.plan_cache.get(user_goal, fingerprint, kind)
+        cached = plan is not None
+        if not cached:
+            plan = create_plan(user_goal)
+            self.plan_cache.put(user_goal, fingerprint, plan, kind)
+        return {**plan, "cached": cached}
+    
     def _create_plan(self, user_goal: str) -> Dict[str, Any]:
         """
         Create a step-by-step plan for a standard development task.
@@ -142,51 +553,68 @@ class OrchestratorAgent:
         """
         # This is a simplified plan creation. In a full implementation,
         # this would use an LLM to create a detailed plan.
-        if "calculate_factorial" in user_goal and "utils.py" in user_goal:
-            return {
-                "branch_name": "feature/factorial-function",
-                "commit_message": "feat: Add factorial function and tests",
-                "steps": [
-                    {
-                        "agent": "code_generation",
-                        "instruction": "Write a Python function calculate_factorial in the file src/utils.py. The function should handle non-negative integers."
-                    },
-                    {
-                        "agent": "code_generation",
-                        "instruction": "Write a pytest test case in tests/test_utils.py to verify the calculate_factorial function for inputs 0, 1, and 5."
-                    },
-                    {
-                        "agent": "testing",
-                        "instruction": "Run the test suite."
-                    }
-                ]
-            }
-        elif "hesapmakinesi" in user_goal.lower() or "calculator" in user_goal.lower():
-            return {
-                "branch_name": "feature/calculator-page",
-                "commit_message": "feat: Add calculator web page",
-                "steps": [
-                    {
-                        "agent": "code_generation",
-                        "instruction": "Create a new HTML file src/calculator.html with a fully functional calculator web page. Include CSS styling and JavaScript for calculator functionality. The calculator should support basic operations: addition, subtraction, multiplication, and division."
-                    },
-                    {
-                        "agent": "code_generation",
-                        "instruction": "Create a new CSS file src/calculator.css with styling for the calculator page."
-                    },
-                    {
-                        "agent": "code_generation",
-                        "instruction": "Create a new JavaScript file src/calculator.js with the calculator logic."
-                    }
-                ]
-            }
-        else:
-            # Generic plan for other tasks
-            return {
-                "branch_name": "feature/new-task",
-                "commit_message": "feat: Complete development task",
-                "steps": []
-            }
+        match = self.plan_router.route(user_goal)
+        if match is not None:
+            return match.handler()
+        
+        # Generic plan for other tasks
+        return {
+            "branch_name": "feature/new-task",
+            "commit_message": "feat: Complete development task",
+            "steps": []
+        }
+    
+    def _create_factorial_plan(self) -> Dict[str, Any]:
+        """
+        Create the plan for adding calculate_factorial to utils.py.
+        
+        Returns:
+            Dict[str, Any]: The execution plan
+        """
+        return {
+            "branch_name": "feature/factorial-function",
+            "commit_message": "feat: Add factorial function and tests",
+            "steps": [
+                {
+                    "agent": "code_generation",
+                    "instruction": "Write a Python function calculate_factorial in the file src/utils.py. The function should handle non-negative integers."
+                },
+                {
+                    "agent": "code_generation",
+                    "instruction": "Write a pytest test case in tests/test_utils.py to verify the calculate_factorial function for inputs 0, 1, and 5."
+                },
+                {
+                    "agent": "testing",
+                    "instruction": "Run the test suite."
+                }
+            ]
+        }
+    
+    def _create_calculator_plan(self) -> Dict[str, Any]:
+        """
+        Create the plan for the calculator web page.
+        
+        Returns:
+            Dict[str, Any]: The execution plan
+        """
+        return {
+            "branch_name": "feature/calculator-page",
+            "commit_message": "feat: Add calculator web page",
+            "steps": [
+                {
+                    "agent": "code_generation",
+                    "instruction": "Create a new HTML file src/calculator.html with a fully functional calculator web page. Include CSS styling and JavaScript for calculator functionality. The calculator should support basic operations: addition, subtraction, multiplication, and division."
+                },
+                {
+                    "agent": "code_generation",
+                    "instruction": "Create a new CSS file src/calculator.css with styling for the calculator page."
+                },
+                {
+                    "agent": "code_generation",
+                    "instruction": "Create a new JavaScript file src/calculator.js with the calculator logic."
+                }
+            ]
+        }
     
     def _create_meta_plan(self, user_goal: str) -> Dict[str, Any]:
         """
@@ -226,31 +654,33 @@ class OrchestratorAgent:
             ]
         }
     
-    def _handle_test_failure(self, test_result: Dict[str, Any], plan: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_test_failure(self, test_result: Dict[str, Any], plan: Dict[str, Any],
+                             context: TaskContext) -> Dict[str, Any]:
         """
         Handle test failures by entering a correction loop.
         
         Args:
             test_result (Dict[str, Any]): The failed test results
             plan (Dict[str, Any]): The original execution plan
+            context (TaskContext): The task's agents and bookkeeping
             
         Returns:
             Dict[str, Any]: Result after attempting correction
         """
         # In a full implementation, this would analyze the error and
         # instruct the CodeGenerationAgent to fix the code
-        error_output = test_result.get("output", "Unknown error")
+        error_output = TestingAgent.describe_failures(test_result)
         
         # Send back to CodeGenerationAgent for correction
         correction_instruction = (
-            f"The tests failed with the following error: {error_output}. "
+            f"The tests failed with the following errors:\n{error_output}\n"
             "Please analyze the code and provide a corrected version."
         )
         
-        self.code_generation_agent.execute_task(correction_instruction)
+        context.code_generation_agent.execute_task(correction_instruction)
         
         # Run tests again
-        new_test_result = self.testing_agent.run_pytest_suite()
+        new_test_result = self._run_tests(context)
         
         if new_test_result["success"]:
             return {
@@ -260,9 +690,40 @@ class OrchestratorAgent:
         else:
             return {
                 "success": False,
-                "message": f"Failed to correct code after attempt: {new_test_result['output']}"
+                "message": f"Failed to correct code after attempt:\n{TestingAgent.describe_failures(new_test_result)}"
             }
 
 
-# Create a global instance of the orchestrator
-orchestrator_agent = OrchestratorAgent()
\ No newline at end of file
+def _worktree_pool_from_environment() -> Optional[WorktreePool]:
+    """
+    Build the worktree pool requested by GENESIS_WORKTREES, if any.
+    
+    GENESIS_WORKTREES is the number of worktrees (and so of concurrent tasks);
+    unset or 0 keeps every task in the current working directory.
+    
+    Returns:
+        Optional[WorktreePool]: The pool, or None if worktrees are disabled
+    """
+    size = int(os.environ.get("GENESIS_WORKTREES", "0"))
+    if size <= 0:
+        return None
+    return WorktreePool(".", state_path("worktrees"), max_size=size)
+
+
+def _create_orchestrator_agent() -> OrchestratorAgent:
+    """
+    Create the global orchestrator, configured from the environment.
+    
+    Returns:
+        OrchestratorAgent: The orchestrator
+    """
+    return OrchestratorAgent(
+        worktree_pool=_worktree_pool_from_environment(),
+        test_impact_analysis=os.environ.get("GENESIS_TEST_IMPACT", "1") != "0",
+        full_suite_before_commit=os.environ.get("GENESIS_FULL_SUITE_BEFORE_COMMIT", "0") == "1",
+        plan_cache=PlanCache(state_path("plans.sqlite3")) if os.environ.get("GENESIS_PLAN_CACHE", "1") != "0" else None
+    )
+
+
+# Create the global instance of the orchestrator on first use
+__getattr__ = registry.provide(__name__, orchestrator_agent=_create_orchestrator_agent)
\ No newline at end of file
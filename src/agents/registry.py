@@ -0,0 +1,121 @@
+"""
+Agent registry for the Genesis AI Framework.
+
+This module is responsible for:
+1. Knowing which module defines each shared agent, without importing it
+2. Creating each shared agent once, on first use, instead of when its module is imported
+3. Giving agent modules a module-level __getattr__, so existing imports such as
+   "from src.agents.git_agent import git_agent" keep working unchanged
+"""
+
+import importlib
+import threading
+from typing import Dict, Any, Callable, List
+
+# Module defining each shared agent
+AGENT_MODULES = {
+    "file_system_agent": "src.agents.file_system_agent",
+    "code_generation_agent": "src.agents.code_generation_agent",
+    "testing_agent": "src.agents.testing_agent",
+    "git_agent": "src.agents.git_agent",
+    "api_agent": "src.agents.api_agent",
+    "orchestrator_agent": "src.agents.orchestrator_agent"
+}
+
+
+class AgentRegistry:
+    """Creates the shared agents lazily and hands out the same instance afterwards."""
+    
+    def __init__(self, modules: Dict[str, str] = AGENT_MODULES):
+        """
+        Initialize the registry. Nothing is imported or created yet.
+        
+        Args:
+            modules (Dict[str, str]): Module registering each agent, imported on first use
+        """
+        self.modules = dict(modules)
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+    
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register how to create a shared agent.
+        
+        Args:
+            name (str): Name of the agent, e.g. "git_agent"
+            factory (Callable[[], Any]): Creates the agent
+        """
+        with self._lock:
+            self._factories[name] = factory
+    
+    def get(self, name: str) -> Any:
+        """
+        Get a shared agent, importing its module and creating it on first use.
+        
+        Args:
+            name (str): Name of the agent, e.g. "git_agent"
+        
+        Returns:
+            Any: The agent
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories and name in self.modules:
+                importlib.import_module(self.modules[name])
+            if name not in self._factories:
+                raise KeyError(f"Unknown agent: {name}")
+            instance = self._factories[name]()
+            self._instances[name] = instance
+            return instance
+    
+    def is_loaded(self, name: str) -> bool:
+        """
+        Check whether a shared agent was created.
+        
+        Args:
+            name (str): Name of the agent
+        
+        Returns:
+            bool: True if the agent exists
+        """
+        return name in self._instances
+    
+    def names(self) -> List[str]:
+        """
+        List the agents the registry can create.
+        
+        Returns:
+            List[str]: Sorted agent names
+        """
+        return sorted(set(self.modules) | set(self._factories))
+    
+    def provide(self, module_name: str, **factories: Callable[[], Any]) -> Callable[[str], Any]:
+        """
+        Register the shared agents of a module and build its module-level __getattr__.
+        
+        Args:
+            module_name (str): The module's __name__
+            **factories (Callable[[], Any]): Factory per global instance name
+        
+        Returns:
+            Callable[[str], Any]: A __getattr__ creating the instances on first access
+        """
+        for name, factory in factories.items():
+            self.register(name, factory)
+        
+        def __getattr__(name: str) -> Any:
+            if name in factories:
+                return self.get(name)
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        
+        return __getattr__
+
+
+# Create a global instance of the agent registry
+registry = AgentRegistry()
\ No newline at end of file
@@ -3,48 +3,457 @@ TestingAgent for the Genesis AI Framework.
 
 This agent is responsible for:
 1. Running the test suite
-2. Reporting test results in a structured way
+2. Running only the tests affected by a set of changed files
+3. Running the suite in parallel shards balanced by historical durations
+4. Running tests in a warm, pre-forked pytest process
+5. Skipping test files that passed before and whose dependencies are unchanged
+6. Reporting test results as they happen, with a compact summary of failures
 """
 
+import os
+import re
 import subprocess
 import sys
-from typing import Dict, Any, Union
-from google.adk.agents import Agent
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Iterable, List
+from src.agents.registry import registry
+from src.tools.testing_tools import (
+    TestImpactMap,
+    TestDurations,
+    TestRunSummary,
+    TestResultCache,
+    OutputTail,
+    JsonLinesReader,
+    PytestForkServer,
+    get_fork_server,
+    collect_test_files,
+    shard_test_files,
+    events_plugin_args,
+    format_failures,
+    pytest_environment
+)
+
+# Characters of raw output used to describe a run that failed without a failing test
+MAX_DESCRIBED_OUTPUT_CHARS = 4000
 
 
 class TestingAgent:
     """Agent specialized in running tests and reporting results."""
     
-    def __init__(self):
-        """Initialize the testing agent."""
-        pass
+    def __init__(self, root: str = ".", workers: Optional[int] = None, warm: Optional[bool] = None,
+                 cache_results: Optional[bool] = None):
+        """
+        Initialize the testing agent.
+        
+        Args:
+            root (str): Project directory the test suite runs in
+            workers (int, optional): Number of pytest processes a run is sharded across;
+                defaults to GENESIS_TEST_WORKERS, or 1 to run everything in one process
+            warm (bool, optional): Run unsharded tests in the project's warm fork server;
+                defaults to GENESIS_WARM_TESTS=1
+            cache_results (bool, optional): When running given test files, skip those that
+                passed before and whose dependencies are unchanged; defaults to off unless
+                GENESIS_TEST_CACHE=1
+        """
+        self.root = root
+        self.workers = workers or int(os.environ.get("GENESIS_TEST_WORKERS", "1"))
+        self.warm = warm if warm is not None else os.environ.get("GENESIS_WARM_TESTS", "0") == "1"
+        self.cache_results = (cache_results if cache_results is not None
+                              else os.environ.get("GENESIS_TEST_CACHE", "0") == "1")
+        self.impact_map = TestImpactMap(root)
+        self.durations = TestDurations(root)
+        self.result_cache = TestResultCache(root)
     
-    def run_pytest_suite(self) -> Dict[str, Union[bool, str]]:
+    def run_pytest_suite(self, on_output: Optional[Callable[[str], None]] = None,
+                         test_paths: Optional[List[str]] = None,
+                         on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         use_cache: Optional[bool] = None) -> Dict[str, Any]:
         """
         Execute pytest in the project's root directory.
         
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of pytest
+                output as soon as it is printed
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test
+                result event as soon as the test finishes
+            use_cache (bool, optional): Whether cached passing results may be reused for
+                the given test_paths; defaults to the agent's cache_results setting. A run of
+                the whole suite is collected by pytest and never uses the cache.
+        
         Returns:
-            Dict[str, Union[bool, str]]: Test results with success status and output
+            Dict[str, Any]: Test results with success status, the end of the combined
+                stdout and stderr as "output", a structured "summary" with counts and
+                failures, and the run's "timing", split into startup and execution seconds.
+                Test files answered from the cache are listed in "cached_tests".
         """
         try:
-            # Run pytest and capture output
-            result = subprocess.run(
-                [sys.executable, "-m", "pytest", "-v"],
-                capture_output=True,
-                text=True,
-                cwd="."
-            )
-            
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout if result.returncode == 0 else result.stderr
-            }
+            use_cache = self.cache_results if use_cache is None else use_cache
+            if use_cache and test_paths and all(path.endswith(".py") for path in test_paths):
+                return self._run_with_result_cache(on_output, on_event, test_paths)
+            return self._run(on_output, on_event, test_paths)
         except Exception as e:
             return {
                 "success": False,
                 "output": f"Error running pytest: {str(e)}"
             }
     
+    def _run(self, on_output: Optional[Callable[[str], None]],
+             on_event: Optional[Callable[[Dict[str, Any]], None]],
+             test_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Execute pytest sharded, warm or in a single new process, as configured.
+        
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of pytest output
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+            
+        Returns:
+            Dict[str, Any]: Test results as from run_pytest_suite
+        """
+        if self.workers > 1:
+            sharded = self._run_pytest_sharded(on_output, on_event, test_paths)
+            if sharded is not None:
+                return sharded
+        
+        if self.warm and PytestForkServer.is_supported():
+            return self._run_pytest_warm(on_output, on_event, test_paths)
+        
+        return self._run_pytest_process(on_output, on_event, test_paths)
+    
+    def _run_with_result_cache(self, on_output: Optional[Callable[[str], None]],
+                               on_event: Optional[Callable[[Dict[str, Any]], None]],
+                               test_paths: List[str]) -> Dict[str, Any]:
+        """
+        Run only the test files without a cached passing result, then cache the ones that pass.
+        
+        A cached result is keyed by a hash of the test file, everything it imports
+        from the project, its conftest.py files and the project configuration.
+        
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of pytest output
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+            test_paths (List[str]): Test files to run
+            
+        Returns:
+            Dict[str, Any]: Test results as from run_pytest_suite
+        """
+        fingerprints = self.impact_map.fingerprints(test_paths)
+        candidates = list(fingerprints)
+        
+        cached = {}
+        for path, fingerprint in fingerprints.items():
+            hit = self.result_cache.get(fingerprint) if fingerprint else None
+            if hit is not None:
+                cached[path] = hit["tests"]
+        remaining = [path for path in candidates if path not in cached]
+        
+        if cached and on_output is not None:
+            on_output(f"Reusing passing results of {len(cached)} unchanged test files")
+        if remaining:
+            result = self._run(on_output, on_event, remaining)
+        else:
+            result = {
+                "success": True,
+                "output": f"All {len(cached)} test files passed before and are unchanged",
+                "summary": TestRunSummary().to_dict(),
+                "timing": {"startup": 0.0, "execution": 0.0, "total": 0.0}
+            }
+        
+        summary = result.get("summary")
+        if summary is None:
+            return result
+        for path, tests in summary["passed_files"].items():
+            if fingerprints.get(path) and path not in cached:
+                self.result_cache.put(fingerprints[path], path, tests)
+        
+        cached_tests = sum(cached.values())
+        summary["cached"] = cached_tests
+        summary["passed"] += cached_tests
+        summary["total"] += cached_tests
+        result["cached_tests"] = sorted(cached)
+        return result
+    
+    def run_impacted_tests(self, changed_paths: Iterable[str],
+                           on_output: Optional[Callable[[str], None]] = None,
+                           on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run only the test files that can be affected by the changed files.
+        
+        Falls back to the full suite when the change can't be traced through
+        imports, e.g. for non-Python files or conftest.py.
+        
+        Args:
+            changed_paths (Iterable[str]): Changed files, relative to the project root
+            on_output (Callable[[str], None], optional): Called with each line of pytest
+                output as soon as it is printed
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test
+                result event as soon as the test finishes
+            
+        Returns:
+            Dict[str, Any]: Test results as from run_pytest_suite, plus
+                "full_suite" and the "selected_tests" that ran
+        """
+        try:
+            selected = self.impact_map.impacted_tests(changed_paths)
+        except Exception as e:
+            print(f"Error analyzing test impact, running the full suite: {str(e)}")
+            selected = None
+        
+        if selected is None:
+            result = self.run_pytest_suite(on_output, on_event=on_event)
+        elif not selected:
+            message = "No tests are affected by the changed files"
+            if on_output is not None:
+                on_output(message)
+            result = {"success": True, "output": message, "summary": TestRunSummary().to_dict()}
+        else:
+            result = self.run_pytest_suite(on_output, selected, on_event)
+        
+        result["full_suite"] = selected is None
+        result["selected_tests"] = selected
+        return result
+    
+    @staticmethod
+    def describe_failures(test_result: Dict[str, Any]) -> str:
+        """
+        Describe why a test run failed, as compactly as possible.
+        
+        Args:
+            test_result (Dict[str, Any]): A result from run_pytest_suite
+            
+        Returns:
+            str: One line per failing test, or the end of the output if the run
+                failed without a test failing, e.g. on a usage error
+        """
+        description = format_failures(test_result.get("summary") or {})
+        if description:
+            return description
+        return test_result.get("output", "Unknown error")[-MAX_DESCRIBED_OUTPUT_CHARS:]
+    
+    def _run_pytest_process(self, on_output: Optional[Callable[[str], None]],
+                            on_event: Optional[Callable[[Dict[str, Any]], None]],
+                            test_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Execute pytest in a new process, reading its output and events while it runs.
+        
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of pytest output
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+            
+        Returns:
+            Dict[str, Any]: Test results as from run_pytest_suite
+        """
+        summary = TestRunSummary()
+        output = OutputTail()
+        with tempfile.TemporaryDirectory(prefix="genesis-pytest-") as run_dir:
+            events = JsonLinesReader(os.path.join(run_dir, "events.jsonl"))
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                self._pytest_command(test_paths, events.path),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                cwd=self.root,
+                env=pytest_environment()
+            )
+            
+            for line in process.stdout:
+                output.append(line)
+                if on_output is not None:
+                    on_output(line.rstrip("\n"))
+                self._forward_events(events, summary, on_event)
+            
+            returncode = process.wait()
+            self._forward_events(events, summary, on_event)
+        
+        return {
+            "success": returncode == 0,
+            "output": output.text(),
+            "summary": summary.to_dict(),
+            "timing": self._cold_timing(started, output.last_line())
+        }
+    
+    def _run_pytest_sharded(self, on_output: Optional[Callable[[str], None]],
+                            on_event: Optional[Callable[[Dict[str, Any]], None]],
+                            test_paths: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Execute the suite as several pytest processes and merge their results.
+        
+        The collected test files are split into shards of similar historical
+        duration, all shards report into one summary, and the measured
+        durations are stored for the next run.
+        
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of output,
+                prefixed with the shard number
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+        
+        Returns:
+            Optional[Dict[str, Any]]: Test results as from run_pytest_suite, with the
+                "shards" that ran, or None if the run can't be sharded and should run in one process
+        """
+        if test_paths and all(os.path.isfile(os.path.join(self.root, path)) for path in test_paths):
+            test_files = {os.path.normpath(path): 1 for path in test_paths}
+        else:
+            test_files = collect_test_files(self.root, test_paths)
+        if not test_files or len(test_files) < 2:
+            return None
+        
+        shards = shard_test_files(test_files, self.workers, self.durations)
+        summary = TestRunSummary()
+        output = OutputTail()
+        output_lock = threading.Lock()
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="genesis-shards-") as run_dir:
+            processes = []
+            for index, shard in enumerate(shards):
+                events = JsonLinesReader(os.path.join(run_dir, f"shard-{index}.jsonl"))
+                process = subprocess.Popen(
+                    self._pytest_command(shard, events.path) + ["-p", "no:cacheprovider"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    cwd=self.root,
+                    env=pytest_environment()
+                )
+                processes.append((index, shard, events, process))
+            
+            # Read every shard's output on its own thread so no pipe fills up
+            def read_output(index: int, events: JsonLinesReader, process: subprocess.Popen) -> None:
+                for line in process.stdout:
+                    with output_lock:
+                        output.append(f"[shard {index}] {line}")
+                    if on_output is not None:
+                        on_output(f"[shard {index}] {line.rstrip()}")
+                    self._forward_events(events, summary, on_event)
+            
+            readers = [threading.Thread(target=read_output, args=(index, events, process))
+                       for index, _, events, process in processes]
+            for reader in readers:
+                reader.start()
+            
+            shard_results = []
+            for (index, shard, events, process), reader in zip(processes, readers):
+                returncode = process.wait()
+                reader.join()
+                self._forward_events(events, summary, on_event)
+                shard_results.append({"shard": index, "files": shard, "returncode": returncode})
+        
+        self.durations.update(summary.durations)
+        total = time.perf_counter() - started
+        return {
+            "success": all(shard_result["returncode"] == 0 for shard_result in shard_results),
+            "output": output.text(),
+            "summary": summary.to_dict(),
+            "shards": shard_results,
+            "timing": {"startup": None, "execution": None, "total": total}
+        }
+    
+    def _run_pytest_warm(self, on_output: Optional[Callable[[str], None]],
+                         on_event: Optional[Callable[[Dict[str, Any]], None]],
+                         test_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Execute pytest in a child forked from the project's warm fork server.
+        
+        Args:
+            on_output (Callable[[str], None], optional): Called with each line of pytest output
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+        
+        Returns:
+            Dict[str, Any]: Test results as from run_pytest_suite, plus the
+                "purged_modules" that were re-imported because they changed
+        """
+        summary = TestRunSummary()
+        with tempfile.TemporaryDirectory(prefix="genesis-pytest-") as run_dir:
+            events = JsonLinesReader(os.path.join(run_dir, "events.jsonl"))
+            result = get_fork_server(self.root).run(
+                self._pytest_args(test_paths, events.path),
+                on_output,
+                lambda: self._forward_events(events, summary, on_event)
+            )
+            self._forward_events(events, summary, on_event)
+        
+        return {
+            "success": result["returncode"] == 0,
+            "output": result["output"],
+            "summary": summary.to_dict(),
+            "timing": result["timing"],
+            "purged_modules": result["purged_modules"]
+        }
+    
+    def _forward_events(self, events: JsonLinesReader, summary: TestRunSummary,
+                        on_event: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """
+        Read new test events into the summary and pass test results on.
+        
+        Args:
+            events (JsonLinesReader): The run's events file
+            summary (TestRunSummary): The run's summary
+            on_event (Callable[[Dict[str, Any]], None], optional): Called with each test event
+        """
+        for event in events.read_new():
+            summary.add(event)
+            if on_event is not None and event.get("event") == "test":
+                on_event(event)
+    
+    def _cold_timing(self, started: float, summary_line: str) -> Dict[str, Optional[float]]:
+        """
+        Split a pytest process's wall time into startup and execution.
+        
+        Execution is the session time pytest prints in its summary line; the
+        rest is interpreter startup, plugin discovery and imports.
+        
+        Args:
+            started (float): time.perf_counter() when the process was started
+            summary_line (str): The last line of the process's output
+        
+        Returns:
+            Dict[str, Optional[float]]: "startup", "execution" and "total" seconds;
+                startup and execution are None if the summary line is missing
+        """
+        total = time.perf_counter() - started
+        match = re.search(r" in ([0-9.]+)s", summary_line)
+        if match is None:
+            return {"startup": None, "execution": None, "total": total}
+        execution = min(float(match.group(1)), total)
+        return {"startup": total - execution, "execution": execution, "total": total}
+    
+    def _pytest_command(self, test_paths: Optional[List[str]] = None,
+                        events_path: Optional[str] = None) -> List[str]:
+        """
+        Build the pytest command line.
+        
+        Args:
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+            events_path (str, optional): File the events plugin writes test results to
+            
+        Returns:
+            List[str]: The command and its arguments
+        """
+        return [sys.executable, "-m", "pytest", *self._pytest_args(test_paths, events_path)]
+    
+    def _pytest_args(self, test_paths: Optional[List[str]] = None,
+                     events_path: Optional[str] = None) -> List[str]:
+        """
+        Build the arguments passed to pytest.
+        
+        Args:
+            test_paths (List[str], optional): Test files to run instead of the whole suite
+            events_path (str, optional): File the events plugin writes test results to
+            
+        Returns:
+            List[str]: The arguments
+        """
+        plugin_args = events_plugin_args(events_path) if events_path else []
+        return ["-v", *plugin_args, *(test_paths or [])]
+    
     def execute_task(self, instruction: str) -> Dict[str, Any]:
         """
         Execute a testing task based on natural language instruction.
@@ -68,5 +477,5 @@ class TestingAgent:
         }
 
 
-# Create a global instance of the testing agent
-testing_agent = TestingAgent()
\ No newline at end of file
+# Create the global instance of the testing agent on first use
+__getattr__ = registry.provide(__name__, testing_agent=TestingAgent)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Event bus for the Genesis AI Framework.
+
+This module is responsible for:
+1. Publishing progress events from the orchestrator and its agents
+2. Fanning events out to any number of live subscribers
+3. Replaying recent events to subscribers that connect late
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class Subscription:
+    """A subscriber's view of the event stream."""
+    
+    def __init__(self, task_id: Optional[str], max_queued: int):
+        """
+        Initialize a subscription.
+        
+        Args:
+            task_id (Optional[str]): Only receive events for this task, or all events if None
+            max_queued (int): Maximum number of undelivered events before new ones are dropped
+        """
+        self.task_id = task_id
+        self.dropped = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queued)
+    
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """
+        Check whether an event belongs to this subscription.
+        
+        Args:
+            event (Dict[str, Any]): The event
+        
+        Returns:
+            bool: True if the subscriber wants the event
+        """
+        return self.task_id is None or event.get("task_id") == self.task_id
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+        
+        Args:
+            timeout (float, optional): Seconds to wait before giving up
+        
+        Returns:
+            Optional[Dict[str, Any]]: The next event, or None on timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """
+        Queue an event without ever blocking the publisher.
+        
+        Args:
+            event (Dict[str, Any]): The event
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventBus:
+    """In-process publish/subscribe hub for task progress events."""
+    
+    def __init__(self, replay_size: int = 1000, max_queued: int = 1000):
+        """
+        Initialize the event bus.
+        
+        Args:
+            replay_size (int): Number of recent events kept for late subscribers
+            max_queued (int): Per-subscriber limit of undelivered events
+        """
+        self.max_queued = max_queued
+        self._recent: deque = deque(maxlen=replay_size)
+        self._subscribers = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def publish(self, event_type: str, task_id: Optional[str] = None, **data: Any) -> Dict[str, Any]:
+        """
+        Publish an event to all matching subscribers.
+        
+        Args:
+            event_type (str): The kind of event, e.g. "step_started"
+            task_id (str, optional): The task the event belongs to
+            **data: Event payload
+        
+        Returns:
+            Dict[str, Any]: The published event
+        """
+        with self._lock:
+            event = {
+                "id": next(self._ids),
+                "type": event_type,
+                "task_id": task_id,
+                "timestamp": time.time(),
+                "data": data
+            }
+            self._recent.append(event)
+            # Deliver under the lock so every subscriber sees events in id order;
+            # _deliver never blocks, so a slow subscriber cannot stall publishers
+            for subscriber in self._subscribers:
+                if subscriber.matches(event):
+                    subscriber._deliver(event)
+        return event
+    
+    def subscribe(self, task_id: Optional[str] = None, replay: bool = True) -> Subscription:
+        """
+        Start receiving events.
+        
+        Args:
+            task_id (str, optional): Only receive events for this task
+            replay (bool): Deliver matching recent events first
+        
+        Returns:
+            Subscription: The new subscription; pass it to unsubscribe when done
+        """
+        subscription = Subscription(task_id, self.max_queued)
+        with self._lock:
+            if replay:
+                for event in self._recent:
+                    if subscription.matches(event):
+                        subscription._deliver(event)
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop delivering events to a subscription.
+        
+        Args:
+            subscription (Subscription): The subscription returned by subscribe
+        """
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+
+# Create a global instance of the event bus
+event_bus = EventBus()
\ No newline at end of file
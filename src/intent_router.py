@@ -0,0 +1,214 @@
+"""
+Intent router for the Genesis AI Framework.
+
+This module is responsible for:
+1. Keeping a registry of routes, each recognized by keywords in a goal or instruction
+2. Compiling every keyword into a single Aho-Corasick automaton, so matching
+   takes one pass over the text however many routes are registered
+3. Ranking matching routes by priority and detecting routes that conflict
+"""
+
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+
+class RouteMatch:
+    """A route whose keywords were all found in a text."""
+    
+    def __init__(self, name: str, priority: int, keywords: Tuple[str, ...], handler: Optional[Callable[..., Any]],
+                 order: int):
+        """
+        Initialize the match.
+        
+        Args:
+            name (str): Name of the route
+            priority (int): Priority of the route; higher wins
+            keywords (Tuple[str, ...]): The keywords that matched
+            handler (Callable, optional): Handler registered with the route
+            order (int): Registration order of the route, breaking ties between priorities
+        """
+        self.name = name
+        self.priority = priority
+        self.keywords = keywords
+        self.handler = handler
+        self.order = order
+    
+    def __repr__(self) -> str:
+        return f"RouteMatch({self.name!r}, priority={self.priority}, keywords={self.keywords!r})"
+
+
+class IntentRouter:
+    """Routes texts to registered handlers by the keywords they contain."""
+    
+    def __init__(self, case_sensitive: bool = False):
+        """
+        Initialize an empty router.
+        
+        Args:
+            case_sensitive (bool): Whether keywords must match the case of the text
+        """
+        self.case_sensitive = case_sensitive
+        # Per route: (name, priority, keywords that must all appear, handler)
+        self._routes: List[Tuple[str, int, Tuple[str, ...], Optional[Callable[..., Any]]]] = []
+        self._keywords: Dict[str, int] = {}
+        # Transitions, failure links and the keywords ending in each state
+        self._automaton: Optional[Tuple[List[Dict[str, int]], List[int], List[List[int]]]] = None
+        # Routes that need each keyword
+        self._routes_by_keyword: List[List[int]] = []
+    
+    def register(self, name: str, *keywords: str, priority: int = 0,
+                 handler: Optional[Callable[..., Any]] = None) -> None:
+        """
+        Register a route that matches texts containing all of the given keywords.
+        
+        Registering the same name again adds an alternative set of keywords.
+        
+        Args:
+            name (str): Name of the route
+            *keywords (str): Keywords that must all appear in the text
+            priority (int): Priority of the route; higher wins when several match
+            handler (Callable, optional): Handler returned with the match
+        """
+        if not keywords:
+            raise ValueError(f"Route {name!r} needs at least one keyword")
+        keywords = tuple(self._normalize(keyword) for keyword in keywords)
+        route = len(self._routes)
+        self._routes.append((name, priority, keywords, handler))
+        for keyword in set(keywords):
+            if keyword not in self._keywords:
+                self._keywords[keyword] = len(self._keywords)
+                self._routes_by_keyword.append([])
+            self._routes_by_keyword[self._keywords[keyword]].append(route)
+        self._automaton = None
+    
+    def match(self, text: str) -> List[RouteMatch]:
+        """
+        Find every route whose keywords all appear in a text.
+        
+        Args:
+            text (str): The goal or instruction
+        
+        Returns:
+            List[RouteMatch]: Matching routes, highest priority first and in
+                registration order within a priority
+        """
+        found = self._find_keywords(self._normalize(text))
+        counts: Dict[int, int] = {}
+        for keyword in found:
+            for route in self._routes_by_keyword[keyword]:
+                counts[route] = counts.get(route, 0) + 1
+        
+        matches: Dict[str, RouteMatch] = {}
+        for route, count in sorted(counts.items()):
+            name, priority, keywords, handler = self._routes[route]
+            if count == len(set(keywords)) and name not in matches:
+                matches[name] = RouteMatch(name, priority, keywords, handler, route)
+        return sorted(matches.values(), key=lambda match: (-match.priority, match.order))
+    
+    def route(self, text: str) -> Optional[RouteMatch]:
+        """
+        Pick the route for a text.
+        
+        Args:
+            text (str): The goal or instruction
+        
+        Returns:
+            Optional[RouteMatch]: The highest-priority match, the earliest registered on
+                a tie, or None if no route matches
+        """
+        matches = self.match(text)
+        return matches[0] if matches else None
+    
+    def conflicts(self) -> List[Tuple[str, str]]:
+        """
+        Find routes that can't be told apart by priority.
+        
+        A route conflicts with another of the same priority when every text
+        matching it also matches the other, because each of the other's
+        keywords is contained in one of its own. Only registration order then
+        decides between them.
+        
+        Returns:
+            List[Tuple[str, str]]: (narrower route, route matching at least as broadly) pairs
+        """
+        conflicts = []
+        for index, (name, priority, keywords, _) in enumerate(self._routes):
+            for other, (other_name, other_priority, other_keywords, _) in enumerate(self._routes):
+                if index == other or name == other_name or priority != other_priority:
+                    continue
+                if all(any(needed in keyword for keyword in keywords) for needed in other_keywords):
+                    pair = (name, other_name)
+                    if pair not in conflicts:
+                        conflicts.append(pair)
+        return conflicts
+    
+    def _normalize(self, text: str) -> str:
+        """
+        Apply the router's case sensitivity to a text.
+        
+        Args:
+            text (str): Text or keyword
+        
+        Returns:
+            str: The text to match
+        """
+        return text if self.case_sensitive else text.lower()
+    
+    def _find_keywords(self, text: str) -> Set[int]:
+        """
+        Run the automaton over a text.
+        
+        Args:
+            text (str): The normalized text
+        
+        Returns:
+            Set[int]: Indices of the keywords found
+        """
+        transitions, failures, outputs = self._compile()
+        found: Set[int] = set()
+        state = 0
+        for character in text:
+            while state and character not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(character, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+    
+    def _compile(self) -> Tuple[List[Dict[str, int]], List[int], List[List[int]]]:
+        """
+        Build the Aho-Corasick automaton for the registered keywords, once per change.
+        
+        Returns:
+            Tuple: The transitions, failure links and keywords found at each state
+        """
+        if self._automaton is not None:
+            return self._automaton
+        
+        transitions: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword, index in self._keywords.items():
+            state = 0
+            for character in keyword:
+                if character not in transitions[state]:
+                    transitions.append({})
+                    outputs.append([])
+                    transitions[state][character] = len(transitions) - 1
+                state = transitions[state][character]
+            outputs[state].append(index)
+        
+        # Failure links point at the longest proper suffix that is also a prefix of a keyword
+        failures = [0] * len(transitions)
+        pending = deque(transitions[0].values())
+        while pending:
+            state = pending.popleft()
+            for character, child in transitions[state].items():
+                failure = failures[state]
+                while failure and character not in transitions[failure]:
+                    failure = failures[failure]
+                failures[child] = transitions[failure].get(character, 0)
+                outputs[child] = outputs[child] + outputs[failures[child]]
+                pending.append(child)
+        
+        self._automaton = (transitions, failures, outputs)
+        return self._automaton
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Plan cache for the Genesis AI Framework.
+
+This module is responsible for:
+1. Memoizing execution plans by a normalized goal and the repository state
+   they were made for, so repeated goals skip planning
+2. Expiring plans after a time to live and evicting the least recently used
+   ones beyond a size limit
+3. Persisting plans in SQLite and counting hits and misses
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    goal TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plans_last_used ON plans (last_used);
+"""
+
+# Seconds a cached plan stays valid
+DEFAULT_PLAN_TTL = 7 * 24 * 3600
+
+
+def normalize_goal(goal: str) -> str:
+    """
+    Normalize a goal so trivially different phrasings share a plan.
+    
+    Case, surrounding and repeated whitespace and trailing punctuation are ignored.
+    
+    Args:
+        goal (str): The user's goal
+    
+    Returns:
+        str: The normalized goal
+    """
+    return re.sub(r"\s+", " ", goal).strip().rstrip(".!?;: ").lower()
+
+
+class PlanCache:
+    """Persistent, size-bounded cache of execution plans with a time to live."""
+    
+    def __init__(self, path: str = ":memory:", max_entries: int = 1000, ttl: float = DEFAULT_PLAN_TTL):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+        
+        Args:
+            path (str): SQLite database file, or ":memory:" for a non-persistent cache
+            max_entries (int): Number of plans kept before the least recently used are evicted
+            ttl (float): Seconds after which a plan is no longer used
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+    
+    def get(self, goal: str, fingerprint: str, kind: str = "standard") -> Optional[Dict[str, Any]]:
+        """
+        Look up a plan and mark it as recently used.
+        
+        Args:
+            goal (str): The user's goal
+            fingerprint (str): Repository state the plan has to be made for, e.g. the HEAD commit
+            kind (str): Kind of plan, e.g. "standard" or "meta"
+        
+        Returns:
+            Optional[Dict[str, Any]]: A fresh copy of the plan, or None on a miss
+        """
+        key = self._key(goal, fingerprint, kind)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT plan, created_at FROM plans WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                connection.execute("DELETE FROM plans WHERE key = ?", (key,))
+                connection.commit()
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE plans SET last_used = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+            return json.loads(row[0])
+    
+    def put(self, goal: str, fingerprint: str, plan: Dict[str, Any], kind: str = "standard") -> None:
+        """
+        Store a plan, evicting expired and least recently used plans beyond the size limit.
+        
+        Args:
+            goal (str): The user's goal
+            fingerprint (str): Repository state the plan was made for
+            plan (Dict[str, Any]): The plan; it must be JSON-serializable
+            kind (str): Kind of plan, e.g. "standard" or "meta"
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO plans (key, kind, goal, fingerprint, plan, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._key(goal, fingerprint, kind), kind, normalize_goal(goal), fingerprint,
+                 json.dumps(plan), now, now)
+            )
+            connection.execute("DELETE FROM plans WHERE created_at < ?", (now - self.ttl,))
+            evicted = connection.execute(
+                "DELETE FROM plans WHERE key IN ("
+                "SELECT key FROM plans ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            connection.commit()
+            self.evictions += max(evicted, 0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how well the cache is doing.
+        
+        Returns:
+            Dict[str, Any]: Stored "entries", "hits", "misses", "expired" and "evictions"
+                counts and the "hit_rate" since the cache was created
+        """
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def clear(self) -> None:
+        """Drop every cached plan."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM plans")
+            connection.commit()
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _key(self, goal: str, fingerprint: str, kind: str) -> str:
+        """
+        Build the cache key of a plan.
+        
+        Args:
+            goal (str): The user's goal
+            fingerprint (str): Repository state
+            kind (str): Kind of plan
+        
+        Returns:
+            str: The key
+        """
+        return hashlib.sha256(f"{kind}\0{fingerprint}\0{normalize_goal(goal)}".encode("utf-8")).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database on first use. Caller holds the lock.
+        
+        Returns:
+            sqlite3.Connection: The open connection
+        """
+        if self._connection is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
\ No newline at end of file
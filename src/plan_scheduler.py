@@ -0,0 +1,163 @@
+"""
+Plan step scheduler for the Genesis AI Framework.
+
+This module is responsible for:
+1. Building a dependency graph from the steps of an orchestrator plan
+2. Inferring dependencies from the file paths each step targets
+3. Running independent steps concurrently on a bounded thread pool
+4. Treating testing steps as barriers between groups of steps
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Set, Optional, Callable
+
+# File paths mentioned in an instruction, e.g. "src/utils.py" or "requirements.txt"
+FILE_PATH_PATTERN = re.compile(
+    r"(?<![\w/.-])([\w./-]*[\w-]\.(?:py|html|css|js|txt|md|json|toml|cfg|ini|yaml|yml))\b"
+)
+
+# Agents whose steps must run alone, after everything before them and before everything after them
+BARRIER_AGENTS = {"testing"}
+
+
+class PlanScheduler:
+    """Runs the steps of a plan as a dependency graph instead of a flat list."""
+    
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_workers (int): Maximum number of steps executed at the same time
+        """
+        self.max_workers = max(1, max_workers)
+    
+    def extract_targets(self, step: Dict[str, Any]) -> Set[str]:
+        """
+        Determine the file paths a step reads or writes.
+        
+        Args:
+            step (Dict[str, Any]): The plan step
+        
+        Returns:
+            Set[str]: Normalized file paths declared in "targets" or mentioned in the instruction
+        """
+        if "targets" in step:
+            paths = step["targets"]
+        else:
+            paths = FILE_PATH_PATTERN.findall(step.get("instruction", ""))
+        return {os.path.normpath(path) for path in paths}
+    
+    def build_dependencies(self, steps: List[Dict[str, Any]]) -> List[Set[int]]:
+        """
+        Build the dependency graph of a plan.
+        
+        A step depends on the steps listed in its "depends_on" key (indices or
+        "id" values) and on every earlier step that targets one of its files.
+        Barrier steps (testing steps, steps marked "barrier", and steps without
+        any known targets) depend on all earlier steps, and all later steps
+        depend on them.
+        
+        Args:
+            steps (List[Dict[str, Any]]): The plan steps in their declared order
+        
+        Returns:
+            List[Set[int]]: For each step index, the indices of the steps it waits for
+        """
+        ids = {step["id"]: index for index, step in enumerate(steps) if "id" in step}
+        targets = [self.extract_targets(step) for step in steps]
+        dependencies: List[Set[int]] = []
+        last_barrier: Optional[int] = None
+        
+        for index, step in enumerate(steps):
+            deps: Set[int] = set()
+            
+            for dep in step.get("depends_on", []):
+                dep_index = ids.get(dep, dep)
+                if not isinstance(dep_index, int) or not 0 <= dep_index < index:
+                    raise ValueError(f"Step {index} has an invalid dependency: {dep!r}")
+                deps.add(dep_index)
+            
+            if self._is_barrier(step, targets[index]):
+                deps.update(range(index))
+                last_barrier = index
+            else:
+                if last_barrier is not None:
+                    deps.add(last_barrier)
+                for earlier in range(index):
+                    if targets[index] & targets[earlier]:
+                        deps.add(earlier)
+            
+            dependencies.append(deps)
+        
+        return dependencies
+    
+    def run(self, steps: List[Dict[str, Any]],
+            execute_step: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+            should_stop: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Execute the steps of a plan, running independent steps concurrently.
+        
+        Args:
+            steps (List[Dict[str, Any]]): The plan steps
+            execute_step (Callable): Runs one step. Returning a dict stops the plan
+                and that dict becomes the result; returning None lets it continue.
+            should_stop (Callable, optional): Polled before new steps are started;
+                returning True stops the plan without starting further steps
+        
+        Returns:
+            Optional[Dict[str, Any]]: The result that stopped the plan, or None if every step ran
+        """
+        dependencies = self.build_dependencies(steps)
+        remaining = {index: set(deps) for index, deps in enumerate(dependencies)}
+        stop_result: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            
+            while remaining or running:
+                stopping = stop_result is not None or error is not None or (should_stop is not None and should_stop())
+                
+                if not stopping:
+                    ready = sorted(index for index, deps in remaining.items() if not deps)
+                    for index in ready:
+                        del remaining[index]
+                        running[executor.submit(execute_step, steps[index])] = index
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BaseException as e:
+                        error = error or e
+                        continue
+                    if result is not None and stop_result is None:
+                        stop_result = result
+                    for deps in remaining.values():
+                        deps.discard(index)
+        
+        if error is not None:
+            raise error
+        return stop_result
+    
+    def _is_barrier(self, step: Dict[str, Any], targets: Set[str]) -> bool:
+        """
+        Check whether a step must run in isolation.
+        
+        Args:
+            step (Dict[str, Any]): The plan step
+            targets (Set[str]): The file paths the step targets
+        
+        Returns:
+            bool: True if the step is a barrier
+        """
+        if "barrier" in step:
+            return bool(step["barrier"])
+        return step.get("agent") in BARRIER_AGENTS or not targets
\ No newline at end of file
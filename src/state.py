@@ -0,0 +1,41 @@
+"""
+Local state directory for the Genesis AI Framework.
+
+Caches, histories and other files the framework keeps between runs live in a
+single directory, ".genesis" in the working directory unless the
+GENESIS_STATE_DIR environment variable points elsewhere.
+"""
+
+import hashlib
+import os
+
+
+def state_path(*parts: str) -> str:
+    """
+    Build an absolute path inside the state directory.
+    
+    The directory itself is not created; callers create it when they first write.
+    
+    Args:
+        *parts (str): Path components below the state directory
+    
+    Returns:
+        str: The absolute path
+    """
+    return os.path.abspath(os.path.join(os.environ.get("GENESIS_STATE_DIR", ".genesis"), *parts))
+
+
+def project_cache_path(root: str, kind: str, extension: str = ".json") -> str:
+    """
+    Build the path of a per-project cache file in the state directory.
+    
+    Args:
+        root (str): Project directory
+        kind (str): Name of the cache, e.g. "test_impact"
+        extension (str): File extension
+    
+    Returns:
+        str: The absolute path of the file
+    """
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+    return state_path(kind, f"{digest}{extension}")
\ No newline at end of file
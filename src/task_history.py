@@ -0,0 +1,361 @@
+"""
+Task history store for the Genesis AI Framework.
+
+This module is responsible for:
+1. Persisting task start and completion records in an append-only SQLite log
+2. Keeping the most recent tasks in a bounded in-memory ring buffer
+3. Serving history pages with cursor-based pagination and filters
+4. Compacting the log so every finished task is stored as a single record
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    task TEXT NOT NULL,
+    status TEXT NOT NULL,
+    success INTEGER,
+    result TEXT,
+    started_at REAL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_task_records_task_id ON task_records (task_id, seq);
+CREATE INDEX IF NOT EXISTS idx_task_records_status ON task_records (status, seq);
+"""
+
+# Selects the newest record of every task, i.e. the merged view of start and completion
+LATEST_RECORDS = """
+SELECT seq, task_id, task, status, success, result, started_at, completed_at
+FROM task_records AS record
+WHERE NOT EXISTS (
+    SELECT 1 FROM task_records AS later WHERE later.task_id = record.task_id AND later.seq > record.seq
+)
+"""
+
+
+class TaskHistoryStore:
+    """Bounded, paginated and persistent record of the tasks the orchestrator ran."""
+    
+    def __init__(self, path: str = ":memory:", ring_size: int = 200, compact_every: int = 500):
+        """
+        Initialize the store. The database is opened lazily on first use.
+        
+        Args:
+            path (str): SQLite database file, or ":memory:" for a non-persistent store
+            ring_size (int): Number of recent tasks kept in memory
+            compact_every (int): Compact the log after this many completed tasks
+        """
+        self.path = path
+        self.ring_size = ring_size
+        self.compact_every = compact_every
+        self._connection: Optional[sqlite3.Connection] = None
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ring_holds_everything = True
+        self._completed_since_compaction = 0
+        self._lock = threading.RLock()
+    
+    def record_started(self, task_id: str, task: str) -> Dict[str, Any]:
+        """
+        Append a record for a task that has started.
+        
+        Args:
+            task_id (str): Unique task identifier
+            task (str): The user's goal
+        
+        Returns:
+            Dict[str, Any]: The stored record
+        """
+        return self._append(task_id, task, "started", None, time.time(), None)
+    
+    def record_completed(self, task_id: str, task: str, result: Dict[str, Any],
+                         status: str = "completed") -> Dict[str, Any]:
+        """
+        Append a record for a task that has finished.
+        
+        Args:
+            task_id (str): Unique task identifier
+            task (str): The user's goal
+            result (Dict[str, Any]): The task's result
+            status (str): Final status, "completed" or "failed"
+        
+        Returns:
+            Dict[str, Any]: The stored record, carrying the task's start time
+        """
+        with self._lock:
+            started = self._recent.get(task_id) or self._latest(task_id)
+            started_at = started["started_at"] if started else None
+            record = self._append(task_id, task, status, result, started_at, time.time())
+            
+            self._completed_since_compaction += 1
+            if self._completed_since_compaction >= self.compact_every:
+                self.compact()
+            return record
+    
+    def page(self, cursor: Optional[str] = None, limit: int = 50, status: Optional[str] = None,
+             query: Optional[str] = None, success: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Get one page of history, most recently updated tasks first.
+        
+        Args:
+            cursor (str, optional): The next_cursor of the previous page
+            limit (int): Maximum number of records to return
+            status (str, optional): Only return tasks with this status
+            query (str, optional): Only return tasks whose goal contains this text
+            success (bool, optional): Only return tasks whose result has this success value
+        
+        Returns:
+            Dict[str, Any]: "items" with the records and "next_cursor", which is None on the last page
+        """
+        limit = max(1, limit)
+        before = int(cursor) if cursor else None
+        
+        with self._lock:
+            self._connect()
+            if before is None:
+                items = self._page_from_ring(limit + 1, status, query, success)
+                if items is not None:
+                    return self._build_page(items, limit)
+            return self._build_page(self._page_from_database(before, limit + 1, status, query, success), limit)
+    
+    def compact(self) -> int:
+        """
+        Merge start and completion records by dropping start records of finished tasks.
+        
+        Returns:
+            int: Number of records removed
+        """
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "DELETE FROM task_records WHERE status = 'started' AND EXISTS ("
+                "SELECT 1 FROM task_records AS later "
+                "WHERE later.task_id = task_records.task_id AND later.seq > task_records.seq)"
+            )
+            connection.commit()
+            self._completed_since_compaction = 0
+            return cursor.rowcount
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _append(self, task_id: str, task: str, status: str, result: Optional[Dict[str, Any]],
+                started_at: Optional[float], completed_at: Optional[float]) -> Dict[str, Any]:
+        """
+        Append a record to the log and the ring buffer.
+        
+        Args:
+            task_id (str): Unique task identifier
+            task (str): The user's goal
+            status (str): The task's status
+            result (Optional[Dict[str, Any]]): The task's result, if finished
+            started_at (Optional[float]): When the task started
+            completed_at (Optional[float]): When the task finished
+        
+        Returns:
+            Dict[str, Any]: The stored record
+        """
+        success = None if result is None else bool(result.get("success"))
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "INSERT INTO task_records (task_id, task, status, success, result, started_at, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_id, task, status, success, None if result is None else json.dumps(result, default=str),
+                 started_at, completed_at)
+            )
+            connection.commit()
+            
+            record = {
+                "seq": cursor.lastrowid,
+                "task_id": task_id,
+                "task": task,
+                "status": status,
+                "result": result,
+                "started_at": started_at,
+                "completed_at": completed_at
+            }
+            self._remember(record)
+            return record
+    
+    def _remember(self, record: Dict[str, Any]) -> None:
+        """
+        Put a record at the head of the ring buffer, replacing older records of the same task.
+        
+        Args:
+            record (Dict[str, Any]): The record
+        """
+        self._recent.pop(record["task_id"], None)
+        self._recent[record["task_id"]] = record
+        while len(self._recent) > self.ring_size:
+            self._recent.popitem(last=False)
+            self._ring_holds_everything = False
+    
+    def _page_from_ring(self, limit: int, status: Optional[str], query: Optional[str],
+                        success: Optional[bool]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Try to answer a first-page request from memory.
+        
+        Args:
+            limit (int): Number of records wanted
+            status (Optional[str]): Status filter
+            query (Optional[str]): Goal substring filter
+            success (Optional[bool]): Success filter
+        
+        Returns:
+            Optional[List[Dict[str, Any]]]: The records, or None if the database must be consulted
+        """
+        items = []
+        for record in reversed(self._recent.values()):
+            if self._matches(record, status, query, success):
+                items.append(record)
+                if len(items) == limit:
+                    return items
+        return items if self._ring_holds_everything else None
+    
+    def _page_from_database(self, before: Optional[int], limit: int, status: Optional[str],
+                            query: Optional[str], success: Optional[bool]) -> List[Dict[str, Any]]:
+        """
+        Read one page of merged records from the database.
+        
+        Args:
+            before (Optional[int]): Only return records older than this sequence number
+            limit (int): Number of records wanted
+            status (Optional[str]): Status filter
+            query (Optional[str]): Goal substring filter
+            success (Optional[bool]): Success filter
+        
+        Returns:
+            List[Dict[str, Any]]: The records, newest first
+        """
+        sql = LATEST_RECORDS
+        params: List[Any] = []
+        if before is not None:
+            sql += " AND seq < ?"
+            params.append(before)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        if query:
+            sql += " AND task LIKE ? ESCAPE '\\'"
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(int(success))
+        sql += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit)
+        
+        return [self._row_to_record(row) for row in self._connection.execute(sql, params)]
+    
+    def _latest(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the newest stored record of a task.
+        
+        Args:
+            task_id (str): Unique task identifier
+        
+        Returns:
+            Optional[Dict[str, Any]]: The record, or None if the task is unknown
+        """
+        row = self._connect().execute(
+            "SELECT seq, task_id, task, status, success, result, started_at, completed_at "
+            "FROM task_records WHERE task_id = ? ORDER BY seq DESC LIMIT 1",
+            (task_id,)
+        ).fetchone()
+        return self._row_to_record(row) if row else None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database and warm the ring buffer on first use.
+        
+        Returns:
+            sqlite3.Connection: The open connection
+        """
+        if self._connection is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+            
+            rows = self._connection.execute(LATEST_RECORDS + " ORDER BY seq DESC LIMIT ?", (self.ring_size + 1,)).fetchall()
+            self._ring_holds_everything = len(rows) <= self.ring_size
+            for row in reversed(rows[:self.ring_size]):
+                record = self._row_to_record(row)
+                self._recent[record["task_id"]] = record
+        return self._connection
+    
+    def _build_page(self, items: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+        """
+        Trim a page to its limit and compute the cursor of the next page.
+        
+        Args:
+            items (List[Dict[str, Any]]): Up to limit + 1 records, newest first
+            limit (int): Page size
+        
+        Returns:
+            Dict[str, Any]: The page
+        """
+        has_more = len(items) > limit
+        items = items[:limit]
+        return {
+            "items": items,
+            "next_cursor": str(items[-1]["seq"]) if has_more else None
+        }
+    
+    def _matches(self, record: Dict[str, Any], status: Optional[str], query: Optional[str],
+                 success: Optional[bool]) -> bool:
+        """
+        Check a record against the page filters.
+        
+        Args:
+            record (Dict[str, Any]): The record
+            status (Optional[str]): Status filter
+            query (Optional[str]): Goal substring filter
+            success (Optional[bool]): Success filter
+        
+        Returns:
+            bool: True if the record passes every filter
+        """
+        if status is not None and record["status"] != status:
+            return False
+        if query and query.lower() not in record["task"].lower():
+            return False
+        if success is not None:
+            result = record["result"]
+            if result is None or bool(result.get("success")) != success:
+                return False
+        return True
+    
+    def _row_to_record(self, row: tuple) -> Dict[str, Any]:
+        """
+        Convert a database row into a record.
+        
+        Args:
+            row (tuple): The row
+        
+        Returns:
+            Dict[str, Any]: The record
+        """
+        seq, task_id, task, status, _, result, started_at, completed_at = row
+        return {
+            "seq": seq,
+            "task_id": task_id,
+            "task": task,
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "started_at": started_at,
+            "completed_at": completed_at
+        }
\ No newline at end of file
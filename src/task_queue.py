@@ -0,0 +1,209 @@
+"""
+Task queue for the Genesis AI Framework.
+
+This module is responsible for:
+1. Accepting tasks without blocking the caller
+2. Running queued tasks on a configurable pool of worker threads
+3. Tracking the status and result of every job
+4. Cancelling queued or running jobs
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Callable, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = {COMPLETED, FAILED, CANCELLED}
+
+
+class TaskQueueFullError(Exception):
+    """Raised when a task is submitted while the queue is at capacity."""
+
+
+class Job:
+    """A single task submitted to the queue."""
+    
+    def __init__(self, task: str):
+        """
+        Initialize a job.
+        
+        Args:
+            task (str): The user's goal to execute
+        """
+        self.id = uuid.uuid4().hex
+        self.task = task
+        self.status = QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._cancel_event = threading.Event()
+    
+    def is_cancelled(self) -> bool:
+        """
+        Check whether cancellation of this job was requested.
+        
+        Returns:
+            bool: True if the job should stop
+        """
+        return self._cancel_event.is_set()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the job for API responses.
+        
+        Returns:
+            Dict[str, Any]: The job's id, task, status, timestamps and result
+        """
+        return {
+            "job_id": self.id,
+            "task": self.task,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class TaskQueue:
+    """Runs submitted tasks asynchronously on a bounded worker pool."""
+    
+    def __init__(self, handler: Callable[[Job], Dict[str, Any]], max_workers: int = 1,
+                 max_pending: int = 1000, max_finished: int = 500):
+        """
+        Initialize the task queue.
+        
+        Args:
+            handler (Callable[[Job], Dict[str, Any]]): Executes a job and returns its result.
+                Long-running handlers should poll job.is_cancelled() and stop early.
+            max_workers (int): Number of jobs executed at the same time
+            max_pending (int): Maximum number of jobs waiting to run before submissions are rejected
+            max_finished (int): Number of finished jobs kept for status queries
+        """
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="genesis-task")
+    
+    def submit(self, task: str) -> Job:
+        """
+        Queue a task for execution.
+        
+        Args:
+            task (str): The user's goal to execute
+        
+        Returns:
+            Job: The queued job
+        
+        Raises:
+            TaskQueueFullError: If max_pending jobs are already waiting
+        """
+        job = Job(task)
+        with self._lock:
+            pending = sum(1 for queued in self._jobs.values() if queued.status == QUEUED)
+            if pending >= self.max_pending:
+                raise TaskQueueFullError(f"Task queue is full ({pending} jobs waiting)")
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+        
+        Args:
+            job_id (str): The job id returned by submit
+        
+        Returns:
+            Optional[Job]: The job, or None if it is unknown or was evicted
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job. Queued jobs never start; running jobs are asked to stop.
+        
+        Args:
+            job_id (str): The job id returned by submit
+        
+        Returns:
+            Optional[Job]: The job, or None if it is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return job
+            job._cancel_event.set()
+            if job.status == QUEUED and job.future.cancel():
+                self._finish(job, CANCELLED)
+        return job
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and cancel everything still queued.
+        
+        Args:
+            wait (bool): Whether to wait for running jobs to finish
+        """
+        with self._lock:
+            for job in list(self._jobs.values()):
+                if job.status in (QUEUED, RUNNING):
+                    job._cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def _run(self, job: Job) -> None:
+        """
+        Execute a job on a worker thread.
+        
+        Args:
+            job (Job): The job to execute
+        """
+        with self._lock:
+            if job.is_cancelled():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+        
+        try:
+            result = self.handler(job)
+        except Exception as e:
+            with self._lock:
+                job.error = str(e)
+                self._finish(job, FAILED)
+            return
+        
+        with self._lock:
+            job.result = result
+            self._finish(job, CANCELLED if job.is_cancelled() else COMPLETED)
+    
+    def _finish(self, job: Job, status: str) -> None:
+        """
+        Mark a job as finished and evict the oldest finished jobs. Caller holds the lock.
+        
+        Args:
+            job (Job): The job that finished
+            status (str): The final status
+        """
+        job.status = status
+        job.finished_at = time.time()
+        
+        finished = [job_id for job_id, other in self._jobs.items() if other.status in FINISHED_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
\ No newline at end of file
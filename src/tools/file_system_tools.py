@@ -0,0 +1,744 @@
+"""
+File system tools for the Genesis AI Framework.
+
+This module gives the FileSystemAgent a safer and cheaper write path:
+1. Files are written through a temporary file and renamed into place, so a
+   crash never leaves a truncated file behind
+2. The hash of every written file is remembered, so rewriting a file with the
+   content it already has is skipped and its modification time is kept
+3. A batch of files is written with a single durability barrier: all
+   temporary files are written first, synced together, and only then renamed
+
+And a cheaper read path:
+4. File contents are cached by path, modification time and size within a memory budget
+5. Large files are memory-mapped, so a byte or line range can be read
+   without loading the whole file
+
+And a way to enumerate a tree:
+6. walk_tree yields files lazily from os.scandir, honoring .gitignore files
+   and skipping version control directories, caches and virtualenvs,
+   optionally scanning subtrees in parallel
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import queue
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Pattern, Tuple
+
+# Mode of newly created files, before the process umask is applied
+DEFAULT_FILE_MODE = 0o666
+
+# Memory budget of the read cache
+DEFAULT_READ_CACHE_BYTES = 64 * 1024 * 1024
+
+# Files at least this large are memory-mapped instead of read
+DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+
+# Directories that never contain project files, whatever .gitignore says
+IGNORED_DIRECTORIES = {".git", ".genesis", "__pycache__", ".pytest_cache", ".venv", "venv",
+                       ".tox", ".nox", ".mypy_cache", ".ruff_cache", "node_modules"}
+
+# Directories holding one of these files are virtualenvs
+VIRTUALENV_MARKER = "pyvenv.cfg"
+
+# Process umask, read once on the first new file
+_umask_value: Optional[int] = None
+_umask_lock = threading.Lock()
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash file content.
+    
+    Args:
+        data (bytes): The content
+    
+    Returns:
+        str: The SHA-256 hex digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileHashStore:
+    """Remembers the hash of files along with the size and modification time they had."""
+    
+    def __init__(self):
+        """Initialize an empty store."""
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+    
+    def is_unchanged(self, path: str, data: bytes) -> bool:
+        """
+        Check whether a file already holds exactly this content.
+        
+        The stored hash is trusted while the file's size and modification time
+        match; otherwise the file is read and hashed once.
+        
+        Args:
+            path (str): Path of the file
+            data (bytes): The content about to be written
+        
+        Returns:
+            bool: True if writing would not change the file
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != len(data):
+            return False
+        
+        digest = content_hash(data)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2] == digest
+        
+        try:
+            with open(path, "rb") as file:
+                current = content_hash(file.read())
+        except OSError:
+            return False
+        self.remember(path, current)
+        return current == digest
+    
+    def remember(self, path: str, digest: str) -> None:
+        """
+        Store the hash of a file as it is now on disk.
+        
+        Args:
+            path (str): Path of the file
+            digest (str): Hash of its content
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    
+    def forget(self, path: str) -> None:
+        """
+        Drop the stored hash of a file.
+        
+        Args:
+            path (str): Path of the file
+        """
+        with self._lock:
+            self._entries.pop(path, None)
+
+
+def write_temporary(path: str, data: bytes, sync: bool = True) -> str:
+    """
+    Write content to a new temporary file next to its destination.
+    
+    The temporary file gets the destination's permissions, or DEFAULT_FILE_MODE
+    less the process umask for new files, as open() would give them, so
+    renaming it into place doesn't change them.
+    
+    Args:
+        path (str): Destination path
+        data (bytes): The content
+        sync (bool): Whether to fsync the temporary file before returning
+    
+    Returns:
+        str: Path of the temporary file
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = DEFAULT_FILE_MODE & ~_umask()
+    
+    descriptor, temporary = tempfile.mkstemp(dir=directory or ".", prefix=f".{os.path.basename(path)}.",
+                                             suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        os.chmod(temporary, mode)
+    except BaseException:
+        _remove_quietly(temporary)
+        raise
+    return temporary
+
+
+def sync_directories(paths: List[str]) -> None:
+    """
+    Flush the directory entries of renamed files to disk.
+    
+    Args:
+        paths (List[str]): Files whose parent directories should be synced
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    for directory in sorted({os.path.dirname(os.path.abspath(path)) for path in paths}):
+        try:
+            descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            continue
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+
+def atomic_write(path: str, data: bytes, hashes: Optional[FileHashStore] = None,
+                 sync: bool = True) -> bool:
+    """
+    Replace a file's content atomically, skipping the write if nothing changes.
+    
+    Args:
+        path (str): Path of the file
+        data (bytes): The new content
+        hashes (FileHashStore, optional): Known file hashes used to detect unchanged content
+        sync (bool): Whether to fsync the file and its directory
+    
+    Returns:
+        bool: True if the file was written, False if it already had this content
+    """
+    if hashes is not None and hashes.is_unchanged(path, data):
+        return False
+    
+    temporary = write_temporary(path, data, sync)
+    try:
+        os.replace(temporary, path)
+    except BaseException:
+        _remove_quietly(temporary)
+        raise
+    if sync:
+        sync_directories([path])
+    if hashes is not None:
+        hashes.remember(path, content_hash(data))
+    return True
+
+
+def atomic_write_batch(files: Dict[str, bytes], hashes: Optional[FileHashStore] = None,
+                       sync: bool = True) -> Dict[str, Any]:
+    """
+    Write several files with one durability barrier.
+    
+    Every changed file is first written to a temporary file. The temporary
+    files are then synced together and renamed into place, and finally their
+    directories are synced once. If any temporary file can't be written,
+    nothing is renamed.
+    
+    Args:
+        files (Dict[str, bytes]): Content per destination path
+        hashes (FileHashStore, optional): Known file hashes used to detect unchanged content
+        sync (bool): Whether to fsync before renaming
+    
+    Returns:
+        Dict[str, Any]: "success", the "written" and "unchanged" paths, and "errors"
+            with a message per path that failed
+    """
+    result: Dict[str, Any] = {"success": True, "written": [], "unchanged": [], "errors": {}}
+    temporaries: Dict[str, str] = {}
+    try:
+        for path, data in files.items():
+            if hashes is not None and hashes.is_unchanged(path, data):
+                result["unchanged"].append(path)
+                continue
+            try:
+                temporaries[path] = write_temporary(path, data, sync=False)
+            except OSError as e:
+                result["errors"][path] = str(e)
+        
+        if result["errors"]:
+            result["success"] = False
+            return result
+        
+        # The barrier: everything is on disk before the first file becomes visible
+        if sync:
+            for temporary in temporaries.values():
+                descriptor = os.open(temporary, os.O_RDONLY)
+                try:
+                    os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+        
+        for path, temporary in list(temporaries.items()):
+            try:
+                os.replace(temporary, path)
+            except OSError as e:
+                result["errors"][path] = str(e)
+                continue
+            del temporaries[path]
+            result["written"].append(path)
+            if hashes is not None:
+                hashes.remember(path, content_hash(files[path]))
+        
+        if sync:
+            sync_directories(result["written"])
+        result["success"] = not result["errors"]
+        return result
+    finally:
+        for temporary in temporaries.values():
+            _remove_quietly(temporary)
+
+
+def _umask() -> int:
+    """
+    Read the process umask once; it can only be read by briefly replacing it.
+    
+    Returns:
+        int: The umask
+    """
+    global _umask_value
+    with _umask_lock:
+        if _umask_value is None:
+            _umask_value = os.umask(0o022)
+            os.umask(_umask_value)
+        return _umask_value
+
+
+def _remove_quietly(path: str) -> None:
+    """
+    Remove a file, ignoring errors.
+    
+    Args:
+        path (str): Path of the file
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class FileReadCache:
+    """Caches file contents by path, modification time and size, least recently used first out."""
+    
+    def __init__(self, max_bytes: int = DEFAULT_READ_CACHE_BYTES, mmap_threshold: int = DEFAULT_MMAP_THRESHOLD):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes (int): Memory budget for cached contents
+            mmap_threshold (int): Size from which files are memory-mapped
+        """
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, int, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def read(self, path: str) -> bytes:
+        """
+        Read a whole file, from the cache while the file is unchanged.
+        
+        Files larger than a quarter of the budget are read but not cached.
+        
+        Args:
+            path (str): Path of the file
+        
+        Returns:
+            bytes: The content
+        """
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:2] == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        
+        with open(path, "rb") as file:
+            if stat.st_size >= self.mmap_threshold:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = mapped[:]
+            else:
+                data = file.read()
+        
+        if len(data) == stat.st_size and len(data) <= self.max_bytes // 4:
+            self._store(path, key, data)
+        return data
+    
+    def read_range(self, path: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """
+        Read a byte range of a file.
+        
+        Args:
+            path (str): Path of the file
+            offset (int): First byte to read
+            length (int, optional): Number of bytes to read; the rest of the file if omitted
+        
+        Returns:
+            bytes: The bytes in the range
+        """
+        end = None if length is None else offset + length
+        size = os.stat(path).st_size
+        if size < self.mmap_threshold:
+            return self.read(path)[offset:end]
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[offset:end]
+    
+    def read_lines(self, path: str, start: int = 1, end: Optional[int] = None) -> Tuple[bytes, int]:
+        """
+        Read a range of lines of a file.
+        
+        Args:
+            path (str): Path of the file
+            start (int): First line to read, counting from 1
+            end (int, optional): Last line to read, inclusive; the last line of the file if omitted
+        
+        Returns:
+            Tuple[bytes, int]: The lines, with their line endings, and the
+                number of the last line read (start - 1 if none was)
+        """
+        start = max(start, 1)
+        if end is not None and end < start:
+            return b"", start - 1
+        
+        size = os.stat(path).st_size
+        if size < self.mmap_threshold:
+            lines = io.BytesIO(self.read(path)).readlines()[start - 1:end]
+            return b"".join(lines), start - 1 + len(lines)
+        
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            begin = _line_offset(mapped, 0, start - 1)
+            if begin is None:
+                return b"", start - 1
+            finish = len(mapped) if end is None else _line_offset(mapped, begin, end - start + 1)
+            finish = len(mapped) if finish is None else finish
+            data = mapped[begin:finish]
+        return data, start - 1 + data.count(b"\n") + (0 if data.endswith(b"\n") or not data else 1)
+    
+    def invalidate(self, path: str) -> None:
+        """
+        Drop a file from the cache, e.g. after writing it.
+        
+        Args:
+            path (str): Path of the file
+        """
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._size -= len(entry[2])
+    
+    def _store(self, path: str, key: Tuple[int, int], data: bytes) -> None:
+        """
+        Cache a file's content, evicting the least recently used files over budget.
+        
+        Args:
+            path (str): Path of the file
+            key (Tuple[int, int]): Modification time and size the content belongs to
+            data (bytes): The content
+        """
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous[2])
+            self._entries[path] = (key[0], key[1], data)
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[2])
+
+
+def _line_offset(mapped: mmap.mmap, position: int, lines: int) -> Optional[int]:
+    """
+    Find where a line starts, counting forward from a position.
+    
+    Args:
+        mapped (mmap.mmap): The mapped file
+        position (int): Offset of the line to count from
+        lines (int): Number of lines to skip
+    
+    Returns:
+        Optional[int]: Offset of the line, or None if the file ends first
+    """
+    for _ in range(lines):
+        newline = mapped.find(b"\n", position)
+        if newline == -1:
+            return None
+        position = newline + 1
+    return position if position < len(mapped) or lines == 0 else None
+
+
+class IgnoreRules:
+    """The .gitignore patterns that apply inside one directory, including those of its parents."""
+    
+    def __init__(self, rules: Tuple[Tuple[str, Pattern[str], bool, bool], ...] = ()):
+        """
+        Initialize the rules.
+        
+        Args:
+            rules (Tuple): (base directory, pattern, negated, directories only) per rule, in
+                the order git applies them
+        """
+        self.rules = rules
+    
+    def extend(self, base: str, lines: List[str]) -> "IgnoreRules":
+        """
+        Add the patterns of a .gitignore file.
+        
+        Args:
+            base (str): Directory of the .gitignore file, relative to the walk root ("" for the root)
+            lines (List[str]): Lines of the file
+        
+        Returns:
+            IgnoreRules: The combined rules, for use in that directory and below
+        """
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            directories_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # Patterns with a slash are relative to the .gitignore; others match at any depth
+            anchored = "/" in line
+            pattern = _gitignore_regex(line.lstrip("/") if anchored else "**/" + line)
+            rules.append((base, pattern, negated, directories_only))
+        return IgnoreRules(tuple(rules))
+    
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Check whether a path is ignored. The last matching pattern wins.
+        
+        Args:
+            path (str): Path relative to the walk root, with forward slashes
+            is_dir (bool): Whether the path is a directory
+        
+        Returns:
+            bool: True if the path is ignored
+        """
+        ignored = False
+        for base, pattern, negated, directories_only in self.rules:
+            if directories_only and not is_dir:
+                continue
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = path[len(base) + 1:]
+            else:
+                relative = path
+            if pattern.match(relative):
+                ignored = not negated
+        return ignored
+
+
+class WalkEntry:
+    """A file or directory found by walk_tree."""
+    
+    __slots__ = ("path", "name", "is_dir", "_entry")
+    
+    def __init__(self, path: str, entry: os.DirEntry):
+        """
+        Initialize the entry.
+        
+        Args:
+            path (str): Path relative to the walk root, with forward slashes
+            entry (os.DirEntry): The entry from os.scandir
+        """
+        self.path = path
+        self.name = entry.name
+        self.is_dir = entry.is_dir(follow_symlinks=False)
+        self._entry = entry
+    
+    @property
+    def full_path(self) -> str:
+        """Path including the walk root."""
+        return self._entry.path
+    
+    def stat(self) -> os.stat_result:
+        """
+        Get the entry's stat data. It is fetched once and cached by os.scandir.
+        
+        Returns:
+            os.stat_result: The stat data
+        """
+        return self._entry.stat(follow_symlinks=False)
+    
+    def __repr__(self) -> str:
+        return f"WalkEntry({self.path!r})"
+
+
+def walk_tree(root: str, include_dirs: bool = False, use_gitignore: bool = True,
+              workers: int = 1) -> Iterator[WalkEntry]:
+    """
+    Walk a directory tree lazily.
+    
+    Version control directories, caches and virtualenvs are always skipped, and
+    with use_gitignore so is everything the tree's .gitignore files exclude.
+    Symbolic links to directories are yielded but not followed. Only the
+    directories still waiting to be scanned are kept in memory.
+    
+    Args:
+        root (str): Directory to walk
+        include_dirs (bool): Whether to yield directories as well as files
+        use_gitignore (bool): Whether to honor .gitignore files
+        workers (int): Number of threads scanning directories; with more than one,
+            entries come in no particular order
+    
+    Yields:
+        WalkEntry: Every file (and directory) below root
+    """
+    if workers > 1:
+        yield from _walk_parallel(root, include_dirs, use_gitignore, workers)
+        return
+    
+    pending = [("", IgnoreRules())]
+    while pending:
+        directory, rules = pending.pop()
+        entries, subdirectories = _scan_directory(root, directory, rules, use_gitignore)
+        for entry in entries:
+            if include_dirs or not entry.is_dir:
+                yield entry
+        # Reversed so the stack pops subdirectories in name order
+        pending.extend(reversed(subdirectories))
+
+
+def _walk_parallel(root: str, include_dirs: bool, use_gitignore: bool, workers: int) -> Iterator[WalkEntry]:
+    """
+    Walk a directory tree with several threads scanning directories.
+    
+    Args:
+        root (str): Directory to walk
+        include_dirs (bool): Whether to yield directories as well as files
+        use_gitignore (bool): Whether to honor .gitignore files
+        workers (int): Number of scanning threads
+    
+    Yields:
+        WalkEntry: Every file (and directory) below root
+    """
+    results: "queue.Queue[Any]" = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="walk")
+    
+    def scan(directory: str, rules: IgnoreRules) -> None:
+        try:
+            results.put(_scan_directory(root, directory, rules, use_gitignore))
+        except BaseException as e:
+            results.put(e)
+    
+    try:
+        executor.submit(scan, "", IgnoreRules())
+        outstanding = 1
+        while outstanding:
+            result = results.get()
+            outstanding -= 1
+            if isinstance(result, BaseException):
+                raise result
+            entries, subdirectories = result
+            for directory, rules in subdirectories:
+                executor.submit(scan, directory, rules)
+                outstanding += 1
+            for entry in entries:
+                if include_dirs or not entry.is_dir:
+                    yield entry
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_directory(root: str, directory: str, rules: IgnoreRules,
+                    use_gitignore: bool) -> Tuple[List[WalkEntry], List[Tuple[str, IgnoreRules]]]:
+    """
+    List one directory of a walk.
+    
+    Args:
+        root (str): Directory being walked
+        directory (str): The directory to list, relative to root ("" for root itself)
+        rules (IgnoreRules): Ignore rules of the parent directories
+        use_gitignore (bool): Whether to honor .gitignore files
+    
+    Returns:
+        Tuple: The directory's entries that aren't ignored, and (path, rules) for
+            each subdirectory to scan next
+    """
+    full_directory = os.path.join(root, directory) if directory else root
+    try:
+        with os.scandir(full_directory) as iterator:
+            listing = sorted(iterator, key=lambda entry: entry.name)
+    except OSError:
+        return [], []
+    
+    if use_gitignore and any(entry.name == ".gitignore" for entry in listing):
+        try:
+            with open(os.path.join(full_directory, ".gitignore"), "r", encoding="utf-8", errors="replace") as file:
+                rules = rules.extend(directory, file.readlines())
+        except OSError:
+            pass
+    
+    entries: List[WalkEntry] = []
+    subdirectories: List[Tuple[str, IgnoreRules]] = []
+    for item in listing:
+        path = f"{directory}/{item.name}" if directory else item.name
+        entry = WalkEntry(path, item)
+        if entry.is_dir and (item.name in IGNORED_DIRECTORIES
+                             or os.path.exists(os.path.join(item.path, VIRTUALENV_MARKER))):
+            continue
+        if use_gitignore and rules.is_ignored(path, entry.is_dir):
+            continue
+        entries.append(entry)
+        if entry.is_dir:
+            subdirectories.append((path, rules))
+    return entries, subdirectories
+
+
+def _gitignore_regex(pattern: str) -> Pattern[str]:
+    """
+    Translate a .gitignore glob into a regular expression.
+    
+    "*" and "?" don't match "/", "**" matches across directories, and a
+    pattern matching a directory also matches everything inside it.
+    
+    Args:
+        pattern (str): The glob, relative to the .gitignore's directory
+    
+    Returns:
+        Pattern[str]: The compiled expression
+    """
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        elif pattern[index] == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape("["))
+                index += 1
+            else:
+                body = pattern[index + 1:end]
+                body = "^" + body[1:] if body.startswith("!") else body
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                index = end + 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return re.compile("".join(parts) + "(?:/.*)?$")
\ No newline at end of file
@@ -0,0 +1,400 @@
+"""
+Git tools for the Genesis AI Framework.
+
+This module gives the GitAgent a cached view of a git repository:
+1. The repository is discovered once with a single git process and remembered
+2. Branches and HEAD are resolved by reading refs from the git directory,
+   without starting a git process
+3. Every git operation runs as exactly one git process
+
+It also provides a pool of git worktrees, so several tasks can work on
+separate checkouts of the same repository at the same time.
+"""
+
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Iterator
+
+
+class GitRepository:
+    """A git repository whose location and refs are resolved without extra processes."""
+    
+    def __init__(self, path: str = "."):
+        """
+        Initialize the repository view. Nothing is run until it is first used.
+        
+        Args:
+            path (str): Directory inside the working tree that git commands run in
+        """
+        self.path = path
+        self.toplevel: Optional[str] = None
+        self.git_dir: Optional[str] = None
+        self.common_dir: Optional[str] = None
+        self.spawn_count = 0
+        self._lock = threading.Lock()
+    
+    def is_repository(self) -> bool:
+        """
+        Check whether the path is inside a git working tree.
+        
+        A positive answer is cached for the lifetime of this object; a negative
+        one is re-checked on the next call, so a later `git init` is noticed.
+        
+        Returns:
+            bool: True if in a git repository, False otherwise
+        """
+        with self._lock:
+            if self.toplevel is not None:
+                return True
+            
+            try:
+                result = self.run("rev-parse", "--show-toplevel", "--absolute-git-dir", "--git-common-dir")
+            except OSError:
+                return False
+            if result.returncode != 0:
+                return False
+            
+            toplevel, git_dir, common_dir = result.stdout.splitlines()[:3]
+            self.git_dir = git_dir
+            self.common_dir = os.path.normpath(os.path.join(os.path.abspath(self.path), common_dir))
+            self.toplevel = toplevel
+            return True
+    
+    def run(self, *args: str, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """
+        Run one git command in the repository.
+        
+        Args:
+            *args (str): Arguments passed to git
+            input (str, optional): Text written to the command's stdin
+        
+        Returns:
+            subprocess.CompletedProcess: The finished process with captured text output
+        """
+        self.spawn_count += 1
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            input=input,
+            cwd=self.path
+        )
+    
+    def branch_exists(self, branch_name: str) -> bool:
+        """
+        Check whether a local branch exists by reading loose and packed refs.
+        
+        Args:
+            branch_name (str): Name of the branch
+        
+        Returns:
+            bool: True if refs/heads/<branch_name> exists
+        """
+        return self.resolve_ref(f"refs/heads/{branch_name}") is not None
+    
+    def head_commit(self) -> Optional[str]:
+        """
+        Resolve HEAD to a commit id without starting a git process.
+        
+        Returns:
+            Optional[str]: The commit id, or None if HEAD points to an unborn branch
+        """
+        if not self.is_repository():
+            return None
+        head = self._read(os.path.join(self.git_dir, "HEAD"))
+        if head is None:
+            return None
+        if head.startswith("ref: "):
+            return self.resolve_ref(head[len("ref: "):])
+        return head
+    
+    def current_branch(self) -> Optional[str]:
+        """
+        Get the name of the checked out branch without starting a git process.
+        
+        Returns:
+            Optional[str]: The branch name, or None if HEAD is detached
+        """
+        if not self.is_repository():
+            return None
+        head = self._read(os.path.join(self.git_dir, "HEAD")) or ""
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        return None
+    
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """
+        Resolve a full ref name such as refs/heads/main to a commit id.
+        
+        Args:
+            ref (str): The full ref name
+        
+        Returns:
+            Optional[str]: The commit id, or None if the ref does not exist
+        """
+        if not self.is_repository():
+            return None
+        
+        for directory in self._ref_dirs():
+            value = self._read(os.path.join(directory, *ref.split("/")))
+            if value is not None:
+                if value.startswith("ref: "):
+                    return self.resolve_ref(value[len("ref: "):])
+                return value
+        
+        for line in self._packed_refs():
+            parts = line.split(" ", 1)
+            if len(parts) == 2 and parts[1] == ref:
+                return parts[0]
+        return None
+    
+    def _ref_dirs(self) -> List[str]:
+        """
+        Get the directories loose refs can live in.
+        
+        Returns:
+            List[str]: The per-worktree git directory and the shared common directory
+        """
+        return [self.git_dir] if self.git_dir == self.common_dir else [self.git_dir, self.common_dir]
+    
+    def _packed_refs(self) -> List[str]:
+        """
+        Read the packed-refs file.
+        
+        Returns:
+            List[str]: Lines of the form "<commit id> <ref>"
+        """
+        content = self._read(os.path.join(self.common_dir, "packed-refs"), strip=False) or ""
+        return [line for line in content.splitlines() if line and line[0] not in "#^"]
+    
+    def _read(self, path: str, strip: bool = True) -> Optional[str]:
+        """
+        Read a small file from the git directory.
+        
+        Args:
+            path (str): Path of the file
+            strip (bool): Whether to strip surrounding whitespace
+        
+        Returns:
+            Optional[str]: The file's content, or None if it does not exist
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                content = file.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return content.strip() if strip else content
+
+
+class WorktreePool:
+    """A warm pool of detached git worktrees that tasks lease and return."""
+    
+    def __init__(self, repository_path: str = ".", pool_dir: Optional[str] = None, max_size: int = 4):
+        """
+        Initialize the pool. Worktrees are created on demand, up to max_size.
+        
+        Args:
+            repository_path (str): Directory inside the main working tree
+            pool_dir (str, optional): Directory the worktrees are created in;
+                defaults to .genesis/worktrees in the main working tree
+            max_size (int): Maximum number of worktrees, i.e. of concurrent leases
+        """
+        self.repository = GitRepository(repository_path)
+        self.pool_dir = pool_dir
+        self.max_size = max(1, max_size)
+        self._idle: List[str] = []
+        self._leased: List[str] = []
+        self._condition = threading.Condition()
+    
+    def warm(self, count: int) -> None:
+        """
+        Create worktrees ahead of time so the first tasks don't pay for them.
+        
+        Args:
+            count (int): Number of idle worktrees to have ready
+        """
+        with self._condition:
+            while len(self._idle) < count and self._size() < self.max_size:
+                self._idle.append(self._create())
+    
+    def acquire(self, timeout: Optional[float] = None) -> str:
+        """
+        Lease a clean worktree checked out (detached) at the main repository's HEAD.
+        
+        Blocks while all max_size worktrees are leased.
+        
+        Args:
+            timeout (float, optional): Seconds to wait for a free worktree
+            
+        Returns:
+            str: Absolute path of the worktree
+            
+        Raises:
+            TimeoutError: If no worktree became free in time
+            RuntimeError: If the repository is missing or git fails
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._idle or self._size() < self.max_size, timeout):
+                raise TimeoutError("No git worktree became free in time")
+            path = self._idle.pop() if self._idle else self._create()
+            self._leased.append(path)
+        
+        try:
+            self._check(path, "checkout", "--detach", "--force", self._base_commit())
+        except Exception:
+            self.release(path, clean=False)
+            raise
+        return path
+    
+    def release(self, path: str, clean: bool = True) -> None:
+        """
+        Return a leased worktree to the pool.
+        
+        The worktree is detached, so its branch can be checked out elsewhere,
+        and reset so the next task starts from a clean tree. Untracked files
+        are removed; ignored files such as caches are kept. Commits made on a
+        detached HEAD are kept on a genesis/unsaved/* branch first; if that
+        fails, the worktree is left on disk as it is and dropped from the pool.
+        
+        Args:
+            path (str): Path returned by acquire
+            clean (bool): Whether to reset the worktree before reuse
+        """
+        preserved = self._preserve_head(path)
+        try:
+            if preserved and clean:
+                self._check(path, "checkout", "--detach", "--force")
+                self._check(path, "clean", "-fd", "--quiet")
+            reusable = preserved
+        except RuntimeError:
+            reusable = False
+        
+        with self._condition:
+            if path in self._leased:
+                self._leased.remove(path)
+            if reusable:
+                self._idle.append(path)
+            elif preserved:
+                self.repository.run("worktree", "remove", "--force", path)
+            self._condition.notify()
+    
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Lease a worktree for the duration of a with block.
+        
+        Args:
+            timeout (float, optional): Seconds to wait for a free worktree
+            
+        Yields:
+            str: Absolute path of the worktree
+        """
+        path = self.acquire(timeout)
+        try:
+            yield path
+        finally:
+            self.release(path)
+    
+    def _size(self) -> int:
+        """
+        Count the worktrees owned by the pool. Caller holds the condition.
+        
+        Returns:
+            int: Number of idle and leased worktrees
+        """
+        return len(self._idle) + len(self._leased)
+    
+    def _create(self) -> str:
+        """
+        Add a new detached worktree at the main repository's HEAD. Caller holds the condition.
+        
+        Returns:
+            str: Absolute path of the worktree
+        """
+        if not self.repository.is_repository():
+            raise RuntimeError("Error: Not in a git repository")
+        
+        pool_dir = self.pool_dir or os.path.join(self.repository.toplevel, ".genesis", "worktrees")
+        os.makedirs(pool_dir, exist_ok=True)
+        
+        index = self._size()
+        path = os.path.join(pool_dir, f"worktree-{index}")
+        while os.path.exists(path):
+            index += 1
+            path = os.path.join(pool_dir, f"worktree-{index}")
+        
+        result = self.repository.run("worktree", "add", "--detach", path, self._base_commit())
+        if result.returncode != 0:
+            raise RuntimeError(f"Error creating worktree {path}: {result.stderr}")
+        return path
+    
+    def _base_commit(self) -> str:
+        """
+        Get the commit new tasks start from.
+        
+        Returns:
+            str: The main repository's HEAD commit
+        """
+        commit = self.repository.head_commit()
+        if commit is None:
+            raise RuntimeError("Error: The repository has no commits to create worktrees from")
+        return commit
+    
+    def _preserve_head(self, path: str) -> bool:
+        """
+        Make sure the worktree's HEAD commit is reachable from a ref.
+        
+        A task that committed on a detached HEAD, e.g. because its branch was
+        checked out elsewhere, would lose that commit when the worktree is
+        reset, so such a commit is kept on a genesis/unsaved/* branch.
+        
+        Args:
+            path (str): The worktree
+            
+        Returns:
+            bool: True if HEAD is on a branch, reachable from a ref or now kept on one
+        """
+        if self._run(path, "symbolic-ref", "-q", "HEAD").returncode == 0:
+            return True
+        head = self._run(path, "rev-parse", "--verify", "-q", "HEAD")
+        if head.returncode != 0:
+            return True
+        commit = head.stdout.strip()
+        reachable = self._run(path, "for-each-ref", "--count=1", "--contains", commit, "--format=%(refname)")
+        if reachable.returncode == 0 and reachable.stdout.strip():
+            return True
+        
+        branch = f"genesis/unsaved/{os.path.basename(path)}-{commit[:12]}"
+        if self._run(path, "branch", branch, commit).returncode != 0:
+            print(f"Keeping worktree {path}: its HEAD {commit} is not on any branch")
+            return False
+        print(f"Kept commit {commit} of worktree {path} on branch {branch}")
+        return True
+    
+    def _run(self, path: str, *args: str) -> subprocess.CompletedProcess:
+        """
+        Run a git command in a worktree.
+        
+        Args:
+            path (str): The worktree
+            *args (str): Arguments passed to git
+            
+        Returns:
+            subprocess.CompletedProcess: The finished process, with text output
+        """
+        self.repository.spawn_count += 1
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=path)
+    
+    def _check(self, path: str, *args: str) -> None:
+        """
+        Run a git command in a worktree and fail loudly if it fails.
+        
+        Args:
+            path (str): The worktree
+            *args (str): Arguments passed to git
+        """
+        result = self._run(path, *args)
+        if result.returncode != 0:
+            raise RuntimeError(f"Error running git {args[0]} in {path}: {result.stderr}")
\ No newline at end of file
@@ -0,0 +1,1106 @@
+"""
+HTTP tools for the Genesis AI Framework.
+
+This module gives agents that call web APIs a shared HTTP client:
+1. Requests go through a pooled session that keeps connections alive, with a
+   per-host connection limit and connect and read timeouts
+2. Responses are cached as HTTP caches do, honoring Cache-Control, Expires,
+   ETag and Last-Modified; fresh responses are served locally and stale ones
+   are revalidated with a conditional request that a 304 answers cheaply
+3. Cached responses are kept in a size-bounded in-memory LRU and, optionally,
+   a size-bounded LRU directory on disk
+4. Many requests can be sent at once; they run concurrently with a cap per
+   host, duplicates are sent only once, and results stream back as they complete
+5. Large responses can be streamed in chunks under a byte cap, spooled to a
+   temporary file instead of memory, and their JSON arrays or NDJSON lines
+   parsed one item at a time
+"""
+
+import codecs
+import email.utils
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.state import state_path
+from src.tools.file_system_tools import atomic_write
+
+# Seconds to wait for a connection and for each read
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Number of hosts whose connection pools are kept
+DEFAULT_POOL_HOSTS = 16
+
+# Connections kept open per host; further requests to the host wait for a free one
+DEFAULT_CONNECTIONS_PER_HOST = 8
+
+# Requests a bulk fetch runs at the same time, across all hosts
+DEFAULT_FETCH_WORKERS = 16
+
+# Largest body a streamed response keeps in memory; larger ones are spooled to a temporary file
+DEFAULT_INLINE_BYTES = 1024 * 1024
+
+# Bytes read at a time from streamed responses and spooled files
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Characters that can continue a JSON number
+NUMBER_CHARACTERS = frozenset("0123456789+-.eE")
+
+# Media types whose body is a sequence of JSON values, one per line
+NDJSON_TYPES = frozenset({"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq"})
+
+# Bytes of a body read at most to preview its first items
+DEFAULT_PREVIEW_BYTES = 256 * 1024
+
+# Budgets of the in-memory and on-disk response caches
+DEFAULT_MEMORY_CACHE_BYTES = 16 * 1024 * 1024
+DEFAULT_DISK_CACHE_BYTES = 256 * 1024 * 1024
+
+# Statuses a response may be cached with (RFC 9110, section 15.1)
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Request headers that make a response private to one user; such requests bypass the
+# shared cache (RFC 9111, section 3.5)
+PRIVATE_REQUEST_HEADERS = ("Authorization", "Cookie")
+
+# Headers of a 304 that don't replace the stored response's (RFC 9111, section 3.2)
+UNMERGED_304_HEADERS = frozenset({"content-length", "transfer-encoding", "connection", "keep-alive"})
+
+# Fraction of the time since Last-Modified a response without explicit freshness is fresh for
+HEURISTIC_FRESHNESS = 0.1
+
+# Longest heuristic freshness, in seconds
+MAX_HEURISTIC_FRESHNESS = 24 * 3600
+
+# File extension of cache entries on disk
+CACHE_EXTENSION = ".http"
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header.
+    
+    Args:
+        value (str, optional): The header value
+    
+    Returns:
+        Dict[str, Optional[str]]: Value per lowercase directive; None for directives without one
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an HTTP date such as the value of Expires or Last-Modified.
+    
+    Args:
+        value (str, optional): The header value
+    
+    Returns:
+        Optional[float]: Seconds since the epoch, or None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    """
+    Parse a delta-seconds value, such as max-age or Age.
+    
+    Args:
+        value (str, optional): The value
+    
+    Returns:
+        Optional[int]: The number of seconds, or None if invalid
+    """
+    try:
+        return max(int(value), 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_json_type(content_type: str) -> bool:
+    """
+    Check whether a media type is JSON, such as application/json or application/problem+json.
+    
+    Args:
+        content_type (str): The Content-Type header, parameters included or not
+    
+    Returns:
+        bool: True for JSON media types
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+def iter_json_items(chunks: Iterable[bytes], encoding: str = "utf-8", ndjson: bool = False) -> Iterator[Any]:
+    """
+    Parse JSON incrementally from chunks of bytes.
+    
+    A top-level array yields its elements one at a time; otherwise every JSON
+    value in the stream is yielded, which covers a single document. With
+    ndjson, every top-level value is yielded whole, even if it is an array.
+    Only the value being parsed is held in memory. A value that isn't complete
+    yet is parsed again only once the text read for it has doubled, so large
+    values cost linear time.
+    
+    Args:
+        chunks (Iterable[bytes]): The body, in chunks of any size
+        encoding (str): Encoding of the body
+        ndjson (bool): Whether the body is a sequence of values, e.g. NDJSON lines
+    
+    Yields:
+        Any: The decoded items
+    
+    Raises:
+        ValueError: If the body isn't valid JSON
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    finished = False
+    # "start"; "stream" for whitespace-separated values; inside an array, "first"
+    # before its first element, "element" after a comma and "separator" after an
+    # element; "end" once the array is closed
+    state = "stream" if ndjson else "start"
+    
+    def read_more(minimum: int = 0) -> None:
+        nonlocal buffer, position, finished
+        # Drop what was parsed, so only the value being parsed stays in memory
+        buffer, position = buffer[position:], 0
+        parts = [buffer]
+        size = len(buffer)
+        while not finished and (size == len(buffer) or size < minimum):
+            chunk = next(chunks, None)
+            finished = chunk is None
+            parts.append(text_decoder.decode(chunk or b"", final=finished))
+            size += len(parts[-1])
+        buffer = "".join(parts)
+    
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            if not finished:
+                read_more()
+                continue
+            if state in ("first", "element", "separator"):
+                raise ValueError("Unterminated JSON array")
+            return
+        
+        character = buffer[position]
+        if state == "start":
+            state = "first" if character == "[" else "stream"
+            position += character == "["
+            continue
+        if state == "end":
+            raise ValueError("Unexpected data after JSON array")
+        if state == "separator" or (state == "first" and character == "]"):
+            if character == "]":
+                state = "end"
+            elif character == "," and state == "separator":
+                state = "element"
+            else:
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {character!r}")
+            position += 1
+            continue
+        if character in ",]":
+            raise ValueError(f"Unexpected {character!r} in JSON")
+        
+        # A number is only complete once a character that can't continue it follows
+        if not finished and character in NUMBER_CHARACTERS and not _number_ends(buffer, position):
+            read_more()
+            continue
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if finished:
+                raise
+            read_more(2 * (len(buffer) - position))
+            continue
+        if state != "stream":
+            state = "separator"
+        yield item
+
+
+def _number_ends(buffer: str, position: int) -> bool:
+    """
+    Check whether the JSON number starting at a position is complete in the buffer.
+    
+    Args:
+        buffer (str): The text read so far
+        position (int): Where the number starts
+    
+    Returns:
+        bool: True if a character that can't continue the number follows it
+    """
+    end = position
+    while end < len(buffer) and buffer[end] in NUMBER_CHARACTERS:
+        end += 1
+    return end < len(buffer)
+
+
+class CachedResponse:
+    """A response stored in the HTTP cache, with what is needed to judge its freshness."""
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 stored_at: float, vary: Optional[Dict[str, str]] = None):
+        """
+        Initialize the entry.
+        
+        Args:
+            url (str): The requested URL
+            status_code (int): HTTP status of the response
+            headers (Dict[str, str]): Response headers with lowercase names
+            content (bytes): The response body
+            stored_at (float): When the response was received or last revalidated
+            vary (Dict[str, str], optional): Request headers named by Vary and the values
+                they had, which later requests must match
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+        self.vary = vary or {}
+    
+    @property
+    def size(self) -> int:
+        """Approximate memory taken by the entry, in bytes."""
+        return len(self.content) + sum(len(name) + len(value) for name, value in self.headers.items()) + 256
+    
+    @property
+    def cache_control(self) -> Dict[str, Optional[str]]:
+        """The response's Cache-Control directives."""
+        return parse_cache_control(self.headers.get("cache-control"))
+    
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate the entry."""
+        validators = {}
+        if "etag" in self.headers:
+            validators["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["last-modified"]
+        return validators
+    
+    def freshness_lifetime(self) -> float:
+        """
+        Compute how long the response stays fresh after it was generated.
+        
+        Returns:
+            float: Seconds; 0 when it must be revalidated before every use
+        """
+        directives = self.cache_control
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return float(max_age)
+        
+        date = parse_http_date(self.headers.get("date")) or self.stored_at
+        expires = self.headers.get("expires")
+        if expires is not None:
+            expires_at = parse_http_date(expires)
+            return max(expires_at - date, 0.0) if expires_at is not None else 0.0
+        
+        last_modified = parse_http_date(self.headers.get("last-modified"))
+        if last_modified is not None:
+            return min(max(date - last_modified, 0.0) * HEURISTIC_FRESHNESS, MAX_HEURISTIC_FRESHNESS)
+        return 0.0
+    
+    def age(self, now: float) -> float:
+        """
+        Compute the age of the response.
+        
+        Args:
+            now (float): The current time
+        
+        Returns:
+            float: Seconds since the origin generated or last revalidated the response
+        """
+        return (_seconds(self.headers.get("age")) or 0) + max(now - self.stored_at, 0.0)
+    
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """
+        Check whether the response can be used without asking the origin.
+        
+        Args:
+            now (float, optional): The current time; defaults to now
+        
+        Returns:
+            bool: True if the response is fresh
+        """
+        return self.age(time.time() if now is None else now) < self.freshness_lifetime()
+    
+    def matches(self, request_headers: Dict[str, str]) -> bool:
+        """
+        Check whether the entry was stored for a request with the same varying headers.
+        
+        Args:
+            request_headers (Dict[str, str]): Headers of the new request, with lowercase names
+        
+        Returns:
+            bool: True if the entry can answer the request
+        """
+        return all(request_headers.get(name, "") == value for name, value in self.vary.items())
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the entry for the disk cache.
+        
+        Returns:
+            bytes: A JSON header line followed by the body
+        """
+        metadata = {
+            "url": self.url,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "stored_at": self.stored_at,
+            "vary": self.vary
+        }
+        return json.dumps(metadata).encode("utf-8") + b"\n" + self.content
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResponse":
+        """
+        Deserialize an entry written by to_bytes.
+        
+        Args:
+            data (bytes): The serialized entry
+        
+        Returns:
+            CachedResponse: The entry
+        """
+        header, _, content = data.partition(b"\n")
+        metadata = json.loads(header.decode("utf-8"))
+        return cls(metadata["url"], metadata["status_code"], metadata["headers"], content,
+                   metadata["stored_at"], metadata.get("vary"))
+
+
+class HttpCache:
+    """HTTP response cache kept in a memory LRU and, optionally, a disk LRU."""
+    
+    def __init__(self, max_memory_bytes: int = DEFAULT_MEMORY_CACHE_BYTES, directory: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_DISK_CACHE_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_memory_bytes (int): Memory budget; least recently used entries are dropped beyond it
+            directory (str, optional): Directory persisting entries between runs; memory only if None
+            max_disk_bytes (int): Disk budget; least recently used files are deleted beyond it
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def get(self, url: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Look up the stored response for a URL, fresh or not.
+        
+        Args:
+            url (str): The requested URL
+            request_headers (Dict[str, str], optional): Headers of the request, with lowercase names
+        
+        Returns:
+            Optional[CachedResponse]: The entry, or None if nothing usable is stored
+        """
+        key = self._key(url)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or entry.url != url or not entry.matches(request_headers or {}):
+            return None
+        return entry
+    
+    def put(self, entry: CachedResponse) -> None:
+        """
+        Store a response, replacing the one stored for its URL.
+        
+        Args:
+            entry (CachedResponse): The response
+        """
+        key = self._key(entry.url)
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write_disk(key, entry)
+    
+    def invalidate(self, url: str) -> None:
+        """
+        Drop the stored response for a URL.
+        
+        Args:
+            url (str): The URL
+        """
+        key = self._key(url)
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= entry.size
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                size = os.stat(path).st_size
+                os.remove(path)
+            except OSError:
+                return
+            with self._lock:
+                if self._disk_bytes is not None:
+                    self._disk_bytes -= size
+    
+    def record(self, outcome: str) -> None:
+        """
+        Count how a request was answered.
+        
+        Args:
+            outcome (str): "hit", "revalidated" or "miss"
+        """
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how well the cache is doing.
+        
+        Returns:
+            Dict[str, Any]: "hits", "revalidated" and "misses" counts, and the
+                "entries" and "memory_bytes" held in memory
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes
+            }
+    
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """
+        Keep an entry in memory, evicting the least recently used beyond the budget.
+        
+        Args:
+            key (str): Cache key
+            entry (CachedResponse): The entry
+        """
+        if entry.size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.size
+            self._memory[key] = entry
+            self._memory_bytes += entry.size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.size
+    
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        """
+        Read an entry from the disk cache and mark it as recently used.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            Optional[CachedResponse]: The entry, or None if missing or unreadable
+        """
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = CachedResponse.from_bytes(file.read())
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+    
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        """
+        Write an entry to the disk cache, deleting least recently used files beyond the budget.
+        
+        Args:
+            key (str): Cache key
+            entry (CachedResponse): The entry
+        """
+        data = entry.to_bytes()
+        if len(data) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                previous = os.stat(path).st_size
+            except OSError:
+                previous = 0
+            atomic_write(path, data, sync=False)
+        except OSError as e:
+            print(f"Error writing HTTP cache entry for {entry.url}: {str(e)}")
+            return
+        
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += len(data) - previous
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            for candidate, size, _ in sorted(self._disk_entries(), key=lambda item: item[2]):
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                if candidate == path:
+                    continue
+                try:
+                    os.remove(candidate)
+                except OSError:
+                    continue
+                self._disk_bytes -= size
+    
+    def _disk_entries(self) -> List[Tuple[str, int, float]]:
+        """
+        List the files of the disk cache.
+        
+        Returns:
+            List[Tuple[str, int, float]]: Path, size and last use of every entry
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as scanner:
+                for entry in scanner:
+                    if entry.name.endswith(CACHE_EXTENSION) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except OSError:
+            pass
+        return entries
+    
+    def _key(self, url: str) -> str:
+        """
+        Build the cache key of a URL.
+        
+        Args:
+            url (str): The URL
+        
+        Returns:
+            str: The key
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """
+        Get the disk cache file of a key.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            str: Path of the file
+        """
+        return os.path.join(self.directory, key + CACHE_EXTENSION)
+
+
+class HttpResponse:
+    """A response returned by HttpClient, from the network or the cache."""
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, cache_status: str,
+                 path: Optional[str] = None, size: Optional[int] = None):
+        """
+        Initialize the response.
+        
+        Args:
+            url (str): The requested URL
+            status_code (int): HTTP status
+            headers (Dict[str, str]): Response headers with lowercase names
+            content (bytes): The body; empty if it was spooled to a file
+            cache_status (str): "hit" if served from the cache, "revalidated" if the
+                origin confirmed the cached copy with a 304, "miss" otherwise, and
+                "bypass" for streamed responses and requests with credentials, which
+                the cache doesn't see
+            path (str, optional): Temporary file holding the body of a large streamed
+                response; the caller deletes it, e.g. with discard()
+            size (int, optional): Size of the body in bytes; defaults to len(content)
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.cache_status = cache_status
+        self.path = path
+        self.size = len(content) if size is None else size
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the status is below 400."""
+        return self.status_code < 400
+    
+    @property
+    def content_type(self) -> str:
+        """The media type of the body, without parameters."""
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+    
+    @property
+    def text(self) -> str:
+        """The body decoded with the charset of the Content-Type, UTF-8 by default."""
+        charset = "utf-8"
+        for parameter in self.headers.get("content-type", "").split(";")[1:]:
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "charset" and value:
+                charset = value.strip('"')
+        content = self.read()
+        try:
+            return content.decode(charset, errors="replace")
+        except LookupError:
+            return content.decode("utf-8", errors="replace")
+    
+    def read(self) -> bytes:
+        """
+        Get the whole body, reading it from its file if it was spooled.
+        
+        Returns:
+            bytes: The body
+        """
+        if self.path is None:
+            return self.content
+        with open(self.path, "rb") as file:
+            return file.read()
+    
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Read the body in chunks, without loading a spooled body into memory.
+        
+        Args:
+            chunk_size (int): Bytes per chunk
+        
+        Yields:
+            bytes: The chunks
+        """
+        if self.path is None:
+            for start in range(0, len(self.content), chunk_size):
+                yield self.content[start:start + chunk_size]
+            return
+        with open(self.path, "rb") as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    
+    def json(self) -> Any:
+        """
+        Decode the body as JSON.
+        
+        Returns:
+            Any: The decoded value
+        """
+        return json.loads(self.read())
+    
+    def iter_json(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        Decode the items of a JSON array, or the values of an NDJSON body, one at a time.
+        
+        Args:
+            chunk_size (int): Bytes read at a time
+        
+        Yields:
+            Any: The decoded items
+        """
+        return iter_json_items(self.iter_content(chunk_size), ndjson=self.content_type in NDJSON_TYPES)
+    
+    def preview_json(self, max_items: int, max_bytes: int = DEFAULT_PREVIEW_BYTES) -> Optional[List[Any]]:
+        """
+        Decode the first items of a JSON array or NDJSON body, reading at most max_bytes.
+        
+        Other JSON documents aren't previewed, since they would be parsed as a
+        whole. An item cut off by the byte budget ends the preview.
+        
+        Args:
+            max_items (int): Maximum number of items
+            max_bytes (int): Maximum number of bytes read
+        
+        Returns:
+            Optional[List[Any]]: The items, or None if the body is neither an array nor NDJSON
+        """
+        if self.content_type not in NDJSON_TYPES and not is_json_type(self.content_type):
+            return None
+        
+        def head() -> Iterator[bytes]:
+            remaining = max_bytes
+            for chunk in self.iter_content(min(max_bytes, DEFAULT_CHUNK_SIZE)):
+                yield chunk[:remaining]
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    return
+        
+        chunks = head()
+        first = b""
+        while not first.strip():
+            chunk = next(chunks, None)
+            if chunk is None:
+                return []
+            first += chunk
+        if self.content_type not in NDJSON_TYPES and not first.lstrip().startswith(b"["):
+            return None
+        
+        items: List[Any] = []
+        try:
+            for item in iter_json_items(chain([first], chunks), ndjson=self.content_type in NDJSON_TYPES):
+                items.append(item)
+                if len(items) >= max_items:
+                    break
+        except ValueError:
+            pass
+        return items
+    
+    def discard(self) -> None:
+        """Delete the spooled body, if any."""
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+    
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError for 4xx and 5xx statuses."""
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class ResponseTooLargeError(requests.RequestException):
+    """Raised when a streamed response is larger than allowed."""
+
+
+class FetchResult:
+    """Outcome of one request of a bulk fetch."""
+    
+    def __init__(self, index: int, url: str, response: Optional[HttpResponse] = None,
+                 error: Optional[str] = None):
+        """
+        Initialize the result.
+        
+        Args:
+            index (int): Position of the request in the bulk fetch
+            url (str): The requested URL
+            response (HttpResponse, optional): The response, if the request completed
+            error (str, optional): Why the request failed otherwise
+        """
+        self.index = index
+        self.url = url
+        self.response = response
+        self.error = error
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the request completed with a status below 400."""
+        return self.response is not None and self.response.ok
+    
+    def __repr__(self) -> str:
+        outcome = self.response.status_code if self.response is not None else self.error
+        return f"FetchResult({self.index}, {self.url!r}, {outcome!r})"
+
+
+class HttpClient:
+    """Pooled, caching HTTP client shared by the agents that call web APIs."""
+    
+    def __init__(self, cache: Optional[HttpCache] = None,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 pool_hosts: int = DEFAULT_POOL_HOSTS,
+                 connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST, max_retries: int = 0,
+                 spool_directory: Optional[str] = None):
+        """
+        Initialize the client and its connection pools.
+        
+        Args:
+            cache (HttpCache, optional): Response cache; responses aren't cached if None
+            timeout (float or Tuple[float, float]): Default connect and read timeouts in seconds
+            pool_hosts (int): Number of hosts whose connection pools are kept
+            connections_per_host (int): Connections kept open per host; requests beyond
+                it wait for a connection instead of opening more
+            max_retries (int): Retries of failed connections (requests are never resent
+                once they reached the server)
+            spool_directory (str, optional): Where large streamed bodies are spooled;
+                defaults to the system's temporary directory
+        """
+        self.cache = cache
+        self.timeout = timeout
+        self.connections_per_host = connections_per_host
+        self.spool_directory = spool_directory
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=connections_per_host,
+                              max_retries=max_retries, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Union[None, float, Tuple[float, float]] = None) -> HttpResponse:
+        """
+        Send a GET request, answering it from the cache when possible.
+        
+        Requests with an Authorization or Cookie header, including cookies and
+        credentials the session adds, are sent as they are and never cached.
+        
+        Args:
+            url (str): The URL
+            headers (Dict[str, str], optional): Extra request headers
+            timeout (float or Tuple[float, float], optional): Overrides the default timeouts
+        
+        Returns:
+            HttpResponse: The response
+        
+        Raises:
+            requests.RequestException: If the request fails or times out
+        """
+        headers = dict(headers or {})
+        request_headers = {name.lower(): value for name, value in headers.items()}
+        request_directives = parse_cache_control(request_headers.get("cache-control"))
+        
+        if self.cache is not None and self._is_private(url, headers):
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            return HttpResponse(url, response.status_code, response_headers, response.content, "bypass")
+        
+        entry = None
+        if self.cache is not None and "no-store" not in request_directives:
+            entry = self.cache.get(url, request_headers)
+        if entry is not None and "no-cache" not in request_directives and entry.is_fresh():
+            self.cache.record("hit")
+            return HttpResponse(url, entry.status_code, dict(entry.headers), entry.content, "hit")
+        if entry is not None:
+            for name, value in entry.validators.items():
+                headers.setdefault(name, value)
+        
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        now = time.time()
+        response_headers = {name.lower(): value for name, value in response.headers.items()}
+        
+        if response.status_code == 304 and entry is not None:
+            # The origin confirmed the cached copy; store a copy with its updated headers
+            merged = dict(entry.headers)
+            merged.update((name, value) for name, value in response_headers.items()
+                          if name not in UNMERGED_304_HEADERS)
+            merged.pop("age", None)
+            entry = CachedResponse(entry.url, entry.status_code, merged, entry.content, now, entry.vary)
+            self.cache.put(entry)
+            self.cache.record("revalidated")
+            return HttpResponse(url, entry.status_code, dict(entry.headers), entry.content, "revalidated")
+        
+        content = response.content
+        if self.cache is not None:
+            self.cache.record("miss")
+            self._store(url, request_headers, request_directives, response.status_code, response_headers, content, now)
+        return HttpResponse(url, response.status_code, response_headers, content, "miss")
+    
+    def stream(self, url: str, headers: Optional[Dict[str, str]] = None,
+               timeout: Union[None, float, Tuple[float, float]] = None,
+               max_inline_bytes: int = DEFAULT_INLINE_BYTES, max_bytes: Optional[int] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> HttpResponse:
+        """
+        Send a GET request and read the body in chunks, bypassing the cache.
+        
+        Bodies up to max_inline_bytes are kept in memory. Larger ones are written to
+        a temporary file as they arrive, and the response carries its path.
+        
+        Args:
+            url (str): The URL
+            headers (Dict[str, str], optional): Extra request headers
+            timeout (float or Tuple[float, float], optional): Overrides the default timeouts
+            max_inline_bytes (int): Largest body kept in memory
+            max_bytes (int, optional): Largest body accepted at all; None for no limit
+            chunk_size (int): Bytes read at a time
+        
+        Returns:
+            HttpResponse: The response, with its body in content or in the file at path
+        
+        Raises:
+            ResponseTooLargeError: If the body is larger than max_bytes
+            requests.RequestException: If the request fails or times out
+        """
+        with self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=True) as response:
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            declared = _seconds(response_headers.get("content-length"))
+            if max_bytes is not None and declared is not None and declared > max_bytes:
+                raise ResponseTooLargeError(f"Response of {declared} bytes exceeds the limit of {max_bytes} bytes: {url}")
+            
+            buffer = bytearray()
+            spool = None
+            size = 0
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ResponseTooLargeError(f"Response exceeds the limit of {max_bytes} bytes: {url}")
+                    if spool is None and size > max_inline_bytes:
+                        spool = tempfile.NamedTemporaryFile(prefix="genesis-http-", suffix=".body",
+                                                            dir=self.spool_directory, delete=False)
+                        spool.write(buffer)
+                        buffer = bytearray()
+                    if spool is not None:
+                        spool.write(chunk)
+                    else:
+                        buffer += chunk
+            except BaseException:
+                if spool is not None:
+                    spool.close()
+                    os.remove(spool.name)
+                raise
+            if spool is not None:
+                spool.close()
+                return HttpResponse(url, response.status_code, response_headers, b"", "bypass", spool.name, size)
+            return HttpResponse(url, response.status_code, response_headers, bytes(buffer), "bypass")
+    
+    def fetch_many(self, requests_to_send: Iterable[Union[str, Dict[str, Any]]],
+                   max_workers: int = DEFAULT_FETCH_WORKERS,
+                   per_host: Optional[int] = None) -> Iterator[FetchResult]:
+        """
+        Send many GET requests concurrently and yield their results as they complete.
+        
+        Identical requests (same URL and headers) are sent once and their result is
+        yielded for each of them. At most per_host requests to the same host run at
+        a time; requests to other hosts use the remaining workers meanwhile.
+        
+        Args:
+            requests_to_send (Iterable[Union[str, Dict[str, Any]]]): URLs, or dicts with a
+                "url" and optional "headers" and "timeout"
+            max_workers (int): Requests running at the same time across all hosts
+            per_host (int, optional): Requests running at the same time per host;
+                defaults to the connections kept per host
+        
+        Yields:
+            FetchResult: One result per request, in completion order
+        """
+        # Identical requests share one entry: (url, headers, timeout, positions)
+        unique: Dict[Tuple, Tuple[str, Dict[str, str], Any, List[int]]] = {}
+        for index, spec in enumerate(requests_to_send):
+            if isinstance(spec, str):
+                spec = {"url": spec}
+            headers = dict(spec.get("headers") or {})
+            key = (spec["url"], tuple(sorted((name.lower(), value) for name, value in headers.items())))
+            if key not in unique:
+                unique[key] = (spec["url"], headers, spec.get("timeout"), [])
+            unique[key][3].append(index)
+        if not unique:
+            return
+        
+        queues: Dict[str, deque] = {}
+        for key, (url, _, _, _) in unique.items():
+            queues.setdefault(urlsplit(url).netloc.lower(), deque()).append(key)
+        running = {host: 0 for host in queues}
+        cap = max(per_host or self.connections_per_host, 1)
+        futures: Dict[Future, Tuple[str, Tuple]] = {}
+        
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(unique)), 1),
+                                thread_name_prefix="genesis-http") as executor:
+            def submit_ready() -> None:
+                for host, queue in queues.items():
+                    while queue and running[host] < cap:
+                        key = queue.popleft()
+                        url, headers, timeout, _ = unique[key]
+                        running[host] += 1
+                        futures[executor.submit(self.get, url, headers, timeout)] = (host, key)
+            
+            submit_ready()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, key = futures.pop(future)
+                    running[host] -= 1
+                    url, _, _, indices = unique[key]
+                    try:
+                        response, error = future.result(), None
+                    except requests.RequestException as e:
+                        response, error = None, str(e)
+                    for index in indices:
+                        yield FetchResult(index, url, response, error)
+                submit_ready()
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+    
+    def _is_private(self, url: str, headers: Dict[str, str]) -> bool:
+        """
+        Check whether a request carries credentials, from its headers or the session.
+        
+        Args:
+            url (str): The URL
+            headers (Dict[str, str]): Extra request headers
+        
+        Returns:
+            bool: True if the request is sent with an Authorization or Cookie header
+        """
+        prepared = self.session.prepare_request(requests.Request("GET", url, headers=headers))
+        return any(name in prepared.headers for name in PRIVATE_REQUEST_HEADERS)
+    
+    def _store(self, url: str, request_headers: Dict[str, str], request_directives: Dict[str, Optional[str]],
+               status_code: int, headers: Dict[str, str], content: bytes, now: float) -> None:
+        """
+        Cache a response if HTTP caching rules allow it and it can be reused.
+        
+        Args:
+            url (str): The requested URL
+            request_headers (Dict[str, str]): Request headers with lowercase names
+            request_directives (Dict[str, Optional[str]]): Cache-Control directives of the request
+            status_code (int): HTTP status of the response
+            headers (Dict[str, str]): Response headers with lowercase names
+            content (bytes): The body
+            now (float): When the response was received
+        """
+        vary = [name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()]
+        if (status_code not in CACHEABLE_STATUSES or "no-store" in request_directives
+                or "no-store" in parse_cache_control(headers.get("cache-control")) or "*" in vary):
+            self.cache.invalidate(url)
+            return
+        
+        entry = CachedResponse(url, status_code, headers, content, now,
+                               {name: request_headers.get(name, "") for name in vary})
+        if entry.freshness_lifetime() > 0 or entry.validators:
+            self.cache.put(entry)
+        else:
+            self.cache.invalidate(url)
+
+
+# Create a global instance of the HTTP client; set GENESIS_HTTP_CACHE=0 to disable its cache
+http_client = HttpClient(
+    HttpCache(directory=state_path("http")) if os.environ.get("GENESIS_HTTP_CACHE", "1") != "0" else None
+)
\ No newline at end of file
@@ -0,0 +1,406 @@
+"""
+Project index for the Genesis AI Framework.
+
+This module keeps a persistent index of a project for the FileSystemAgent:
+1. Every file with its size, modification time and content hash
+2. The symbols of every Python file: classes, functions, methods and
+   module-level instances such as file_system_agent
+3. The imports of every Python file, so "which files import X" is a lookup
+
+The index lives in an SQLite database in the state directory. Refreshing it
+only hashes and parses files whose modification time or size changed since
+the last refresh, so repeated queries don't rescan the project. Files that
+.gitignore excludes are not indexed.
+"""
+
+import ast
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from src.state import project_cache_path
+from src.tools.file_system_tools import walk_tree
+
+# Version of the database layout; bump it when the indexed data changes shape
+INDEX_VERSION = 2
+
+# Seconds a refresh is trusted before queries refresh the index again
+DEFAULT_MAX_AGE = 2.0
+
+
+def module_name(path: str) -> str:
+    """
+    Get the dotted module name of a Python file.
+    
+    Args:
+        path (str): Path relative to the project root
+    
+    Returns:
+        str: Module name, e.g. "src.utils" for src/utils.py and "src" for src/__init__.py
+    """
+    parts = os.path.splitext(path)[0].replace(os.sep, "/").split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def parse_imports(tree: ast.AST, path: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    List the imports of a parsed Python file, resolving relative imports.
+    
+    Args:
+        tree (ast.AST): The parsed file
+        path (str): Path relative to the project root, which relative imports start from
+    
+    Returns:
+        List[Tuple[str, Optional[str]]]: (module, imported name) per import; the name is
+            None for "import module" and "from module import *"
+    """
+    package = module_name(path)
+    if os.path.basename(path) != "__init__.py":
+        package = package.rpartition(".")[0]
+    
+    imports: List[Tuple[str, Optional[str]]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((alias.name, None) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                parts = parts[:len(parts) - node.level + 1]
+                module = ".".join(part for part in [*parts, module] if part)
+            if module:
+                imports.extend((module, alias.name if alias.name != "*" else None) for alias in node.names)
+    return imports
+
+
+class ProjectIndex:
+    """Persistent index of a project's files, Python symbols and imports."""
+    
+    def __init__(self, root: str = ".", path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Initialize the index. The database is opened and refreshed lazily on first query.
+        
+        Args:
+            root (str): Project directory
+            path (str, optional): SQLite database file; defaults to a file per project
+                in the state directory
+            max_age (float): Seconds after a refresh during which queries don't refresh again
+        """
+        self.root = os.path.abspath(root)
+        self.path = path or project_cache_path(root, "project_index", ".sqlite3")
+        self.max_age = max_age
+        self._refreshed_at: Optional[float] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+    
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk.
+        
+        Returns:
+            Dict[str, int]: Number of "added", "updated", "removed" and "unchanged" files
+        """
+        with self._lock:
+            connection = self._connect()
+            known = {row[0]: (row[1], row[2]) for row in connection.execute("SELECT path, mtime_ns, size FROM files")}
+            counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            seen: Set[str] = set()
+            
+            for path, stat in self._scan():
+                seen.add(path)
+                previous = known.get(path)
+                if previous == (stat.st_mtime_ns, stat.st_size):
+                    counts["unchanged"] += 1
+                    continue
+                if self._index_file(connection, path, stat):
+                    counts["added" if previous is None else "updated"] += 1
+                else:
+                    seen.discard(path)
+            
+            for path in known.keys() - seen:
+                self._remove_file(connection, path)
+                counts["removed"] += 1
+            
+            connection.commit()
+            self._refreshed_at = time.monotonic()
+            return counts
+    
+    def files(self, pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List indexed files.
+        
+        Args:
+            pattern (str, optional): Glob the path must match, e.g. "src/agents/*.py"
+        
+        Returns:
+            List[Dict[str, Any]]: "path", "size" and "sha256" per file, sorted by path
+        """
+        query = "SELECT path, size, sha256 FROM files"
+        parameters: Tuple[Any, ...] = ()
+        if pattern is not None:
+            query += " WHERE path GLOB ?"
+            parameters = (pattern,)
+        rows = self._query(query + " ORDER BY path", parameters)
+        return [{"path": row[0], "size": row[1], "sha256": row[2]} for row in rows]
+    
+    def symbols(self, name: Optional[str] = None, kind: Optional[str] = None, path: Optional[str] = None,
+                base: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find Python symbols.
+        
+        Args:
+            name (str, optional): Glob the symbol name must match, e.g. "*Agent"
+            kind (str, optional): "class", "function", "method" or "instance"
+            path (str, optional): Glob the defining file must match
+            base (str, optional): Only classes with this base class name
+        
+        Returns:
+            List[Dict[str, Any]]: "name", "kind", "path", "line" and "detail" per symbol:
+                the base classes of a class, the class of a method, or the
+                called name an instance was created with
+        """
+        conditions, parameters = [], []
+        for column, value, operator in (("name", name, "GLOB"), ("kind", kind, "="), ("path", path, "GLOB")):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        query = "SELECT name, kind, path, line, detail FROM symbols"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self._query(query + " ORDER BY path, line", tuple(parameters))
+        
+        symbols = [{"name": row[0], "kind": row[1], "path": row[2], "line": row[3], "detail": row[4]} for row in rows]
+        if base is not None:
+            symbols = [symbol for symbol in symbols
+                       if symbol["kind"] == "class" and base in symbol["detail"].split(", ")]
+        return symbols
+    
+    def importers(self, module: str) -> List[str]:
+        """
+        Find the files that import a module.
+        
+        Both "import a.b" and "from a import b" count as importing "a.b".
+        
+        Args:
+            module (str): Dotted module name
+        
+        Returns:
+            List[str]: Sorted paths of the importing files
+        """
+        rows = self._query(
+            "SELECT DISTINCT path FROM imports WHERE module = ? OR module || '.' || name = ? ORDER BY path",
+            (module, module)
+        )
+        return [row[0] for row in rows]
+    
+    def imports(self, path: str) -> List[str]:
+        """
+        List the modules a file imports.
+        
+        Args:
+            path (str): File path relative to the root
+        
+        Returns:
+            List[str]: Sorted dotted module names
+        """
+        rows = self._query("SELECT DISTINCT module FROM imports WHERE path = ? ORDER BY module", (path,))
+        return [row[0] for row in rows]
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the project, e.g. to answer "analyze the project structure".
+        
+        Returns:
+            Dict[str, Any]: Number of "files" and their "total_size", file counts per
+                top-level "directories" entry, and the project's "classes" and
+                module-level "instances"
+        """
+        directories: Dict[str, int] = {}
+        total_size = 0
+        files = self.files()
+        for file in files:
+            top = file["path"].split("/", 1)[0] if "/" in file["path"] else "."
+            directories[top] = directories.get(top, 0) + 1
+            total_size += file["size"]
+        return {
+            "files": len(files),
+            "total_size": total_size,
+            "directories": directories,
+            "classes": self.symbols(kind="class"),
+            "instances": self.symbols(kind="instance")
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _query(self, query: str, parameters: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """
+        Run a query, refreshing the index first if the last refresh is too old.
+        
+        Args:
+            query (str): SQL query
+            parameters (Tuple[Any, ...]): Query parameters
+        
+        Returns:
+            List[Tuple[Any, ...]]: The rows
+        """
+        with self._lock:
+            if self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.max_age:
+                self.refresh()
+            return self._connect().execute(query, parameters).fetchall()
+    
+    def _scan(self):
+        """
+        Walk the project, skipping ignored files and directories that never contain project files.
+        
+        Yields:
+            Tuple[str, os.stat_result]: Path relative to the root and the file's stat data
+        """
+        for entry in walk_tree(self.root):
+            try:
+                yield entry.path, entry.stat()
+            except OSError:
+                continue
+    
+    def _index_file(self, connection: sqlite3.Connection, path: str, stat: os.stat_result) -> bool:
+        """
+        Hash a new or changed file and, for Python files, index its symbols and imports.
+        
+        Args:
+            connection (sqlite3.Connection): The open database
+            path (str): Path relative to the root
+            stat (os.stat_result): The file's stat data
+        
+        Returns:
+            bool: False if the file could not be read
+        """
+        try:
+            with open(os.path.join(self.root, path), "rb") as file:
+                source = file.read()
+        except OSError:
+            return False
+        
+        self._remove_file(connection, path)
+        connection.execute(
+            "INSERT INTO files (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, hashlib.sha256(source).hexdigest())
+        )
+        if path.endswith(".py"):
+            symbols, imports = self._parse(path, source)
+            connection.executemany(
+                "INSERT INTO symbols (path, name, kind, line, detail) VALUES (?, ?, ?, ?, ?)",
+                [(path, *symbol) for symbol in symbols]
+            )
+            connection.executemany(
+                "INSERT INTO imports (path, module, name) VALUES (?, ?, ?)",
+                [(path, *edge) for edge in imports]
+            )
+        return True
+    
+    def _remove_file(self, connection: sqlite3.Connection, path: str) -> None:
+        """
+        Drop a file and everything indexed from it.
+        
+        Args:
+            connection (sqlite3.Connection): The open database
+            path (str): Path relative to the root
+        """
+        for table in ("files", "symbols", "imports"):
+            connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+    
+    def _parse(self, path: str, source: bytes) -> Tuple[List[Tuple[str, str, int, str]],
+                                                        List[Tuple[str, Optional[str]]]]:
+        """
+        Extract the symbols and imports of a Python file.
+        
+        Args:
+            path (str): Path relative to the root
+            source (bytes): The file's content
+        
+        Returns:
+            Tuple: (name, kind, line, detail) per symbol and (module, imported name) per
+                import; files that don't parse yield neither
+        """
+        try:
+            tree = ast.parse(source, filename=path)
+        except (SyntaxError, ValueError):
+            return [], []
+        
+        symbols: List[Tuple[str, str, int, str]] = []
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                symbols.append((node.name, "class", node.lineno, ", ".join(_dotted_name(base) for base in node.bases)))
+                for member in node.body:
+                    if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        symbols.append((member.name, "method", member.lineno, node.name))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbols.append((node.name, "function", node.lineno, ""))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                if _dotted_name(node.value.func).endswith("registry.provide"):
+                    # __getattr__ = registry.provide(__name__, name=factory) creates the instances lazily
+                    for keyword in node.value.keywords:
+                        if keyword.arg:
+                            symbols.append((keyword.arg, "instance", node.lineno, _dotted_name(keyword.value)))
+                    continue
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append((target.id, "instance", node.lineno, _dotted_name(node.value.func)))
+        
+        return symbols, parse_imports(tree, path)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database on first use, recreating it if its layout is outdated. Caller holds the lock.
+        
+        Returns:
+            sqlite3.Connection: The open connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                for table in ("files", "symbols", "imports"):
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self._connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, sha256 TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS symbols ("
+                "path TEXT NOT NULL, name TEXT NOT NULL, kind TEXT NOT NULL, line INTEGER NOT NULL, "
+                "detail TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS imports (path TEXT NOT NULL, module TEXT NOT NULL, name TEXT);"
+                "CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols (name);"
+                "CREATE INDEX IF NOT EXISTS idx_symbols_path ON symbols (path);"
+                "CREATE INDEX IF NOT EXISTS idx_imports_module ON imports (module);"
+                "CREATE INDEX IF NOT EXISTS idx_imports_path ON imports (path);"
+            )
+        return self._connection
+
+
+def _dotted_name(node: ast.AST) -> str:
+    """
+    Render a name or attribute chain such as "agents.Agent".
+    
+    Args:
+        node (ast.AST): The expression
+    
+    Returns:
+        str: The dotted name, or an empty string for other expressions
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = _dotted_name(node.value)
+        return f"{value}.{node.attr}" if value else ""
+    return ""
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Pytest fork server for the Genesis AI Framework.
+
+This script is started by PytestForkServer in src/tools/testing_tools.py and
+is responsible for:
+1. Importing pytest, its plugins and other heavy modules once, up front
+2. Forking a fresh child for every test run, so runs start with those imports done
+3. Dropping project modules whose source changed since they were preloaded,
+   so the child imports their current version
+
+It runs as a standalone script and only uses the standard library, so it
+works for any project directory. Requests and responses are JSON lines on
+stdin and stdout.
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, List, Set
+
+
+def preload(module_names: List[str]) -> None:
+    """
+    Import pytest, its installed plugins and the given modules.
+    
+    Modules that fail to import are skipped; the child imports them itself.
+    
+    Args:
+        module_names (List[str]): Modules to import, e.g. "requests"
+    """
+    for name in ["pytest", "_pytest.config", *module_names]:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+    
+    try:
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group="pytest11"):
+            try:
+                importlib.import_module(entry_point.module)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+
+def snapshot_project_modules(root: str) -> Dict[str, int]:
+    """
+    Record the source modification time of every loaded module inside the project.
+    
+    Args:
+        root (str): Project directory
+    
+    Returns:
+        Dict[str, int]: Modification time in nanoseconds per module name
+    """
+    snapshot = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.abspath(path).startswith(root + os.sep):
+            try:
+                snapshot[name] = os.stat(path).st_mtime_ns
+            except OSError:
+                snapshot[name] = -1
+    return snapshot
+
+
+def purge_changed_modules(snapshot: Dict[str, int]) -> List[str]:
+    """
+    Drop preloaded project modules whose source changed, and the modules that use them.
+    
+    A module counts as using a dropped module if one of its globals is that
+    module or an object defined in it. This repeats until nothing else is dropped.
+    
+    Args:
+        snapshot (Dict[str, int]): Modification times recorded at preload
+    
+    Returns:
+        List[str]: Names of the dropped modules
+    """
+    purged: Set[str] = set()
+    for name, mtime in snapshot.items():
+        module = sys.modules.get(name)
+        try:
+            current = os.stat(module.__file__).st_mtime_ns
+        except (AttributeError, OSError, TypeError):
+            current = None
+        if current != mtime:
+            purged.add(name)
+    
+    changed = bool(purged)
+    while changed:
+        changed = False
+        for name in snapshot:
+            if name in purged or name not in sys.modules:
+                continue
+            for value in vars(sys.modules[name]).values():
+                owner = value.__name__ if isinstance(value, type(sys)) else getattr(value, "__module__", None)
+                if owner in purged:
+                    purged.add(name)
+                    changed = True
+                    break
+    
+    for name in purged:
+        sys.modules.pop(name, None)
+    return sorted(purged)
+
+
+def run_child(request: Dict[str, Any], snapshot: Dict[str, int], received: float) -> None:
+    """
+    Run pytest in the forked child and exit with its return code.
+    
+    Args:
+        request (Dict[str, Any]): "args" for pytest, "output" and "result" file paths
+        snapshot (Dict[str, int]): Modification times recorded at preload
+        received (float): When the server received the request
+    """
+    returncode = 3
+    try:
+        output = os.open(request["output"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(output, 1)
+        os.dup2(output, 2)
+        os.close(output)
+        sys.stdout = os.fdopen(1, "w", buffering=1)
+        sys.stderr = os.fdopen(2, "w", buffering=1)
+        
+        purged = purge_changed_modules(snapshot)
+        started = time.perf_counter()
+        import pytest
+        returncode = int(pytest.main(request["args"]))
+        finished = time.perf_counter()
+        
+        with open(request["result"], "w", encoding="utf-8") as file:
+            json.dump({
+                "startup_time": started - received,
+                "execution_time": finished - started,
+                "purged_modules": purged
+            }, file)
+    except BaseException as e:
+        try:
+            print(f"Error running pytest in the fork server: {str(e)}", file=sys.stderr)
+        except Exception:
+            pass
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(returncode)
+
+
+def serve(module_names: List[str]) -> None:
+    """
+    Preload modules, then answer run requests from stdin until it closes.
+    
+    Args:
+        module_names (List[str]): Extra modules to preload
+    """
+    started = time.perf_counter()
+    root = os.path.abspath(os.getcwd())
+    # Behave like "python -m pytest", which puts the working directory on sys.path
+    # in place of this script's directory
+    sys.path[0] = root
+    preload(module_names)
+    snapshot = snapshot_project_modules(root)
+    
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+    protocol.write(json.dumps({"ready": True, "preload_time": time.perf_counter() - started}) + "\n")
+    protocol.flush()
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        received = time.perf_counter()
+        protocol.flush()
+        pid = os.fork()
+        if pid == 0:
+            run_child(request, snapshot, received)
+        _, status = os.waitpid(pid, 0)
+        protocol.write(json.dumps({
+            "returncode": os.waitstatus_to_exitcode(status),
+            "total_time": time.perf_counter() - received
+        }) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1:])
\ No newline at end of file
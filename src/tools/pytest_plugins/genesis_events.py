@@ -0,0 +1,157 @@
+"""
+Pytest plugin that reports test progress for the Genesis AI Framework.
+
+Loaded with "-p genesis_events --genesis-events=<file>", it is responsible for:
+1. Writing one JSON line per test result to the file as soon as the test finishes
+2. Locating each failure (file, line and message of the crash)
+3. Keeping failure tracebacks short, so huge outputs stay cheap to handle
+
+It only uses pytest and the standard library, so it can be loaded into any project.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+# Characters of traceback kept per failure; the end of a traceback is kept
+MAX_TRACEBACK_CHARS = 2000
+
+
+def pytest_addoption(parser) -> None:
+    """Register the --genesis-events option."""
+    parser.addoption("--genesis-events", default=None,
+                     help="Write one JSON line per test event to this file")
+
+
+def pytest_configure(config) -> None:
+    """Start writing events if --genesis-events was given."""
+    path = config.getoption("--genesis-events")
+    if path:
+        config.pluginmanager.register(EventWriter(path, str(config.rootpath)), "genesis-event-writer")
+
+
+class EventWriter:
+    """Writes test events as JSON lines."""
+    
+    def __init__(self, path: str, rootdir: str):
+        """
+        Open the events file.
+        
+        Args:
+            path (str): The events file
+            rootdir (str): pytest's root directory, which reported paths are relative to
+        """
+        self.rootdir = rootdir
+        self.started = time.perf_counter()
+        self.file = open(path, "a", encoding="utf-8", buffering=1)
+    
+    def pytest_collection_finish(self, session) -> None:
+        """Report how many tests were collected."""
+        self._write({"event": "collected", "count": len(session.items)})
+    
+    def pytest_collectreport(self, report) -> None:
+        """Report modules that failed to import as errors."""
+        if report.failed:
+            self._write(self._result(report, "error"))
+    
+    def pytest_runtest_logreport(self, report) -> None:
+        """Report the outcome of a test: its call, or a setup or teardown that did not pass."""
+        if report.when == "call":
+            outcome = report.outcome
+            if hasattr(report, "wasxfail"):
+                outcome = "xfailed" if report.skipped else "xpassed"
+        elif report.failed:
+            outcome = "error"
+        elif report.when == "setup" and report.skipped:
+            outcome = "skipped"
+        else:
+            return
+        self._write(self._result(report, outcome))
+    
+    def pytest_sessionfinish(self, session, exitstatus) -> None:
+        """Report the end of the session and close the file."""
+        self._write({
+            "event": "finished",
+            "exitstatus": int(exitstatus),
+            "duration": time.perf_counter() - self.started
+        })
+        self.file.close()
+    
+    def _result(self, report, outcome: str) -> Dict[str, Any]:
+        """
+        Build the event for one test report.
+        
+        Args:
+            report: The pytest test or collect report
+            outcome (str): passed, failed, error, skipped, xfailed or xpassed
+        
+        Returns:
+            Dict[str, Any]: The event
+        """
+        nodeid = report.nodeid
+        location = getattr(report, "location", None)
+        event = {
+            "event": "test",
+            "nodeid": nodeid,
+            "outcome": outcome,
+            "when": report.when if hasattr(report, "when") else "collect",
+            "duration": getattr(report, "duration", 0.0),
+            "file": location[0] if location else nodeid.split("::", 1)[0],
+            "line": location[1] + 1 if location and location[1] is not None else None
+        }
+        
+        if outcome in ("failed", "error", "skipped"):
+            crash = getattr(report.longrepr, "reprcrash", None)
+            if crash is not None:
+                event["file"] = self._relative(crash.path)
+                event["line"] = crash.lineno
+                event["message"] = crash.message
+            elif isinstance(report.longrepr, tuple) and len(report.longrepr) == 3:
+                event["message"] = str(report.longrepr[2])
+            else:
+                lines = str(report.longrepr).strip().splitlines()
+                event["message"] = lines[-1] if lines else ""
+        if outcome in ("failed", "error"):
+            event["traceback"] = self._truncate(report.longreprtext)
+        return event
+    
+    def _relative(self, path: str) -> str:
+        """
+        Make a path relative to the root directory when it is inside it.
+        
+        Args:
+            path (str): The path
+        
+        Returns:
+            str: The relative path, or the path unchanged
+        """
+        absolute = os.path.abspath(path)
+        if absolute.startswith(self.rootdir + os.sep):
+            return os.path.relpath(absolute, self.rootdir)
+        return path
+    
+    def _truncate(self, text: Optional[str]) -> str:
+        """
+        Keep the end of a traceback, where the failure is.
+        
+        Args:
+            text (Optional[str]): The full traceback
+        
+        Returns:
+            str: At most MAX_TRACEBACK_CHARS characters
+        """
+        text = text or ""
+        if len(text) <= MAX_TRACEBACK_CHARS:
+            return text
+        return "...\n" + text[-MAX_TRACEBACK_CHARS:]
+    
+    def _write(self, event: Dict[str, Any]) -> None:
+        """
+        Append one event to the file.
+        
+        Args:
+            event (Dict[str, Any]): The event
+        """
+        if not self.file.closed:
+            self.file.write(json.dumps(event, default=str) + "\n")
\ No newline at end of file
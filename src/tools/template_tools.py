@@ -0,0 +1,157 @@
+"""
+Template tools for the Genesis AI Framework.
+
+This module gives the CodeGenerationAgent a small template engine:
+1. Templates are files in src/templates, named after the file they generate
+   plus ".tmpl", and are only read when first rendered
+2. Each template is compiled once into its literal text and the positions of
+   its {{ parameter }} placeholders, and kept in a cache until its file changes
+3. Rendering fills the placeholders in with a single join, so generating many
+   similar files is a cheap loop
+
+Placeholders are parameter names in double braces; any other braces, as in
+Python, CSS or JavaScript code, are left alone.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Any, List, Tuple
+
+# Directory holding the code templates
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# File extension of templates
+TEMPLATE_EXTENSION = ".tmpl"
+
+# A placeholder such as {{ function_name }}
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+class TemplateError(Exception):
+    """Raised when a template doesn't exist or is rendered without all its parameters."""
+
+
+class CompiledTemplate:
+    """A template split into literal text and placeholders, ready to render."""
+    
+    def __init__(self, name: str, source: str):
+        """
+        Compile a template.
+        
+        Args:
+            name (str): Name of the template
+            source (str): The template text
+        """
+        self.name = name
+        # Literal text at even positions, parameter names at odd positions
+        self._pieces: List[str] = PLACEHOLDER.split(source)
+        self._slots: List[Tuple[int, str]] = [(index, self._pieces[index]) for index in range(1, len(self._pieces), 2)]
+        self.parameters = frozenset(name for _, name in self._slots)
+    
+    def render(self, parameters: Dict[str, Any]) -> str:
+        """
+        Fill the placeholders in.
+        
+        Args:
+            parameters (Dict[str, Any]): Value per parameter; values are converted with str()
+        
+        Returns:
+            str: The rendered text
+        """
+        missing = self.parameters.difference(parameters)
+        if missing:
+            raise TemplateError(f"Template {self.name} is missing parameters: {', '.join(sorted(missing))}")
+        pieces = list(self._pieces)
+        for index, name in self._slots:
+            pieces[index] = str(parameters[name])
+        return "".join(pieces)
+
+
+class TemplateEngine:
+    """Loads templates lazily from a directory and caches them compiled."""
+    
+    def __init__(self, directory: str = TEMPLATE_DIR, auto_reload: bool = True):
+        """
+        Initialize the engine. No template is read until it is rendered.
+        
+        Args:
+            directory (str): Directory holding the templates
+            auto_reload (bool): Whether to recompile templates whose file changed
+        """
+        self.directory = directory
+        self.auto_reload = auto_reload
+        self._cache: Dict[str, Tuple[int, CompiledTemplate]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> CompiledTemplate:
+        """
+        Get a compiled template, compiling it on first use.
+        
+        Args:
+            name (str): Name of the template, e.g. "factorial.py"
+        
+        Returns:
+            CompiledTemplate: The compiled template
+        """
+        path = self._path(name)
+        cached = self._cache.get(name)
+        if cached is not None and not self.auto_reload:
+            return cached[1]
+        
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise TemplateError(f"Unknown template: {name}")
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        with open(path, "r", encoding="utf-8") as file:
+            template = CompiledTemplate(name, file.read())
+        with self._lock:
+            self._cache[name] = (mtime, template)
+        return template
+    
+    def render(self, name: str, /, **parameters: Any) -> str:
+        """
+        Render a template.
+        
+        Args:
+            name (str): Name of the template, e.g. "factorial.py"
+            **parameters: Value per placeholder
+        
+        Returns:
+            str: The rendered text
+        """
+        return self.get(name).render(parameters)
+    
+    def names(self) -> List[str]:
+        """
+        List the available templates.
+        
+        Returns:
+            List[str]: Sorted template names
+        """
+        try:
+            files = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(name[:-len(TEMPLATE_EXTENSION)] for name in files if name.endswith(TEMPLATE_EXTENSION))
+    
+    def _path(self, name: str) -> str:
+        """
+        Get the file of a template.
+        
+        Args:
+            name (str): Name of the template
+        
+        Returns:
+            str: Path of the template file
+        """
+        if not name or os.path.basename(name) != name:
+            raise TemplateError(f"Invalid template name: {name}")
+        return os.path.join(self.directory, name + TEMPLATE_EXTENSION)
+
+
+# Create a global instance of the template engine
+template_engine = TemplateEngine()
\ No newline at end of file
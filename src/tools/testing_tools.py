@@ -0,0 +1,1014 @@
+"""
+Testing tools for the Genesis AI Framework.
+
+This module gives the TestingAgent a test impact map:
+1. Every Python file in the project is parsed once for its imports and the
+   result is cached on disk, keyed by the file's size and modification time
+2. The imports are turned into a reverse dependency graph between modules
+3. Given the files a task changed, the graph tells which test files can be
+   affected, so only those need to run
+
+It also provides the pieces for running a suite in parallel shards: test
+collection, a store of historical per-file durations and duration-balanced
+sharding.
+
+Test results are read from the genesis_events pytest plugin, which writes a
+JSON line per test; TestRunSummary turns them into counts and a compact list
+of failures, and OutputTail keeps only the end of the output. Test files that
+passed are remembered in TestResultCache under a hash of everything they
+depend on, so unchanged tests don't have to run again.
+
+Finally, PytestForkServer keeps a warm pytest process per project that forks
+a child for every run, so runs skip interpreter startup and heavy imports.
+"""
+
+import ast
+import atexit
+import hashlib
+import heapq
+import json
+import os
+import select
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Deque, Iterable, List, Optional, Set, Tuple
+
+from src.state import project_cache_path
+from src.tools.file_system_tools import IGNORED_DIRECTORIES
+from src.tools.project_index import module_name, parse_imports
+
+# Changing one of these can affect any test, so the full suite has to run
+FULL_SUITE_FILES = {"conftest.py", "pytest.ini", "setup.cfg", "setup.py", "tox.ini",
+                    "pyproject.toml", "requirements.txt"}
+
+# Version of the cache file layout; bump it when the cached data changes shape
+CACHE_VERSION = 3
+
+# Test files importing one of these start processes whose inputs imports can't trace
+UNCACHEABLE_IMPORTS = {"subprocess", "multiprocessing"}
+
+# Assumed duration, in seconds, of a test file that has never run
+DEFAULT_TEST_FILE_DURATION = 1.0
+
+# Modules the fork server imports up front unless GENESIS_PRELOAD_MODULES lists others;
+# these are the slow third-party imports of this project's tests
+DEFAULT_PRELOAD_MODULES = ("requests", "flask")
+
+# The standalone script the fork server runs
+FORK_SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pytest_fork_server.py")
+
+# Directory holding the pytest plugin that writes test events
+PYTEST_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pytest_plugins")
+
+# Characters of pytest output kept in a result
+MAX_OUTPUT_CHARS = 64 * 1024
+
+# Failures kept in detail in a run summary
+MAX_SUMMARY_FAILURES = 50
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write a JSON file through a temporary file, so readers never see a partial file.
+    
+    Args:
+        path (str): Destination path
+        data (Any): JSON-serializable data
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+def is_test_file(path: str) -> bool:
+    """
+    Check whether a file is collected by pytest's default rules.
+    
+    Args:
+        path (str): Path of the file
+    
+    Returns:
+        bool: True for test_*.py and *_test.py files
+    """
+    name = os.path.basename(path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+class TestImpactMap:
+    """Maps changed files to the test files that import them, directly or transitively."""
+    
+    __test__ = False  # Not a pytest test class, despite the name
+    
+    def __init__(self, root: str = ".", cache_path: Optional[str] = None):
+        """
+        Initialize the impact map. Nothing is read until it is first used.
+        
+        Args:
+            root (str): Project directory
+            cache_path (str, optional): JSON file the parsed imports are cached in;
+                defaults to a file per project in the state directory
+        """
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path or project_cache_path(root, "test_impact")
+        self._files: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+    
+    def impacted_tests(self, changed_paths: Iterable[str]) -> Optional[List[str]]:
+        """
+        Find the test files that can be affected by a set of changed files.
+        
+        Args:
+            changed_paths (Iterable[str]): Changed files, relative to the project root
+        
+        Returns:
+            Optional[List[str]]: Sorted test file paths relative to the root, or None if
+                the change can affect anything and the full suite has to run
+        """
+        changed = [os.path.normpath(path) for path in changed_paths]
+        for path in changed:
+            if os.path.basename(path) in FULL_SUITE_FILES or not path.endswith(".py"):
+                return None
+        
+        with self._lock:
+            files = self._refresh()
+        if any(path not in files for path in changed):
+            # A deleted or unknown module may break importers the map can no longer see
+            return None
+        
+        importers: Dict[str, Set[str]] = {}
+        for path, dependencies in self._dependencies(files).items():
+            for dependency in dependencies:
+                importers.setdefault(dependency, set()).add(path)
+        
+        # Walk the reverse dependency graph from every changed file
+        affected: Set[str] = set()
+        pending = list(changed)
+        while pending:
+            path = pending.pop()
+            if path in affected:
+                continue
+            affected.add(path)
+            pending.extend(importers.get(path, ()))
+        
+        return sorted(path for path in affected if is_test_file(path) and path in files)
+    
+    def test_files(self) -> List[str]:
+        """
+        List the project's test files.
+        
+        Returns:
+            List[str]: Sorted test file paths relative to the root
+        """
+        with self._lock:
+            return sorted(path for path in self._refresh() if is_test_file(path))
+    
+    def fingerprints(self, test_files: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Hash everything the outcome of each test file depends on.
+        
+        That is the contents of the test file, of every project module it imports
+        directly or transitively, of the conftest.py files that apply to it, of
+        every other non-Python file in the project, such as templates and data the
+        test may read, and of the project's pytest and dependency configuration,
+        plus the Python version. Test files that start subprocesses get no
+        fingerprint, since the code those run isn't traced. The project is
+        scanned and its import graph built once for all the files.
+        
+        Args:
+            test_files (Iterable[str], optional): Test file paths relative to the root;
+                defaults to all of the project's test files
+        
+        Returns:
+            Dict[str, Optional[str]]: Per normalized test file path, a hex digest, or None
+                if the file is unknown or unreadable
+        """
+        with self._lock:
+            files = self._refresh()
+        if test_files is None:
+            test_files = sorted(path for path in files if is_test_file(path))
+        
+        base = hashlib.sha256(sys.version.encode("utf-8"))
+        for name in sorted(FULL_SUITE_FILES - {"conftest.py"}):
+            try:
+                with open(os.path.join(self.root, name), "rb") as file:
+                    base.update(f"{name}\0".encode("utf-8") + hashlib.sha256(file.read()).digest())
+            except OSError:
+                continue
+        
+        for path in sorted(files):
+            if not path.endswith(".py"):
+                # An unreadable file is told apart by its modification time
+                base.update(f"{path}\0{files[path]['sha256'] or files[path]['mtime_ns']}\0".encode("utf-8"))
+        
+        dependencies = self._dependencies(files)
+        return {
+            test_file: self._fingerprint(test_file, files, dependencies, base.copy())
+            for test_file in map(os.path.normpath, test_files)
+        }
+    
+    def _fingerprint(self, test_file: str, files: Dict[str, Dict[str, Any]], dependencies: Dict[str, Set[str]],
+                     digest: Any) -> Optional[str]:
+        """
+        Hash one test file together with its conftest.py files and imports.
+        
+        Args:
+            test_file (str): Normalized test file path relative to the root
+            files (Dict[str, Dict[str, Any]]): The refreshed file entries
+            dependencies (Dict[str, Set[str]]): Per file, the project files it imports
+            digest (Any): SHA-256 hash already fed with the configuration, updated in place
+        
+        Returns:
+            Optional[str]: A hex digest, or None if the file is unknown or unreadable
+        """
+        if test_file not in files or UNCACHEABLE_IMPORTS & set(files[test_file]["imports"]):
+            return None
+        
+        # conftest.py files from the root down to the test file's directory apply to it
+        roots = [test_file]
+        directory = os.path.dirname(test_file)
+        while True:
+            conftest = os.path.normpath(os.path.join(directory, "conftest.py"))
+            if conftest in files:
+                roots.append(conftest)
+            if not directory:
+                break
+            directory = os.path.dirname(directory)
+        
+        closure: Set[str] = set()
+        pending = roots
+        while pending:
+            path = pending.pop()
+            if path in closure:
+                continue
+            closure.add(path)
+            pending.extend(dependencies.get(path, ()))
+        
+        for path in sorted(closure):
+            if files[path].get("sha256") is None:
+                return None
+            digest.update(f"{path}\0{files[path]['sha256']}\0".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _dependencies(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Set[str]]:
+        """
+        Resolve every file's imports to the project files they refer to.
+        
+        Args:
+            files (Dict[str, Dict[str, Any]]): The refreshed file entries
+        
+        Returns:
+            Dict[str, Set[str]]: Per file, the project files it imports
+        """
+        modules = {module_name(path): path for path in files if path.endswith(".py")}
+        return {
+            path: {modules[module] for module in entry["imports"] if module in modules}
+            for path, entry in files.items()
+        }
+    
+    def _refresh(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the file hashes and parsed imports up to date, re-reading only files that changed.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Per file, its size, modification time, content hash and
+                imports; files other than Python modules import nothing
+        """
+        if self._files is None:
+            self._files = self._load()
+        
+        current: Dict[str, Dict[str, Any]] = {}
+        dirty = False
+        for path in self._project_files():
+            stat = os.stat(os.path.join(self.root, path))
+            entry = self._files.get(path)
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                try:
+                    with open(os.path.join(self.root, path), "rb") as file:
+                        source: Optional[bytes] = file.read()
+                except OSError:
+                    source = None
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": hashlib.sha256(source).hexdigest() if source is not None else None,
+                    "imports": sorted(self._parse_imports(path, source)) if path.endswith(".py") else []
+                }
+                dirty = True
+            current[path] = entry
+        
+        if dirty or len(current) != len(self._files):
+            self._save(current)
+        self._files = current
+        return current
+    
+    def _project_files(self) -> List[str]:
+        """
+        List the project's files, outside ignored and hidden directories.
+        
+        Returns:
+            List[str]: Paths relative to the root
+        """
+        paths = []
+        for directory, subdirectories, filenames in os.walk(self.root):
+            subdirectories[:] = [name for name in subdirectories
+                                 if name not in IGNORED_DIRECTORIES and not name.startswith(".")]
+            for filename in filenames:
+                paths.append(os.path.relpath(os.path.join(directory, filename), self.root))
+        return paths
+    
+    def _parse_imports(self, path: str, source: Optional[bytes]) -> Set[str]:
+        """
+        Collect the modules a file imports, including the packages they live in.
+        
+        Args:
+            path (str): Path relative to the root
+            source (Optional[bytes]): The file's content, or None if it could not be read
+        
+        Returns:
+            Set[str]: Dotted module names; names that may be attributes rather than
+                modules are included and simply never match a file
+        """
+        if source is None:
+            return set()
+        try:
+            tree = ast.parse(source, filename=path)
+        except (SyntaxError, ValueError):
+            return set()
+        
+        modules: Set[str] = set()
+        for module, name in parse_imports(tree, path):
+            modules.update(self._with_parents(module))
+            if name is not None:
+                modules.add(f"{module}.{name}")
+        return modules
+    
+    def _with_parents(self, module: str) -> List[str]:
+        """
+        Expand a module name into itself and the packages imported along with it.
+        
+        Args:
+            module (str): Dotted module name
+        
+        Returns:
+            List[str]: For "a.b.c": "a", "a.b" and "a.b.c"
+        """
+        parts = module.split(".")
+        return [".".join(parts[:index]) for index in range(1, len(parts) + 1)]
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the cache file.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: The cached entries, or an empty dict if there are none
+        """
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION or data.get("root") != self.root:
+            return {}
+        return data.get("files", {})
+    
+    def _save(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the cache file atomically.
+        
+        Args:
+            files (Dict[str, Dict[str, Any]]): The entries to store
+        """
+        try:
+            write_json_atomic(self.cache_path, {"version": CACHE_VERSION, "root": self.root, "files": files})
+        except OSError as e:
+            print(f"Error saving test impact cache: {str(e)}")
+
+
+class TestDurations:
+    """Historical run time of every test file, used to balance shards."""
+    
+    __test__ = False  # Not a pytest test class, despite the name
+    
+    def __init__(self, root: str = ".", path: Optional[str] = None):
+        """
+        Initialize the store. The file is read on first use.
+        
+        Args:
+            root (str): Project directory
+            path (str, optional): JSON file the durations are kept in; defaults to a
+                file per project in the state directory
+        """
+        self.path = path or project_cache_path(root, "test_durations")
+        self._durations: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+    
+    def get(self, test_file: str) -> Optional[float]:
+        """
+        Get the last measured duration of a test file.
+        
+        Args:
+            test_file (str): Test file path relative to the project root
+        
+        Returns:
+            Optional[float]: Seconds, or None if the file has never run
+        """
+        with self._lock:
+            return self._load().get(test_file)
+    
+    def update(self, durations: Dict[str, float]) -> None:
+        """
+        Record newly measured durations and save them.
+        
+        Args:
+            durations (Dict[str, float]): Seconds per test file
+        """
+        if not durations:
+            return
+        with self._lock:
+            stored = self._load()
+            stored.update(durations)
+            try:
+                write_json_atomic(self.path, stored)
+            except OSError as e:
+                print(f"Error saving test durations: {str(e)}")
+    
+    def _load(self) -> Dict[str, float]:
+        """
+        Read the durations file once. Caller holds the lock.
+        
+        Returns:
+            Dict[str, float]: Seconds per test file
+        """
+        if self._durations is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self._durations = json.load(file)
+            except (OSError, ValueError):
+                self._durations = {}
+        return self._durations
+
+
+def collect_test_files(root: str, test_paths: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+    """
+    Collect the suite with pytest and group the collected tests by file.
+    
+    Args:
+        root (str): Project directory pytest runs in
+        test_paths (List[str], optional): Restrict collection to these paths
+    
+    Returns:
+        Optional[Dict[str, int]]: Number of tests per test file, in collection order,
+            or None if collection failed
+    """
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *(test_paths or [])],
+        capture_output=True,
+        text=True,
+        cwd=root
+    )
+    if result.returncode != 0:
+        return None
+    
+    counts: Dict[str, int] = {}
+    for line in result.stdout.splitlines():
+        if "::" in line:
+            test_file = os.path.normpath(line.split("::", 1)[0])
+            counts[test_file] = counts.get(test_file, 0) + 1
+    return counts
+
+
+def shard_test_files(test_files: Dict[str, int], shard_count: int,
+                     durations: TestDurations) -> List[List[str]]:
+    """
+    Split test files into shards of similar total duration.
+    
+    Files are placed longest first, each on the currently lightest shard.
+    Files without history are estimated from their number of tests.
+    
+    Args:
+        test_files (Dict[str, int]): Number of tests per test file
+        shard_count (int): Maximum number of shards
+        durations (TestDurations): Historical durations
+    
+    Returns:
+        List[List[str]]: The non-empty shards, each a list of test files
+    """
+    per_test = DEFAULT_TEST_FILE_DURATION / 10
+    estimates = []
+    for test_file, count in test_files.items():
+        duration = durations.get(test_file)
+        estimates.append((duration if duration is not None else per_test * count, test_file))
+    estimates.sort(key=lambda estimate: (-estimate[0], estimate[1]))
+    
+    shards: List[List[str]] = [[] for _ in range(max(1, min(shard_count, len(estimates))))]
+    loads = [(0.0, index) for index in range(len(shards))]
+    for duration, test_file in estimates:
+        load, index = heapq.heappop(loads)
+        shards[index].append(test_file)
+        heapq.heappush(loads, (load + duration, index))
+    return [shard for shard in shards if shard]
+
+
+def pytest_environment() -> Dict[str, str]:
+    """
+    Build the environment pytest runs in, with the Genesis pytest plugins importable.
+    
+    Returns:
+        Dict[str, str]: A copy of the current environment with PYTHONPATH extended
+    """
+    environment = dict(os.environ)
+    paths = [PYTEST_PLUGIN_DIR] + [path for path in environment.get("PYTHONPATH", "").split(os.pathsep) if path]
+    environment["PYTHONPATH"] = os.pathsep.join(paths)
+    return environment
+
+
+def events_plugin_args(events_path: str) -> List[str]:
+    """
+    Build the pytest arguments that load the events plugin.
+    
+    Args:
+        events_path (str): File the plugin writes its JSON lines to
+    
+    Returns:
+        List[str]: The arguments
+    """
+    return ["-p", "genesis_events", f"--genesis-events={events_path}"]
+
+
+class OutputTail:
+    """The last lines of a process's output, bounded in size."""
+    
+    def __init__(self, max_chars: int = MAX_OUTPUT_CHARS):
+        """
+        Initialize an empty tail.
+        
+        Args:
+            max_chars (int): Maximum number of characters kept
+        """
+        self.max_chars = max_chars
+        self._lines: Deque[str] = deque()
+        self._chars = 0
+        self._dropped = 0
+    
+    def append(self, line: str) -> None:
+        """
+        Add a line, dropping the oldest lines once the tail is full.
+        
+        Args:
+            line (str): The line, including its newline
+        """
+        self._lines.append(line)
+        self._chars += len(line)
+        while self._chars > self.max_chars and len(self._lines) > 1:
+            self._chars -= len(self._lines.popleft())
+            self._dropped += 1
+    
+    def last_line(self) -> str:
+        """
+        Get the last non-empty line.
+        
+        Returns:
+            str: The line without its newline, or an empty string
+        """
+        for line in reversed(self._lines):
+            if line.strip():
+                return line.rstrip("\n")
+        return ""
+    
+    def text(self) -> str:
+        """
+        Get the kept output.
+        
+        Returns:
+            str: The lines, preceded by a note if earlier lines were dropped
+        """
+        prefix = f"... ({self._dropped} earlier lines omitted)\n" if self._dropped else ""
+        return prefix + "".join(self._lines)
+
+
+class JsonLinesReader:
+    """Reads the JSON lines appended to a file since the last read."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the reader. The file does not need to exist yet.
+        
+        Args:
+            path (str): The file
+        """
+        self.path = path
+        self._offset = 0
+        self._partial = ""
+    
+    def read_new(self) -> List[Dict[str, Any]]:
+        """
+        Read the complete lines written since the last call.
+        
+        Returns:
+            List[Dict[str, Any]]: The decoded objects; malformed lines are skipped
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                file.seek(self._offset)
+                data = file.read()
+                self._offset = file.tell()
+        except OSError:
+            return []
+        
+        *lines, self._partial = (self._partial + data).split("\n")
+        items = []
+        for line in lines:
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                continue
+        return items
+
+
+class TestRunSummary:
+    """Counts, failures and per-file durations of a test run, built from plugin events."""
+    
+    __test__ = False  # Not a pytest test class, despite the name
+    
+    def __init__(self, max_failures: int = MAX_SUMMARY_FAILURES):
+        """
+        Initialize an empty summary.
+        
+        Args:
+            max_failures (int): Maximum number of failures kept in detail
+        """
+        self.max_failures = max_failures
+        self.counts = {outcome: 0 for outcome in ("passed", "failed", "error", "skipped", "xfailed", "xpassed")}
+        self.failures: List[Dict[str, Any]] = []
+        self.durations: Dict[str, float] = {}
+        self.file_outcomes: Dict[str, Dict[str, int]] = {}
+        self.collected = 0
+        self._lock = threading.Lock()
+    
+    def add(self, event: Dict[str, Any]) -> None:
+        """
+        Account for one plugin event.
+        
+        Args:
+            event (Dict[str, Any]): The event
+        """
+        with self._lock:
+            if event.get("event") == "collected":
+                self.collected += event.get("count", 0)
+            if event.get("event") != "test":
+                return
+            
+            outcome = event.get("outcome", "error")
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+            test_file = os.path.normpath(event["nodeid"].split("::", 1)[0])
+            self.durations[test_file] = self.durations.get(test_file, 0.0) + (event.get("duration") or 0.0)
+            outcomes = self.file_outcomes.setdefault(test_file, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if outcome in ("failed", "error") and len(self.failures) < self.max_failures:
+                self.failures.append({
+                    "test": event["nodeid"],
+                    "file": event.get("file"),
+                    "line": event.get("line"),
+                    "message": event.get("message", ""),
+                    "traceback": event.get("traceback", "")
+                })
+    
+    def passed_files(self) -> Dict[str, int]:
+        """
+        Get the test files none of whose tests failed or errored.
+        
+        Returns:
+            Dict[str, int]: Number of tests per passing test file
+        """
+        with self._lock:
+            return {
+                test_file: sum(outcomes.values())
+                for test_file, outcomes in self.file_outcomes.items()
+                if not outcomes.get("failed") and not outcomes.get("error")
+            }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the summary to a JSON-serializable dict.
+        
+        Returns:
+            Dict[str, Any]: "collected", "total", the count of each outcome, the "failures"
+                and the number of tests in each of the "passed_files"
+        """
+        with self._lock:
+            summary: Dict[str, Any] = {"collected": self.collected, "total": sum(self.counts.values())}
+            summary.update(self.counts)
+            summary["failures"] = list(self.failures)
+            summary["omitted_failures"] = self.counts["failed"] + self.counts["error"] - len(self.failures)
+        summary["passed_files"] = self.passed_files()
+        return summary
+
+
+class TestResultCache:
+    """Passing test files, keyed by a fingerprint of everything they depend on, with LRU eviction."""
+    
+    __test__ = False  # Not a pytest test class, despite the name
+    
+    def __init__(self, root: str = ".", path: Optional[str] = None, max_entries: int = 5000):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+        
+        Args:
+            root (str): Project directory
+            path (str, optional): SQLite database file; defaults to a file per project
+                in the state directory
+            max_entries (int): Number of results kept before the least recently used are evicted
+        """
+        self.path = path or project_cache_path(root, "test_results", ".sqlite3")
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a passing result and mark it as recently used.
+        
+        Args:
+            fingerprint (str): The test file's fingerprint
+        
+        Returns:
+            Optional[Dict[str, Any]]: "test_file" and its number of "tests", or None on a miss
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT test_file, tests FROM test_results WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE test_results SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint))
+            connection.commit()
+            return {"test_file": row[0], "tests": row[1]}
+    
+    def put(self, fingerprint: str, test_file: str, tests: int) -> None:
+        """
+        Remember that a test file passed, evicting the least recently used results if full.
+        
+        Args:
+            fingerprint (str): The test file's fingerprint
+            test_file (str): Test file path relative to the project root
+            tests (int): Number of tests in the file
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO test_results (fingerprint, test_file, tests, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (fingerprint, test_file, tests, time.time())
+            )
+            connection.execute(
+                "DELETE FROM test_results WHERE fingerprint IN ("
+                "SELECT fingerprint FROM test_results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            connection.commit()
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database on first use. Caller holds the lock.
+        
+        Returns:
+            sqlite3.Connection: The open connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS test_results ("
+                "fingerprint TEXT PRIMARY KEY, test_file TEXT NOT NULL, tests INTEGER NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_test_results_last_used ON test_results (last_used)"
+            )
+        return self._connection
+
+
+def format_failures(summary: Dict[str, Any], limit: int = 10) -> str:
+    """
+    Describe a run's failures in a few lines, e.g. for a correction instruction.
+    
+    Args:
+        summary (Dict[str, Any]): A TestRunSummary as a dict
+        limit (int): Maximum number of failures described
+    
+    Returns:
+        str: One line per failure, or an empty string if nothing failed
+    """
+    lines = []
+    for failure in summary.get("failures", [])[:limit]:
+        location = f"{failure['file']}:{failure['line']}" if failure.get("line") else failure.get("file") or ""
+        lines.append(f"{failure['test']} ({location}): {failure['message']}")
+    remaining = len(summary.get("failures", [])) - limit + summary.get("omitted_failures", 0)
+    if remaining > 0:
+        lines.append(f"... and {remaining} more")
+    return "\n".join(lines)
+
+
+class PytestForkServer:
+    """A warm pytest process for one project that forks a child per test run."""
+    
+    def __init__(self, root: str = ".", preload: Optional[Iterable[str]] = None):
+        """
+        Initialize the client. The server process is started on the first run.
+        
+        Args:
+            root (str): Project directory pytest runs in
+            preload (Iterable[str], optional): Modules imported once by the server, in
+                addition to pytest and its plugins; defaults to the comma-separated
+                GENESIS_PRELOAD_MODULES, or DEFAULT_PRELOAD_MODULES if it is unset
+        """
+        if preload is None:
+            configured = os.environ.get("GENESIS_PRELOAD_MODULES")
+            preload = DEFAULT_PRELOAD_MODULES if configured is None else configured.split(",")
+        self.root = os.path.abspath(root)
+        self.preload = [name.strip() for name in preload if name.strip()]
+        self.preload_time: Optional[float] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Check whether the platform can fork.
+        
+        Returns:
+            bool: True on POSIX systems
+        """
+        return hasattr(os, "fork")
+    
+    def run(self, args: List[str], on_output: Optional[Callable[[str], None]] = None,
+            on_poll: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """
+        Run pytest with the given arguments in a freshly forked child.
+        
+        Args:
+            args (List[str]): Command line arguments for pytest
+            on_output (Callable[[str], None], optional): Called with each line of output
+                as soon as it is written
+            on_poll (Callable[[], None], optional): Called regularly while the child runs
+        
+        Returns:
+            Dict[str, Any]: "returncode", "output", the "timing" of the run ("startup" from
+                request to pytest starting, "execution" inside pytest and "total") and the
+                "purged_modules" that were re-imported because they changed
+        """
+        with self._lock:
+            self._ensure_started()
+            with tempfile.TemporaryDirectory(prefix="genesis-pytest-") as run_dir:
+                output_path = os.path.join(run_dir, "output.txt")
+                result_path = os.path.join(run_dir, "result.json")
+                open(output_path, "w").close()
+                
+                try:
+                    self._process.stdin.write(json.dumps({
+                        "args": args,
+                        "output": output_path,
+                        "result": result_path
+                    }) + "\n")
+                    self._process.stdin.flush()
+                    response, output = self._wait_for_response(output_path, on_output, on_poll)
+                except (OSError, ValueError) as e:
+                    self._stop()
+                    raise RuntimeError(f"The pytest fork server stopped unexpectedly: {str(e)}")
+                
+                try:
+                    with open(result_path, "r", encoding="utf-8") as file:
+                        child = json.load(file)
+                except (OSError, ValueError):
+                    child = {}
+        
+        return {
+            "returncode": response["returncode"],
+            "output": output,
+            "timing": {
+                "startup": child.get("startup_time"),
+                "execution": child.get("execution_time"),
+                "total": response["total_time"]
+            },
+            "purged_modules": child.get("purged_modules", [])
+        }
+    
+    def stop(self) -> None:
+        """Stop the server process."""
+        with self._lock:
+            self._stop()
+    
+    def _ensure_started(self) -> None:
+        """Start the server if it is not running and wait until it has preloaded. Caller holds the lock."""
+        if self._process is not None and self._process.poll() is None:
+            return
+        
+        self._process = subprocess.Popen(
+            [sys.executable, FORK_SERVER_SCRIPT, *self.preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=self.root,
+            env=pytest_environment()
+        )
+        ready = self._process.stdout.readline()
+        if not ready:
+            self._stop()
+            raise RuntimeError("The pytest fork server failed to start")
+        self.preload_time = json.loads(ready)["preload_time"]
+    
+    def _wait_for_response(self, output_path: str, on_output: Optional[Callable[[str], None]],
+                           on_poll: Optional[Callable[[], None]]) -> Tuple[Dict[str, Any], str]:
+        """
+        Wait for the server's response, forwarding output lines while the child runs.
+        
+        Args:
+            output_path (str): File the child writes its output to
+            on_output (Callable[[str], None], optional): Called with each line of output
+            on_poll (Callable[[], None], optional): Called on every poll
+        
+        Returns:
+            Tuple[Dict[str, Any], str]: The server's response and the end of the child's output
+        """
+        tail = OutputTail()
+        pending = ""
+        with open(output_path, "r", encoding="utf-8", errors="replace") as output:
+            while True:
+                readable, _, _ = select.select([self._process.stdout], [], [], 0.05)
+                data = output.read()
+                if data:
+                    *lines, pending = (pending + data).split("\n")
+                    for line in lines:
+                        tail.append(line + "\n")
+                        if on_output is not None:
+                            on_output(line)
+                if on_poll is not None:
+                    on_poll()
+                if readable:
+                    response = self._process.stdout.readline()
+                    if not response:
+                        raise OSError("connection closed")
+                    break
+            
+            for line in (pending + output.read()).split("\n"):
+                if line:
+                    tail.append(line + "\n")
+                    if on_output is not None:
+                        on_output(line)
+        return json.loads(response), tail.text()
+    
+    def _stop(self) -> None:
+        """Stop the server process. Caller holds the lock."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+
+_fork_servers: Dict[str, PytestForkServer] = {}
+_fork_servers_lock = threading.Lock()
+
+
+def get_fork_server(root: str) -> PytestForkServer:
+    """
+    Get the shared fork server of a project, so it stays warm across TestingAgents.
+    
+    Args:
+        root (str): Project directory
+    
+    Returns:
+        PytestForkServer: The server for that directory
+    """
+    with _fork_servers_lock:
+        key = os.path.abspath(root)
+        if key not in _fork_servers:
+            _fork_servers[key] = PytestForkServer(key)
+        return _fork_servers[key]
+
+
+@atexit.register
+def _stop_fork_servers() -> None:
+    """Stop every fork server when the interpreter exits."""
+    for server in list(_fork_servers.values()):
+        server.stop()
\ No newline at end of file
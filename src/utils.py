@@ -2,27 +2,199 @@
 Utility functions for the Genesis AI Framework.
 """
 
-def calculate_factorial(n: int) -> int:
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+# Below this many factors a product is multiplied out in a plain loop
+PRODUCT_LOOP_THRESHOLD = 16
+
+# Default budget of a FactorialMemo, in bytes of memoized values
+DEFAULT_MEMO_BYTES = 64 * 1024 * 1024
+
+
+class FactorialMemo:
+    """Bounded table of computed factorials, used as starting points for larger ones."""
+    
+    def __init__(self, max_bytes: int = DEFAULT_MEMO_BYTES):
+        """
+        Initialize an empty table.
+        
+        Args:
+            max_bytes (int): Size of the memoized values beyond which the least
+                recently used are dropped
+        """
+        self.max_bytes = max_bytes
+        self._values: "OrderedDict[int, int]" = OrderedDict()
+        self._bytes = 0
+    
+    def nearest(self, n: int) -> Tuple[int, int]:
+        """
+        Find the largest memoized factorial not above n.
+        
+        Args:
+            n (int): A non-negative integer
+        
+        Returns:
+            Tuple[int, int]: m and m!, or (0, 1) if nothing useful is memoized
+        """
+        best = max((m for m in self._values if m <= n), default=None)
+        if best is None:
+            return 0, 1
+        self._values.move_to_end(best)
+        return best, self._values[best]
+    
+    def remember(self, n: int, value: int) -> None:
+        """
+        Memoize n! and drop the least recently used values beyond the budget.
+        
+        Args:
+            n (int): A non-negative integer
+            value (int): n!
+        """
+        size = value.bit_length() // 8 + 1
+        if n in self._values or size > self.max_bytes:
+            return
+        self._values[n] = value
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, dropped = self._values.popitem(last=False)
+            self._bytes -= dropped.bit_length() // 8 + 1
+    
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def calculate_factorial(n: int, memo: Optional[FactorialMemo] = None) -> int:
     """
     Calculate the factorial of a non-negative integer.
     
+    The odd part of n! is built from products of odd numbers by binary
+    splitting, so the multiplications are between numbers of similar size,
+    and the power of two is applied with a single shift.
+    
     Args:
         n (int): A non-negative integer
-        
+        memo (FactorialMemo, optional): Table of known factorials to start from
+            and to record the result in
+    
     Returns:
         int: The factorial of n
-        
+    
     Raises:
         ValueError: If n is negative
     """
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers")
+
+    if memo is not None:
+        start, value = memo.nearest(n)
+        if start > 0 and n - start <= start:
+            result = value * _range_product(start, n)
+        else:
+            result = _factorial(n)
+        memo.remember(n, result)
+        return result
+    
+    return _factorial(n)
+
+
+def factorials(ns: Iterable[int], memo: Optional[FactorialMemo] = None) -> List[int]:
+    """
+    Calculate the factorials of many non-negative integers.
+    
+    The inputs are handled in increasing order, and each factorial is extended
+    from the previous one when that is cheaper than computing it from scratch.
+    
+    Args:
+        ns (Iterable[int]): Non-negative integers, in any order and possibly repeated
+        memo (FactorialMemo, optional): Table of known factorials to start from
+            and to record the results in
+    
+    Returns:
+        List[int]: The factorial of every input, in input order
+    
+    Raises:
+        ValueError: If any input is negative
+    """
+    ns = list(ns)
+    if any(n < 0 for n in ns):
+        raise ValueError("Factorial is not defined for negative numbers")
     
-    if n == 0 or n == 1:
-        return 1
+    results = {}
+    previous, value = memo.nearest(min(ns)) if memo is not None and ns else (0, 1)
+    for n in sorted(set(ns)):
+        if previous > 0 and n - previous <= previous:
+            value *= _range_product(previous, n)
+        else:
+            value = _factorial(n)
+        previous = n
+        results[n] = value
+        if memo is not None:
+            memo.remember(n, value)
+    return [results[n] for n in ns]
+
+
+def _factorial(n: int) -> int:
+    """
+    Calculate n! as its odd part shifted by its power of two.
     
-    result = 1
-    for i in range(2, n + 1):
-        result *= i
+    The odd part of n! is the product, over k >= 0, of the odd numbers in
+    (n >> (k + 1), n >> k] raised to the power k + 1. Walking k downwards,
+    each level's product is folded into the running inner product, which is
+    folded into the result.
     
-    return result
+    Args:
+        n (int): A non-negative integer
+    
+    Returns:
+        int: The factorial of n
+    """
+    inner = outer = 1
+    for shift in range(n.bit_length() - 1, -1, -1):
+        # Odd numbers in (n >> (shift + 1), n >> shift]
+        low = ((n >> (shift + 1)) + 1) | 1
+        high = ((n >> shift) + 1) | 1
+        inner *= _odd_product(low, high)
+        outer *= inner
+    return outer << (n - bin(n).count("1"))
+
+
+def _odd_product(low: int, high: int) -> int:
+    """
+    Multiply the odd numbers in [low, high) by binary splitting.
+    
+    Args:
+        low (int): First factor; odd
+        high (int): Bound past the last factor; odd
+    
+    Returns:
+        int: The product, 1 if the range is empty
+    """
+    count = (high - low) // 2
+    if count < PRODUCT_LOOP_THRESHOLD:
+        result = 1
+        for factor in range(low, high, 2):
+            result *= factor
+        return result
+    middle = (low + count) | 1
+    return _odd_product(low, middle) * _odd_product(middle, high)
+
+
+def _range_product(low: int, high: int) -> int:
+    """
+    Multiply the integers in (low, high] by binary splitting.
+    
+    Args:
+        low (int): Bound below the first factor
+        high (int): Last factor
+    
+    Returns:
+        int: The product, 1 if the range is empty
+    """
+    if high - low < PRODUCT_LOOP_THRESHOLD:
+        result = 1
+        for factor in range(low + 1, high + 1):
+            result *= factor
+        return result
+    middle = (low + high) // 2
+    return _range_product(low, middle) * _range_product(middle, high)
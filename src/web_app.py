@@ -6,14 +6,51 @@ and allows users to interact with the Genesis AI system through a web UI.
 """
 
 import json
-from typing import Dict, Any
-from flask import Flask, request, jsonify, render_template_string
+import os
+import threading
+from typing import Dict, Any, Optional
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context
 
-# Import our agents
-from src.agents.orchestrator_agent import orchestrator_agent
+# The orchestrator is created through the registry on first use, not on import
+from src.agents.registry import registry
+from src.event_bus import event_bus
+from src.task_queue import TaskQueue, TaskQueueFullError, FINISHED_STATUSES
 
 app = Flask(__name__)
 
+# Seconds between keep-alive comments on idle event streams
+EVENT_STREAM_KEEPALIVE = 5
+
+# Largest page of task history a single request may ask for
+MAX_HISTORY_PAGE_SIZE = 200
+
+# The task queue, created with the orchestrator by the first request that needs it
+_task_queue: Optional[TaskQueue] = None
+_task_queue_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """
+    Get the task queue, creating it and the orchestrator on first use.
+    
+    Tasks run on a worker pool so requests return immediately with a job id.
+    Without worktrees agents share the working directory, so by default the pool
+    only runs as many tasks at once as the orchestrator can isolate.
+    
+    Returns:
+        TaskQueue: The queue
+    """
+    global _task_queue
+    with _task_queue_lock:
+        if _task_queue is None:
+            orchestrator_agent = registry.get("orchestrator_agent")
+            _task_queue = TaskQueue(
+                lambda job: orchestrator_agent.receive_task(job.task, should_stop=job.is_cancelled, task_id=job.id),
+                max_workers=int(os.environ.get("GENESIS_TASK_WORKERS", orchestrator_agent.max_concurrent_tasks)),
+                max_pending=int(os.environ.get("GENESIS_TASK_MAX_PENDING", "1000"))
+            )
+        return _task_queue
+
 # Simple HTML template for the web interface
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -53,7 +90,7 @@ HTML_TEMPLATE = """
             <div id="taskHistory"></div>
         </div>
     </div>
-
+    
     <script>
         document.getElementById('taskForm').addEventListener('submit', function(e) {
             e.preventDefault();
@@ -75,22 +112,90 @@ HTML_TEMPLATE = """
             })
             .then(response => response.json())
             .then(data => {
-                document.getElementById('resultContent').textContent = JSON.stringify(data, null, 2);
-                updateTaskHistory();
+                if (data.job_id && window.EventSource) {
+                    streamJob(data.job_id);
+                } else if (data.job_id) {
+                    pollJob(data.job_id);
+                } else {
+                    document.getElementById('resultContent').textContent = JSON.stringify(data, null, 2);
+                }
             })
             .catch(error => {
                 document.getElementById('resultContent').textContent = 'Error: ' + error;
             });
         });
         
+        function streamJob(jobId) {
+            const resultContent = document.getElementById('resultContent');
+            const source = new EventSource('/api/task/' + jobId + '/events');
+            resultContent.textContent = '';
+            
+            function log(text) {
+                resultContent.textContent += text + '\\n';
+            }
+            
+            source.addEventListener('step_started', e => {
+                const data = JSON.parse(e.data).data;
+                log('[step ' + (data.step + 1) + '] ' + data.agent + ': ' + data.instruction);
+            });
+            source.addEventListener('step_finished', e => {
+                const data = JSON.parse(e.data).data;
+                log('[step ' + (data.step + 1) + '] ' + (data.success ? 'done' : 'failed'));
+            });
+            source.addEventListener('test_output', e => log(JSON.parse(e.data).data.line));
+            source.addEventListener('test_result', e => {
+                const data = JSON.parse(e.data).data;
+                const summary = data.summary;
+                if (!summary) {
+                    log('[tests] ' + (data.success ? 'passed' : 'failed'));
+                    return;
+                }
+                log('[tests] ' + summary.passed + ' passed, ' + summary.failed + ' failed, ' +
+                    summary.error + ' errors, ' + summary.skipped + ' skipped');
+                summary.failures.forEach(failure => {
+                    log('  FAILED ' + failure.test + ' (' + failure.file + ':' + failure.line + ') ' + failure.message);
+                });
+            });
+            source.addEventListener('git_result', e => {
+                const data = JSON.parse(e.data).data;
+                log('[git] ' + data.operation + ': ' + JSON.stringify(data.result !== undefined ? data.result : data.success));
+            });
+            source.addEventListener('task_completed', e => {
+                source.close();
+                log('\\nResult:\\n' + JSON.stringify(JSON.parse(e.data).data.result, null, 2));
+                updateTaskHistory();
+            });
+            source.onerror = () => {
+                source.close();
+                pollJob(jobId);
+            };
+        }
+        
+        function pollJob(jobId) {
+            fetch('/api/task/' + jobId)
+            .then(response => response.json())
+            .then(job => {
+                if (job.status === 'queued' || job.status === 'running') {
+                    document.getElementById('resultContent').textContent = 'Task ' + job.status + '...';
+                    setTimeout(function() { pollJob(jobId); }, 1000);
+                    return;
+                }
+                document.getElementById('resultContent').textContent = JSON.stringify(job.result || job, null, 2);
+                updateTaskHistory();
+            })
+            .catch(error => {
+                document.getElementById('resultContent').textContent = 'Error: ' + error;
+            });
+        }
+        
         function updateTaskHistory() {
-            fetch('/api/history')
+            fetch('/api/history?limit=20')
             .then(response => response.json())
             .then(data => {
                 const historyDiv = document.getElementById('taskHistory');
                 historyDiv.innerHTML = '';
                 
-                data.forEach(task => {
+                data.items.forEach(task => {
                     const taskDiv = document.createElement('div');
                     taskDiv.className = 'task-item';
                     taskDiv.innerHTML = '<strong>Task:</strong> ' + task.task + '<br><strong>Status:</strong> ' + task.status;
@@ -116,7 +221,7 @@ def index():
 
 @app.route('/api/task', methods=['POST'])
 def execute_task():
-    """Execute a task using the OrchestratorAgent."""
+    """Queue a task for the OrchestratorAgent and return its job id."""
     try:
         data = request.get_json()
         task = data.get('task', '')
@@ -124,18 +229,102 @@ def execute_task():
         if not task:
             return jsonify({'error': 'No task provided'}), 400
         
-        # Use the orchestrator agent to process the task
-        result = orchestrator_agent.receive_task(task)
+        # Queue the task; a worker hands it to the orchestrator agent
+        job = get_task_queue().submit(task)
         
-        return jsonify(result)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
+    except TaskQueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/task/<job_id>')
+def get_task(job_id):
+    """Get the status and result of a queued task."""
+    job = get_task_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/task/<job_id>/cancel', methods=['POST'])
+def cancel_task(job_id):
+    """Cancel a queued or running task."""
+    job = get_task_queue().cancel(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/task/<job_id>/events')
+def stream_task_events(job_id):
+    """Stream a task's progress as Server-Sent Events until it completes."""
+    if get_task_queue().get(job_id) is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    
+    subscription = event_bus.subscribe(task_id=job_id)
+    
+    def generate():
+        try:
+            while True:
+                event = subscription.get(timeout=EVENT_STREAM_KEEPALIVE)
+                if event is None:
+                    # Jobs cancelled before they start never publish a completion event
+                    job = get_task_queue().get(job_id)
+                    if job is None or job.status in FINISHED_STATUSES:
+                        result = job.to_dict() if job else None
+                        yield _format_sse({'type': 'task_completed', 'task_id': job_id, 'data': {'result': result}})
+                        return
+                    yield ': keep-alive\n\n'
+                    continue
+                
+                yield _format_sse(event)
+                if event['type'] == 'task_completed':
+                    return
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/events')
+def stream_events():
+    """Stream progress events for all tasks as Server-Sent Events."""
+    subscription = event_bus.subscribe(replay=False)
+    
+    def generate():
+        try:
+            while True:
+                event = subscription.get(timeout=EVENT_STREAM_KEEPALIVE)
+                yield _format_sse(event) if event is not None else ': keep-alive\n\n'
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message."""
+    lines = []
+    if 'id' in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
 @app.route('/api/history')
 def get_task_history():
-    """Get the task history from the OrchestratorAgent."""
+    """Get one page of task history from the OrchestratorAgent."""
     try:
-        return jsonify(orchestrator_agent.task_history)
+        success = request.args.get('success')
+        page = registry.get("orchestrator_agent").task_history.page(
+            cursor=request.args.get('cursor'),
+            limit=min(request.args.get('limit', 50, type=int), MAX_HISTORY_PAGE_SIZE),
+            status=request.args.get('status'),
+            query=request.args.get('q'),
+            success=None if success is None else success.lower() in ('1', 'true', 'yes')
+        )
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid history request: {e}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
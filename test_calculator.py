@@ -22,7 +22,7 @@ def main():
     
     # Print task history
     print("\nTask History:")
-    for task in orchestrator_agent.task_history:
+    for task in orchestrator_agent.task_history.page()["items"]:
         print(f"Task: {task.get('task', 'N/A')}")
         print(f"Status: {task.get('status', 'N/A')}")
         if 'result' in task:
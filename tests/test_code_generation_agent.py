@@ -0,0 +1,76 @@
+"""
+Test cases for batched code generation.
+"""
+
+from src.agents.code_generation_agent import CodeGenerationAgent
+from src.agents.file_system_agent import FileSystemAgent
+from src.agents.orchestrator_agent import OrchestratorAgent
+
+
+def test_batch_deduplicates_and_writes_once(tmp_path):
+    """Test that a batch generates each distinct instruction once and writes all files together."""
+    file_system = FileSystemAgent(str(tmp_path))
+    agent = CodeGenerationAgent(file_system)
+    writes = []
+    write_files = file_system.write_files
+    file_system.write_files = lambda files: writes.append(sorted(files)) or write_files(files)
+    
+    result = agent.execute_batch([
+        "Write a Python function calculate_factorial in the file src/utils.py.",
+        "Write a Python function  calculate_factorial in the file src/utils.py.",
+        "Write a pytest test case in tests/test_utils.py to verify calculate_factorial.",
+        "Explain the architecture.",
+    ])
+    assert result["success"]
+    assert [entry["path"] for entry in result["results"]] == ["src/utils.py", "tests/test_utils.py", None]
+    assert writes == [["src/utils.py", "tests/test_utils.py"]]
+    assert sorted(file_system.touched_paths()) == ["src/utils.py", "tests/test_utils.py"]
+    
+    assert agent.execute_batch(["Write a Python function calculate_factorial in the file src/utils.py."])["unchanged"] == ["src/utils.py"]
+
+
+def test_batch_reports_conflicting_files(tmp_path):
+    """Test that two instructions generating different content for one file are reported."""
+    agent = CodeGenerationAgent(FileSystemAgent(str(tmp_path)))
+    agent.router.register("other_utils", "other utils", handler=lambda: ("src/utils.py", "OTHER = 1\n"))
+    
+    result = agent.execute_batch([
+        "Write a Python function calculate_factorial in the file src/utils.py.",
+        "Write other utils.",
+    ])
+    assert not result["success"]
+    assert "different content" in result["errors"]["src/utils.py"]
+    assert [entry["success"] for entry in result["results"]] == [True, False]
+
+
+def test_orchestrator_merges_consecutive_code_generation_steps(tmp_path):
+    """Test that runs of code generation steps become one batch step."""
+    orchestrator = OrchestratorAgent(history_path=str(tmp_path / "history.sqlite3"))
+    steps = orchestrator._create_meta_plan("Create a new agent")["steps"]
+    
+    batched = orchestrator._batch_code_generation_steps(steps)
+    assert [step["agent"] for step in batched] == ["file_system", "code_generation", "testing"]
+    assert batched[1]["instructions"] == [step["instruction"] for step in steps[1:4]]
+    assert batched[1]["targets"] == ["requirements.txt", "src/agents/api_agent.py", "tests/test_api_agent.py"]
+    
+    steps[2]["depends_on"] = [1]
+    assert orchestrator._batch_code_generation_steps(steps) == steps
+
+
+def test_orchestrator_keeps_steps_on_the_same_file_in_order(tmp_path):
+    """Test that a step editing a file the current batch writes starts a new batch."""
+    orchestrator = OrchestratorAgent(history_path=str(tmp_path / "history.sqlite3"))
+    steps = [
+        {"agent": "code_generation", "instruction": "Create src/utils.py with a helper"},
+        {"agent": "code_generation", "instruction": "Create tests/test_utils.py for it"},
+        {"agent": "code_generation", "instruction": "Add calculate_factorial to src/utils.py"},
+        {"agent": "code_generation", "instruction": "Create src/other.py"}
+    ]
+    
+    batched = orchestrator._batch_code_generation_steps(steps)
+    assert [step["instructions"] for step in batched] == [
+        [steps[0]["instruction"], steps[1]["instruction"]],
+        [steps[2]["instruction"], steps[3]["instruction"]]
+    ]
+    assert [step["targets"] for step in batched] == [["src/utils.py", "tests/test_utils.py"],
+                                                     ["src/other.py", "src/utils.py"]]
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Test cases for the event bus.
+"""
+
+import threading
+from src.event_bus import EventBus
+
+
+def test_publish_and_subscribe():
+    """Test that subscribers receive matching events in order."""
+    bus = EventBus()
+    everything = bus.subscribe()
+    only_one = bus.subscribe(task_id="task-1")
+    
+    bus.publish("step_started", task_id="task-1", step=0)
+    bus.publish("step_started", task_id="task-2", step=0)
+    
+    assert everything.get(timeout=1)["task_id"] == "task-1"
+    assert everything.get(timeout=1)["task_id"] == "task-2"
+    assert only_one.get(timeout=1)["data"] == {"step": 0}
+    assert only_one.get(timeout=0.01) is None
+
+
+def test_replay_and_unsubscribe():
+    """Test that late subscribers get recent events and unsubscribed ones get nothing."""
+    bus = EventBus(replay_size=2)
+    bus.publish("task_started", task_id="task-1")
+    bus.publish("test_output", task_id="task-1", line="first")
+    bus.publish("test_output", task_id="task-1", line="second")
+    
+    late = bus.subscribe(task_id="task-1")
+    assert [late.get(timeout=1)["data"]["line"] for _ in range(2)] == ["first", "second"]
+    
+    bus.unsubscribe(late)
+    bus.publish("task_completed", task_id="task-1")
+    assert late.get(timeout=0.01) is None
+
+
+def test_slow_subscriber_drops_events():
+    """Test that a full subscriber queue drops events instead of blocking."""
+    bus = EventBus(max_queued=1)
+    subscription = bus.subscribe()
+    bus.publish("test_output", line="kept")
+    bus.publish("test_output", line="dropped")
+    
+    assert subscription.dropped == 1
+    assert subscription.get(timeout=1)["data"]["line"] == "kept"
+
+
+def test_concurrent_publishers_deliver_in_id_order():
+    """Test that events from concurrent publishers reach subscribers in id order."""
+    bus = EventBus(max_queued=10000)
+    subscription = bus.subscribe()
+    threads = [threading.Thread(target=lambda: [bus.publish("test_output") for _ in range(500)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    ids = [subscription.get(timeout=1)["id"] for _ in range(2000)]
+    assert ids == sorted(ids)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Test cases for the file system tools.
+"""
+
+import os
+import pytest
+from src.agents.file_system_agent import FileSystemAgent
+from src.tools import file_system_tools
+from src.tools.file_system_tools import FileHashStore, FileReadCache, atomic_write, atomic_write_batch
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    """Test that writing the same content again keeps the file's modification time."""
+    path = str(tmp_path / "module.py")
+    hashes = FileHashStore()
+    assert atomic_write(path, b"VALUE = 1\n", hashes)
+    os.utime(path, ns=(0, 10 ** 9))
+    
+    assert not atomic_write(path, b"VALUE = 1\n", hashes)
+    assert os.stat(path).st_mtime_ns == 10 ** 9
+    assert atomic_write(path, b"VALUE = 2\n", hashes)
+    assert open(path).read() == "VALUE = 2\n"
+    assert os.listdir(tmp_path) == ["module.py"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX-specific")
+def test_new_files_honor_the_umask_and_existing_files_keep_their_mode(tmp_path, monkeypatch):
+    """Test that new files get 0o666 less the umask and rewrites keep the existing mode."""
+    monkeypatch.setattr(file_system_tools, "_umask_value", 0o077)
+    path = str(tmp_path / "new.py")
+    assert atomic_write(path, b"VALUE = 1\n")
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    
+    os.chmod(path, 0o755)
+    assert atomic_write(path, b"VALUE = 2\n")
+    assert os.stat(path).st_mode & 0o777 == 0o755
+    
+    monkeypatch.setattr(file_system_tools, "_umask_value", None)
+    umask = os.umask(0o022)
+    os.umask(umask)
+    assert atomic_write(str(tmp_path / "other.py"), b"")
+    assert os.stat(tmp_path / "other.py").st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_batch_is_not_renamed_when_a_file_fails(tmp_path):
+    """Test that a failing file in a batch leaves every destination untouched."""
+    (tmp_path / "a.py").write_text("old\n")
+    (tmp_path / "blocker").write_text("")
+    
+    result = atomic_write_batch({str(tmp_path / "a.py"): b"new\n", str(tmp_path / "blocker" / "b.py"): b"x\n"})
+    assert not result["success"]
+    assert result["written"] == []
+    assert str(tmp_path / "blocker" / "b.py") in result["errors"]
+    assert (tmp_path / "a.py").read_text() == "old\n"
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "blocker"]
+
+
+def test_agent_reports_only_changed_files(tmp_path):
+    """Test that the FileSystemAgent rewrites only changed files but marks all written files as touched."""
+    agent = FileSystemAgent(str(tmp_path))
+    assert agent.write_to_file("pkg/core.py", "VALUE = 1\n")
+    agent.pop_touched_paths()
+    
+    result = agent.write_files({"pkg/core.py": "VALUE = 1\n", "pkg/helpers.py": "HELP = 2\n"})
+    assert result["success"]
+    assert result["written"] == ["pkg/helpers.py"]
+    assert result["unchanged"] == ["pkg/core.py"]
+    assert agent.write_to_file("pkg/helpers.py", "HELP = 2\n")
+    # An unchanged file may still hold changes that were never committed
+    assert agent.touched_paths() == ["pkg/core.py", "pkg/helpers.py"]
+
+
+def test_read_cache_follows_changes_and_budget(tmp_path):
+    """Test that cached contents are reused until the file changes and stay within budget."""
+    cache = FileReadCache(max_bytes=40)
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    first.write_bytes(b"a" * 10)
+    second.write_bytes(b"b" * 10)
+    
+    assert cache.read(str(first)) == b"a" * 10
+    assert cache.read(str(first)) == b"a" * 10
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    first.write_bytes(b"c" * 9)
+    assert cache.read(str(first)) == b"c" * 9
+    cache.read(str(second))
+    (tmp_path / "third.txt").write_bytes(b"d" * 10)
+    cache.read(str(tmp_path / "third.txt"))
+    assert cache._size <= 40
+
+
+@pytest.mark.parametrize("mmap_threshold", [1, 1024 * 1024])
+def test_ranges_are_read_with_and_without_mmap(tmp_path, mmap_threshold):
+    """Test that line and byte ranges are the same whether or not the file is mapped."""
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"one\ntwo\nthree\nfour")
+    cache = FileReadCache(mmap_threshold=mmap_threshold)
+    
+    assert cache.read_lines(str(path), 2, 3) == (b"two\nthree\n", 3)
+    assert cache.read_lines(str(path), 3) == (b"three\nfour", 4)
+    assert cache.read_lines(str(path), 9) == (b"", 8)
+    assert cache.read_range(str(path), 4, 3) == b"two"
+
+
+def test_agent_reports_read_errors_separately(tmp_path):
+    """Test that the FileSystemAgent returns read errors apart from content."""
+    agent = FileSystemAgent(str(tmp_path))
+    agent.write_to_file("notes.txt", "first\nsecond\n")
+    
+    result = agent.read_file_range("notes.txt", start_line=2)
+    assert result == {"success": True, "content": "second\n", "size": 13, "start_line": 2, "end_line": 2}
+    assert agent.write_to_file("notes.txt", "first\nchanged\n")
+    assert agent.read_file("notes.txt") == "first\nchanged\n"
+    
+    missing = agent.read_file_range("missing.txt")
+    assert not missing["success"] and "No such file" in missing["error"]
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a tree with .gitignore rules, a virtualenv and version control files."""
+    files = {
+        ".gitignore": "*.log\nbuild/\n/top.txt\n!keep.log\ndocs/**/draft*\n",
+        "app.py": "",
+        "top.txt": "",
+        "error.log": "",
+        "keep.log": "",
+        "build/output.py": "",
+        "docs/guide/draft1.md": "",
+        "docs/guide/final.md": "",
+        "pkg/top.txt": "",
+        "pkg/.gitignore": "generated_*.py\n",
+        "pkg/generated_models.py": "",
+        "pkg/models.py": "",
+        "env/pyvenv.cfg": "",
+        "env/lib/site.py": "",
+        ".git/HEAD": "",
+        "__pycache__/app.pyc": "",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+def test_walk_honors_ignore_rules(tree):
+    """Test that the walk skips ignored files, virtualenvs and version control directories."""
+    agent = FileSystemAgent(str(tree))
+    expected = [".gitignore", "app.py", "docs/guide/final.md", "keep.log", "pkg/.gitignore", "pkg/models.py", "pkg/top.txt"]
+    
+    assert sorted(entry.path for entry in agent.walk()) == expected
+    assert sorted(entry.path for entry in agent.walk(workers=4)) == expected
+    assert "build/output.py" in [entry.path for entry in agent.walk(use_gitignore=False)]
+    assert sorted(entry.path for entry in agent.walk("pkg")) == [".gitignore", "models.py", "top.txt"]
+    
+    directories = [entry.path for entry in agent.walk(include_dirs=True) if entry.is_dir]
+    assert directories == ["docs", "pkg", "docs/guide"]
+    assert next(agent.walk()).stat().st_size == len("*.log\nbuild/\n/top.txt\n!keep.log\ndocs/**/draft*\n")
\ No newline at end of file
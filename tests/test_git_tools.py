@@ -0,0 +1,146 @@
+"""
+Test cases for the git tools.
+"""
+
+import os
+import subprocess
+import pytest
+from src.agents.git_agent import GitAgent
+from src.tools.git_tools import GitRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one commit."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "test")
+    (tmp_path / "README.md").write_text("test\n")
+    git("add", ".")
+    git("commit", "-qm", "initial")
+    git("branch", "feature/packed")
+    git("pack-refs", "--all")
+    git("branch", "feature/loose")
+    return tmp_path
+
+
+def test_repository_discovery_is_cached(repo):
+    """Test that the repository is discovered with a single git process."""
+    repository = GitRepository(str(repo))
+    assert repository.is_repository()
+    assert repository.is_repository()
+    assert repository.spawn_count == 1
+    assert not GitRepository(str(repo.parent)).is_repository()
+
+
+def test_refs_are_read_without_git(repo):
+    """Test branch and HEAD resolution from loose and packed refs."""
+    repository = GitRepository(str(repo))
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True).stdout.strip()
+    
+    assert repository.head_commit() == head
+    assert repository.current_branch() == "main"
+    assert repository.branch_exists("feature/packed")
+    assert repository.branch_exists("feature/loose")
+    assert not repository.branch_exists("feature/missing")
+    assert repository.spawn_count == 1
+
+
+def test_git_agent_uses_one_process_per_operation(repo):
+    """Test that branch, stage and commit each start exactly one git process."""
+    agent = GitAgent(str(repo))
+    agent.create_new_branch("feature/new")
+    assert agent.repository.spawn_count == 2
+    
+    (repo / "new.py").write_text("VALUE = 1\n")
+    assert agent.add_all_changes_to_staging()
+    assert agent.commit_changes("feat: Add new module")
+    assert agent.create_new_branch("feature/loose") == "Switched to existing branch: feature/loose"
+    assert agent.repository.spawn_count == 5
+
+def test_stage_paths_stages_only_written_files(repo, monkeypatch):
+    """Test that only the files written through the FileSystemAgent are staged, minus ignored ones."""
+    from src.agents.file_system_agent import FileSystemAgent
+    
+    monkeypatch.chdir(repo)
+    file_system = FileSystemAgent()
+    agent = GitAgent(str(repo))
+    
+    (repo / ".gitignore").write_text("*.log\n")
+    (repo / "untouched.py").write_text("VALUE = 0\n")
+    file_system.write_to_file("src/written.py", "VALUE = 1\n")
+    file_system.write_to_file("debug.log", "noise\n")
+    (repo / "README.md").unlink()
+    file_system._record_touched("README.md")
+    
+    paths = file_system.pop_touched_paths()
+    assert paths == ["README.md", "debug.log", "src/written.py"]
+    assert file_system.pop_touched_paths() == []
+    assert agent.stage_paths(paths)
+    
+    status = subprocess.run(["git", "status", "--porcelain"], cwd=repo, capture_output=True, text=True).stdout
+    assert "D  README.md" in status
+    assert "A  src/written.py" in status
+    assert "?? untouched.py" in status
+    assert "debug.log" not in status
+
+def test_worktree_pool_leases_isolated_trees(repo):
+    """Test that leased worktrees are separate and recycled clean."""
+    from src.tools.git_tools import WorktreePool
+    
+    pool = WorktreePool(str(repo), str(repo.parent / "worktrees"), max_size=2)
+    pool.warm(1)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first != second
+    
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    
+    # Work done in one worktree is invisible to the other and to the main tree
+    agent = GitAgent(first)
+    agent.create_new_branch("feature/isolated")
+    with open(f"{first}/scratch.py", "w") as file:
+        file.write("VALUE = 1\n")
+    assert not (repo / "scratch.py").exists()
+    
+    pool.release(first)
+    recycled = pool.acquire()
+    assert recycled == first
+    assert not os.path.exists(os.path.join(recycled, "scratch.py"))
+    
+    # The branch was freed, so the main tree can check it out
+    assert GitAgent(str(repo)).create_new_branch("feature/isolated") == "Switched to existing branch: feature/isolated"
+    pool.release(recycled)
+    pool.release(second)
+
+def test_worktree_commits_are_never_orphaned(repo):
+    """Test that a task fails without its branch and detached commits survive recycling."""
+    from src.agents.orchestrator_agent import OrchestratorAgent, TaskContext
+    from src.tools.git_tools import WorktreePool
+    
+    pool = WorktreePool(str(repo), str(repo.parent / "worktrees"), max_size=1)
+    worktree = pool.acquire()
+    
+    # The main tree holds the branch, so the task can't check it out and stops
+    GitAgent(str(repo)).create_new_branch("feature/busy")
+    orchestrator = OrchestratorAgent(history_path=str(repo.parent / "history.sqlite3"))
+    failure = orchestrator._create_branch("feature/busy", TaskContext.for_root("task", worktree))
+    assert failure["success"] is False and failure["branch"] == "feature/busy"
+    
+    # A commit made on the detached HEAD anyway is kept on a branch
+    with open(f"{worktree}/scratch.py", "w") as file:
+        file.write("VALUE = 1\n")
+    subprocess.run(["git", "add", "scratch.py"], cwd=worktree, check=True, capture_output=True)
+    subprocess.run(["git", "commit", "-qm", "detached"], cwd=worktree, check=True, capture_output=True)
+    commit = GitRepository(worktree).head_commit()
+    pool.release(worktree)
+    
+    branches = subprocess.run(["git", "branch", "--contains", commit, "--format=%(refname:short)"],
+                              cwd=repo, capture_output=True, text=True).stdout.split()
+    assert branches == [f"genesis/unsaved/{os.path.basename(worktree)}-{commit[:12]}"]
+    assert pool.acquire() == worktree
+    pool.release(worktree)
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Test cases for the HTTP tools.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.agents.api_agent import ApiAgent
+from src.tools.http_tools import CachedResponse, HttpCache, HttpClient, HttpResponse, ResponseTooLargeError, iter_json_items
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves a few endpoints with different caching headers and records every request."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        self.server.clients.add(self.client_address)
+        if self.path == "/fresh":
+            self._send(200, {"Cache-Control": "max-age=60"}, {"value": "fresh"})
+        elif self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, {"ETag": '"v1"', "Cache-Control": "no-cache"})
+            else:
+                self._send(200, {"ETag": '"v1"', "Cache-Control": "no-cache"}, {"value": "etag"})
+        elif self.path == "/modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self._send(304, {"Cache-Control": "max-age=0"})
+            else:
+                self._send(200, {"Last-Modified": LAST_MODIFIED, "Cache-Control": "max-age=0"}, {"value": "modified"})
+        elif self.path.startswith("/slow/"):
+            with self.server.lock:
+                self.server.active += 1
+                self.server.peak = max(self.server.peak, self.server.active)
+            time.sleep(float(self.path.split("/")[2]))
+            with self.server.lock:
+                self.server.active -= 1
+            self._send(200, {}, {"value": self.path})
+        elif self.path == "/large":
+            self._send(200, {}, [{"id": number, "name": f"item {number}"} for number in range(5000)])
+        elif self.path == "/ndjson":
+            data = b"".join(json.dumps({"id": number}).encode("utf-8") + b"\n" for number in range(3))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif self.path == "/private":
+            self._send(200, {"Cache-Control": "no-store"}, {"value": "private"})
+        else:
+            self._send(404, {}, {"error": "not found"})
+    
+    def _send(self, status, headers, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run the stub server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.clients = set()
+    server.lock = threading.Lock()
+    server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_fresh_responses_are_served_from_the_cache(server):
+    """Test that a response with max-age is reused without asking the server."""
+    client = HttpClient(HttpCache())
+    
+    first = client.get(_url(server, "/fresh"))
+    second = client.get(_url(server, "/fresh"))
+    
+    assert (first.cache_status, second.cache_status) == ("miss", "hit")
+    assert second.json() == {"value": "fresh"}
+    assert len(server.requests) == 1
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_requests_with_credentials_bypass_the_cache(server):
+    """Test that responses to requests with Authorization or cookies are never shared."""
+    client = HttpClient(HttpCache())
+    
+    alice = client.get(_url(server, "/fresh"), headers={"Authorization": "alice"})
+    bob = client.get(_url(server, "/fresh"), headers={"Authorization": "bob"})
+    assert (alice.cache_status, bob.cache_status) == ("bypass", "bypass")
+    assert client.get(_url(server, "/fresh")).cache_status == "miss"
+    
+    client.session.cookies.set("session", "alice", domain="127.0.0.1")
+    assert client.get(_url(server, "/fresh")).cache_status == "bypass"
+    assert [request[1].get("Authorization") for request in server.requests] == ["alice", "bob", None, None]
+    assert client.cache.stats()["entries"] == 1
+
+
+def test_stale_responses_are_revalidated(server):
+    """Test that ETag and Last-Modified are sent back, a 304 reuses the cached body and connections are kept alive."""
+    client = HttpClient(HttpCache())
+    
+    for path, header, value in (("/etag", "If-None-Match", '"v1"'), ("/modified", "If-Modified-Since", LAST_MODIFIED)):
+        assert client.get(_url(server, path)).cache_status == "miss"
+        response = client.get(_url(server, path))
+        assert response.cache_status == "revalidated"
+        assert response.status_code == 200 and response.json()["value"] == path[1:]
+        assert server.requests[-1][1][header] == value
+        # The 304's Content-Length describes its own empty body, not the cached one
+        assert response.headers["content-length"] == str(len(response.content))
+    
+    # Revalidated entries replace the stored ones, so the memory accounting stays exact
+    assert client.cache.stats()["memory_bytes"] == sum(entry.size for entry in client.cache._memory.values())
+    assert client.get(_url(server, "/private")).cache_status == "miss"
+    assert client.get(_url(server, "/private")).cache_status == "miss"
+    assert client.cache.stats()["revalidated"] == 2
+    assert len(server.clients) == 1
+
+
+def test_cache_is_bounded_and_persisted(tmp_path):
+    """Test the memory LRU budget and that entries survive in the disk cache."""
+    entry = lambda url: CachedResponse(url, 200, {"cache-control": "max-age=60"}, b"x" * 1000, 0.0)
+    cache = HttpCache(max_memory_bytes=3000, directory=str(tmp_path), max_disk_bytes=2500)
+    for url in ("http://a", "http://b", "http://c"):
+        cache.put(entry(url))
+    
+    assert cache.stats()["entries"] == 2
+    assert len(list(tmp_path.iterdir())) == 2
+    reopened = HttpCache(directory=str(tmp_path))
+    assert reopened.get("http://a") is None
+    assert reopened.get("http://c").content == b"x" * 1000
+
+
+def test_api_agent_uses_the_pooled_client(server):
+    """Test that the ApiAgent reports data, cache status and errors."""
+    agent = ApiAgent(HttpClient(HttpCache(), timeout=5))
+    
+    assert agent.make_get_request(_url(server, "/fresh")) == {
+        "success": True, "status_code": 200, "data": {"value": "fresh"}, "cache": "miss"
+    }
+    assert agent.make_get_request(_url(server, "/fresh"))["cache"] == "hit"
+    assert agent.make_get_request(_url(server, "/missing"))["success"] is False
+
+
+def test_bulk_fetch_is_concurrent_capped_and_coalesced(server):
+    """Test that a bulk fetch runs requests at once, per host cap, and sends duplicates once."""
+    client = HttpClient(timeout=5)
+    urls = [_url(server, f"/slow/0.2/{n}") for n in range(6)] + [_url(server, "/slow/0.2/0")] * 2
+    
+    started = time.perf_counter()
+    results = list(client.fetch_many(urls, per_host=3))
+    elapsed = time.perf_counter() - started
+    
+    assert sorted(result.index for result in results) == list(range(8))
+    assert all(result.ok for result in results)
+    assert len(server.requests) == 6
+    assert server.peak == 3
+    assert elapsed < 1.0
+    assert {result.response.json()["value"] for result in results if result.index >= 6} == {"/slow/0.2/0"}
+
+
+def test_api_agent_streams_bulk_results(server):
+    """Test that results stream back in completion order, failures included."""
+    agent = ApiAgent(HttpClient(timeout=5))
+    
+    results = agent.make_get_requests([_url(server, "/slow/0.3/a"), _url(server, "/missing"), {"url": _url(server, "/fresh")}])
+    first = next(results)
+    rest = list(results)
+    
+    assert first["index"] in (1, 2)
+    assert rest[-1]["index"] == 0 and rest[-1]["data"] == {"value": "/slow/0.3/a"}
+    assert [result["success"] for result in sorted([first] + rest, key=lambda result: result["index"])] == [True, False, True]
+
+
+def test_streamed_bodies_are_capped_and_spooled(server, tmp_path):
+    """Test that large streamed bodies go to a temporary file and oversized ones are refused."""
+    client = HttpClient(spool_directory=str(tmp_path))
+    
+    response = client.stream(_url(server, "/large"), max_inline_bytes=1024, chunk_size=1000)
+    assert response.content == b"" and os.path.getsize(response.path) == response.size > 1024
+    assert response.cache_status == "bypass"
+    items = response.iter_json(chunk_size=7)
+    assert next(items) == {"id": 0, "name": "item 0"}
+    assert sum(1 for _ in items) == 4999
+    response.discard()
+    
+    with pytest.raises(ResponseTooLargeError):
+        client.stream(_url(server, "/large"), max_inline_bytes=1024, max_bytes=4096)
+    assert list(tmp_path.iterdir()) == []
+    assert client.stream(_url(server, "/fresh")).json() == {"value": "fresh"}
+
+
+def test_json_is_parsed_incrementally():
+    """Test that arrays and NDJSON split at arbitrary points decode item by item."""
+    data = b'[1, -2.5e3, {"a": [true, null]}, "x,]"]'
+    assert list(iter_json_items(data[index:index + 1] for index in range(len(data)))) == [1, -2500.0, {"a": [True, None]}, "x,]"]
+    assert list(iter_json_items([b'{"a": 1}\n2', b'3\n"b"\n'])) == [{"a": 1}, 23, "b"]
+    for invalid in (b"[1, 2", b"[1 2]", b"[1,]", b"[1] 2"):
+        with pytest.raises(ValueError):
+            list(iter_json_items([invalid]))
+    
+    # A large value split into small chunks isn't parsed again after every chunk
+    document = json.dumps({"items": list(range(20000))}).encode()
+    started = time.perf_counter()
+    assert list(iter_json_items(document[index:index + 16] for index in range(0, len(document), 16))) == [json.loads(document)]
+    assert time.perf_counter() - started < 2
+
+
+def test_previews_read_a_bounded_head():
+    """Test that only arrays and NDJSON are previewed, from the first bytes of the body."""
+    items = b"[" + b", ".join(b'{"id": %d}' % number for number in range(1000)) + b"]"
+    array = HttpResponse("http://x", 200, {"content-type": "application/json"}, items, "miss")
+    assert array.preview_json(3) == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert array.preview_json(100, max_bytes=40) == [{"id": 0}, {"id": 1}, {"id": 2}]
+    
+    document = HttpResponse("http://x", 200, {"content-type": "application/json"}, b' {"a": [1, 2]}', "miss")
+    ndjson = HttpResponse("http://x", 200, {"content-type": "application/x-ndjson"}, b'{"a": 1}\n{"a": 2}\n', "miss")
+    text = HttpResponse("http://x", 200, {"content-type": "text/plain"}, b"[1]", "miss")
+    assert (document.preview_json(3), ndjson.preview_json(3), text.preview_json(3)) == (None, [{"a": 1}, {"a": 2}], None)
+
+
+def test_ndjson_lines_may_be_arrays():
+    """Test that NDJSON yields each line whole, even when the lines are arrays."""
+    lines = b'[1, 2]\n[3, 4]\n'
+    assert list(iter_json_items([lines], ndjson=True)) == [[1, 2], [3, 4]]
+    with pytest.raises(ValueError):
+        list(iter_json_items([lines]))
+    
+    response = HttpResponse("http://x", 200, {"content-type": "application/x-ndjson"}, lines, "miss")
+    assert list(response.iter_json(chunk_size=3)) == [[1, 2], [3, 4]]
+    assert response.preview_json(1) == [[1, 2]]
+    assert ApiAgent(HttpClient(timeout=5))._result(response)["data"] == [[1, 2], [3, 4]]
+
+
+def test_api_agent_streams_large_responses(server):
+    """Test that the ApiAgent returns spooled bodies by path with a preview."""
+    agent = ApiAgent(HttpClient(timeout=5))
+    
+    result = agent.make_get_request(_url(server, "/large"), stream=True, max_inline_bytes=1024)
+    try:
+        assert result["success"] and "data" not in result
+        assert result["preview"] == [{"id": number, "name": f"item {number}"} for number in range(10)]
+        assert os.path.getsize(result["path"]) == result["size"]
+    finally:
+        os.remove(result["path"])
+    
+    assert agent.make_get_request(_url(server, "/ndjson"), stream=True)["data"] == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert agent.make_get_request(_url(server, "/large"), stream=True, max_bytes=100)["success"] is False
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Test cases for import time and lazy agent creation.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import pytest
+from src.agents import registry as registry_module
+from src.agents.registry import AgentRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative microseconds importing the web application may take
+IMPORT_TIME_BUDGET_US = int(os.environ.get("GENESIS_IMPORT_BUDGET_US", "750000"))
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=60)
+
+
+def test_web_app_import_stays_within_budget():
+    """Test that importing the web application is cheap and skips google.adk."""
+    result = _run_python("-X", "importtime", "-c", "import src.web_app")
+    assert result.returncode == 0, result.stderr
+    
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            cumulative[match.group(2)] = int(match.group(1))
+    assert "google.adk" not in cumulative
+    assert cumulative["src.web_app"] <= IMPORT_TIME_BUDGET_US, f"src.web_app took {cumulative['src.web_app']}us"
+
+
+def test_agents_are_created_on_first_use():
+    """Test that importing an agent module or the web application creates no agent."""
+    code = (
+        "from src.agents.registry import registry\n"
+        "import src.web_app\n"
+        "assert not registry.is_loaded('orchestrator_agent')\n"
+        "import src.agents.git_agent as module\n"
+        "assert not registry.is_loaded('git_agent')\n"
+        "from src.agents.git_agent import git_agent\n"
+        "assert registry.is_loaded('git_agent') and module.git_agent is git_agent\n"
+    )
+    result = _run_python("-c", code)
+    assert result.returncode == 0, result.stderr
+
+
+def test_registry_imports_modules_lazily(tmp_path, monkeypatch):
+    """Test that the registry imports an agent's module and uses its factory when first requested."""
+    (tmp_path / "sample_agent_module.py").write_text(
+        "from src.agents.registry import registry\n"
+        "\n"
+        "class SampleAgent:\n"
+        "    pass\n"
+        "\n"
+        "__getattr__ = registry.provide(__name__, sample_agent=SampleAgent)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = AgentRegistry({"sample_agent": "sample_agent_module"})
+    monkeypatch.setattr(registry_module, "registry", registry)
+    registry.register("other_agent", object)
+    
+    assert registry.names() == ["other_agent", "sample_agent"]
+    assert registry.get("other_agent") is registry.get("other_agent")
+    assert "sample_agent_module" not in sys.modules and not registry.is_loaded("sample_agent")
+    try:
+        agent = registry.get("sample_agent")
+        module = sys.modules["sample_agent_module"]
+        assert type(agent) is module.SampleAgent and module.sample_agent is agent
+    finally:
+        sys.modules.pop("sample_agent_module", None)
+    with pytest.raises(KeyError):
+        registry.get("missing_agent")
\ No newline at end of file
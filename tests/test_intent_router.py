@@ -0,0 +1,57 @@
+"""
+Test cases for the intent router.
+"""
+
+import pytest
+from src.agents.code_generation_agent import CodeGenerationAgent
+from src.agents.file_system_agent import FileSystemAgent
+from src.intent_router import IntentRouter
+
+
+def test_routes_need_all_keywords_and_rank_by_priority():
+    """Test that a route matches only with all its keywords and that priority decides."""
+    router = IntentRouter()
+    router.register("code", "api_agent.py", handler="code")
+    router.register("test", "test_api_agent.py", priority=1, handler="test")
+    router.register("factorial", "calculate_factorial", "utils.py")
+    router.register("calculator", "calculator")
+    router.register("calculator", "hesapmakinesi")
+    
+    assert [match.name for match in router.match("Write tests/test_api_agent.py")] == ["test", "code"]
+    assert router.route("Create src/agents/api_agent.py").handler == "code"
+    assert router.route("Add calculate_factorial") is None
+    assert router.route("Add CALCULATE_FACTORIAL to utils.py").name == "factorial"
+    assert router.route("Bir hesapmakinesi yap").name == "calculator"
+
+
+def test_overlapping_keywords_are_all_found():
+    """Test that keywords ending inside other keywords are found in one pass."""
+    router = IntentRouter(case_sensitive=True)
+    for keyword in ("he", "she", "his", "hers"):
+        router.register(keyword, keyword)
+    
+    assert sorted(match.name for match in router.match("ushers")) == ["he", "hers", "she"]
+    assert router.route("USHERS") is None
+    with pytest.raises(ValueError):
+        router.register("empty")
+
+
+def test_conflicts_are_detected():
+    """Test that routes only told apart by registration order are reported."""
+    router = IntentRouter()
+    router.register("code", "api_agent.py")
+    router.register("test", "test_api_agent.py")
+    router.register("requirements", "requirements.txt", "requests")
+    router.register("other", "requests", priority=1)
+    
+    assert router.conflicts() == [("test", "code")]
+
+
+def test_code_generation_routes_test_files_to_tests(tmp_path):
+    """Test that a test file instruction isn't taken for the code file it names."""
+    agent = CodeGenerationAgent(FileSystemAgent(str(tmp_path)))
+    
+    assert agent.execute_task("Write a basic test in tests/test_api_agent.py")["success"]
+    assert (tmp_path / "tests" / "test_api_agent.py").read_text().startswith('"""\nTest cases for the ApiAgent.')
+    assert not (tmp_path / "src").exists()
+    assert agent.router.conflicts() == []
\ No newline at end of file
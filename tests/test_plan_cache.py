@@ -0,0 +1,57 @@
+"""
+Test cases for the plan cache.
+"""
+
+import time
+from src.agents.orchestrator_agent import OrchestratorAgent, TaskContext
+from src.plan_cache import PlanCache, normalize_goal
+
+PLAN = {"branch_name": "feature/x", "commit_message": "feat: X", "steps": [{"agent": "testing", "instruction": "Run"}]}
+
+
+def test_plans_are_keyed_by_normalized_goal_and_fingerprint():
+    """Test that rephrased goals hit and other repository states miss."""
+    cache = PlanCache()
+    cache.put("Add a  factorial function.", "abc", PLAN)
+    
+    assert normalize_goal("  Add a\nFactorial function! ") == "add a factorial function"
+    assert cache.get("add a factorial function", "abc") == PLAN
+    assert cache.get("add a factorial function", "def") is None
+    assert cache.get("add a factorial function", "abc", kind="meta") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2, "expired": 0, "evictions": 0, "hit_rate": 1 / 3}
+
+
+def test_plans_expire_and_are_evicted(tmp_path):
+    """Test the time to live, least recently used eviction and persistence."""
+    path = str(tmp_path / "plans.sqlite3")
+    cache = PlanCache(path, max_entries=2)
+    cache.put("a", "", PLAN)
+    cache.put("b", "", PLAN)
+    cache.get("a", "")
+    cache.put("c", "", PLAN)
+    assert cache.evictions == 1
+    cache.close()
+    
+    reopened = PlanCache(path, max_entries=2, ttl=60)
+    assert reopened.get("b", "") is None
+    assert reopened.get("a", "") == PLAN
+    # Age "c" past the time to live instead of waiting for it to expire
+    connection = reopened._connect()
+    connection.execute("UPDATE plans SET created_at = ? WHERE goal = 'c'", (time.time() - 120,))
+    connection.commit()
+    assert reopened.get("c", "") is None
+    assert reopened.get("a", "") == PLAN
+    assert reopened.expired == 1
+
+
+def test_orchestrator_reuses_cached_plans(tmp_path):
+    """Test that the second plan for a goal comes from the cache."""
+    orchestrator = OrchestratorAgent(history_path=str(tmp_path / "history.sqlite3"), plan_cache=PlanCache())
+    context = TaskContext.for_root("task", str(tmp_path))
+    goal = "Add a function named calculate_factorial to the utils.py file"
+    
+    first = orchestrator._plan(goal, "standard", orchestrator._create_plan, context)
+    second = orchestrator._plan(goal + ".", "standard", orchestrator._create_plan, context)
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["steps"] == first["steps"] and second["branch_name"] == "feature/factorial-function"
+    assert orchestrator.plan_cache.stats()["hits"] == 1
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Test cases for the plan step scheduler.
+"""
+
+import threading
+import pytest
+from src.plan_scheduler import PlanScheduler
+
+
+CALCULATOR_STEPS = [
+    {"agent": "code_generation", "instruction": "Create a new HTML file src/calculator.html."},
+    {"agent": "code_generation", "instruction": "Create a new CSS file src/calculator.css."},
+    {"agent": "code_generation", "instruction": "Create a new JavaScript file src/calculator.js."},
+    {"agent": "testing", "instruction": "Run the test suite."},
+    {"agent": "code_generation", "instruction": "Update src/calculator.js again."},
+]
+
+
+def test_build_dependencies():
+    """Test that dependencies are inferred from target paths and barriers."""
+    scheduler = PlanScheduler()
+    dependencies = scheduler.build_dependencies(CALCULATOR_STEPS)
+    
+    # The three files are independent of each other
+    assert dependencies[:3] == [set(), set(), set()]
+    
+    # The testing step waits for everything before it, and later steps wait for it
+    assert dependencies[3] == {0, 1, 2}
+    assert dependencies[4] == {2, 3}
+
+
+def test_explicit_dependencies():
+    """Test that depends_on accepts step ids and rejects forward references."""
+    scheduler = PlanScheduler()
+    steps = [
+        {"id": "html", "agent": "code_generation", "instruction": "Write a.html"},
+        {"agent": "code_generation", "instruction": "Write b.css", "depends_on": ["html"]},
+    ]
+    assert scheduler.build_dependencies(steps) == [set(), {0}]
+    
+    with pytest.raises(ValueError):
+        scheduler.build_dependencies([{"agent": "code_generation", "instruction": "x.py", "depends_on": [1]}])
+
+
+def test_independent_steps_run_concurrently():
+    """Test that independent steps run at the same time."""
+    scheduler = PlanScheduler(max_workers=3)
+    barrier = threading.Barrier(3, timeout=5)
+    order = []
+    
+    def execute_step(step):
+        if step["instruction"].startswith("Create"):
+            barrier.wait()
+        order.append(step["instruction"])
+        return None
+    
+    assert scheduler.run(CALCULATOR_STEPS, execute_step) is None
+    assert order[3] == "Run the test suite."
+    assert order[4] == "Update src/calculator.js again."
+
+
+def test_run_stops_on_result():
+    """Test that a returned result stops the plan."""
+    scheduler = PlanScheduler()
+    executed = []
+    
+    def execute_step(step):
+        executed.append(step["agent"])
+        if step["agent"] == "testing":
+            return {"success": False}
+        return None
+    
+    assert scheduler.run(CALCULATOR_STEPS, execute_step) == {"success": False}
+    assert len(executed) == 4
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Test cases for the project index.
+"""
+
+import ast
+import os
+import pytest
+from src.agents.file_system_agent import FileSystemAgent
+from src.tools.project_index import ProjectIndex, module_name, parse_imports
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small project with agents, an instance and imports between modules."""
+    files = {
+        "pkg/__init__.py": "",
+        "pkg/base.py": "class Agent:\n    def run(self):\n        pass\n",
+        "pkg/worker.py": "from .base import Agent\n\n\nclass WorkerAgent(Agent):\n    pass\n\n\nworker_agent = WorkerAgent()\n",
+        "app.py": "import pkg.worker\n\n\ndef main():\n    pkg.worker.worker_agent.run()\n",
+        "README.md": "# Project\n",
+        ".git/config": "",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+def test_index_answers_symbol_and_import_queries(project, tmp_path_factory):
+    """Test that symbols, instances, subclasses and importers can be looked up."""
+    (project / "pkg" / "lazy.py").write_text("from .base import Agent\n\n\n__getattr__ = registry.provide(__name__, lazy_agent=Agent)\n")
+    index = ProjectIndex(str(project), str(tmp_path_factory.mktemp("index") / "index.sqlite3"))
+    
+    assert [file["path"] for file in index.files()] == ["README.md", "app.py", "pkg/__init__.py", "pkg/base.py", "pkg/lazy.py", "pkg/worker.py"]
+    assert [symbol["name"] for symbol in index.symbols(name="*Agent", kind="class")] == ["Agent", "WorkerAgent"]
+    assert index.symbols(kind="instance") == [
+        {"name": "lazy_agent", "kind": "instance", "path": "pkg/lazy.py", "line": 4, "detail": "Agent"},
+        {"name": "worker_agent", "kind": "instance", "path": "pkg/worker.py", "line": 8, "detail": "WorkerAgent"}
+    ]
+    assert [symbol["name"] for symbol in index.symbols(base="Agent")] == ["WorkerAgent"]
+    assert index.importers("pkg.base") == ["pkg/lazy.py", "pkg/worker.py"]
+    assert index.importers("pkg.base.Agent") == ["pkg/lazy.py", "pkg/worker.py"]
+    assert index.importers("pkg.worker") == ["app.py"]
+    assert index.imports("pkg/worker.py") == ["pkg.base"]
+
+
+def test_index_refreshes_incrementally(project, tmp_path_factory):
+    """Test that only changed files are re-read and that removed files are dropped."""
+    path = str(tmp_path_factory.mktemp("index") / "index.sqlite3")
+    assert ProjectIndex(str(project), path).refresh()["added"] == 5
+    
+    index = ProjectIndex(str(project), path)
+    worker = project / "pkg" / "worker.py"
+    worker.write_text("class WorkerAgent:\n    pass\n")
+    os.utime(worker, ns=(worker.stat().st_atime_ns, worker.stat().st_mtime_ns + 10 ** 9))
+    (project / "app.py").unlink()
+    
+    assert index.refresh() == {"added": 0, "updated": 1, "removed": 1, "unchanged": 3}
+    assert index.importers("pkg.base") == []
+    assert index.symbols(kind="instance") == []
+
+
+def test_agent_analyzes_project_structure(project, tmp_path_factory, monkeypatch):
+    """Test that the FileSystemAgent answers the structure analysis step from the index."""
+    monkeypatch.setenv("GENESIS_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    result = FileSystemAgent(str(project)).execute_task("Analyze the project structure.")
+    
+    assert result["success"]
+    assert result["summary"]["files"] == 5
+    assert [agent["name"] for agent in result["agents"]] == ["Agent", "WorkerAgent"]
+
+
+def test_imports_are_resolved_relative_to_their_package():
+    """Test the import parser shared by the project index and the test impact map."""
+    source = "import os.path\nfrom . import base\nfrom ..core import *\nfrom .worker import WorkerAgent as Worker\n"
+    assert parse_imports(ast.parse(source), "pkg/sub/__init__.py") == [
+        ("os.path", None), ("pkg.sub", "base"), ("pkg.core", None), ("pkg.sub.worker", "WorkerAgent")
+    ]
+    assert parse_imports(ast.parse("from . import base\n"), "pkg/sub/mod.py") == [("pkg.sub", "base")]
+    assert (module_name("pkg/sub/__init__.py"), module_name("app.py")) == ("pkg.sub", "app")
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Test cases for the task history store.
+"""
+
+from src.task_history import TaskHistoryStore
+
+
+def fill(store, count):
+    """Record count finished tasks, alternating success and failure."""
+    for index in range(count):
+        store.record_started(f"task-{index}", f"goal {index}")
+        store.record_completed(f"task-{index}", f"goal {index}", {"success": index % 2 == 0})
+
+
+def test_start_and_completion_are_merged():
+    """Test that a finished task shows up once, carrying its start time."""
+    store = TaskHistoryStore()
+    started = store.record_started("task-1", "Add a function")
+    store.record_completed("task-1", "Add a function", {"success": True})
+    
+    items = store.page()["items"]
+    assert len(items) == 1
+    assert items[0]["status"] == "completed"
+    assert items[0]["started_at"] == started["started_at"]
+    assert items[0]["result"] == {"success": True}
+
+
+def test_cursor_pagination_beyond_ring(tmp_path):
+    """Test that pages continue from the database once the ring buffer is exhausted."""
+    store = TaskHistoryStore(str(tmp_path / "history.sqlite3"), ring_size=3)
+    fill(store, 10)
+    
+    seen = []
+    cursor = None
+    while True:
+        page = store.page(cursor=cursor, limit=4)
+        seen.extend(item["task_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert seen == [f"task-{index}" for index in reversed(range(10))]
+
+
+def test_filters_and_persistence(tmp_path):
+    """Test the filters and that history survives reopening the store."""
+    path = str(tmp_path / "history.sqlite3")
+    store = TaskHistoryStore(path)
+    fill(store, 6)
+    store.record_started("running", "still going")
+    store.close()
+    
+    reopened = TaskHistoryStore(path, ring_size=2)
+    assert [item["task_id"] for item in reopened.page(status="started")["items"]] == ["running"]
+    assert len(reopened.page(success=False)["items"]) == 3
+    assert [item["task_id"] for item in reopened.page(query="GOAL 4")["items"]] == ["task-4"]
+
+
+def test_compaction_drops_start_records(tmp_path):
+    """Test that compaction keeps one record per finished task."""
+    store = TaskHistoryStore(str(tmp_path / "history.sqlite3"), compact_every=1000)
+    fill(store, 5)
+    store.record_started("running", "still going")
+    
+    assert store.compact() == 5
+    assert len(store.page(limit=100)["items"]) == 6
\ No newline at end of file
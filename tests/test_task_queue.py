@@ -0,0 +1,73 @@
+"""
+Test cases for the task queue.
+"""
+
+import threading
+import time
+import pytest
+from src.task_queue import TaskQueue, TaskQueueFullError
+
+
+def wait_for(job, status):
+    """Wait for a job's future and check its final status."""
+    job.future.result(timeout=5)
+    assert job.status == status
+
+
+def test_submit_returns_immediately():
+    """Test that submit queues the job and the worker completes it."""
+    release = threading.Event()
+    queue = TaskQueue(lambda job: release.wait(5) and {"success": True, "task": job.task})
+    
+    job = queue.submit("do something")
+    assert job.status in ("queued", "running")
+    
+    release.set()
+    wait_for(job, "completed")
+    assert queue.get(job.id).result == {"success": True, "task": "do something"}
+    queue.shutdown()
+
+
+def test_cancel_queued_and_running_jobs():
+    """Test that queued jobs never start and running jobs are asked to stop."""
+    started = threading.Event()
+    
+    def handler(job):
+        started.set()
+        while not job.is_cancelled():
+            time.sleep(0.01)
+        return {"success": False}
+    
+    queue = TaskQueue(handler, max_workers=1)
+    running = queue.submit("first")
+    queued = queue.submit("second")
+    started.wait(5)
+    
+    assert queue.cancel(queued.id).status == "cancelled"
+    queue.cancel(running.id)
+    wait_for(running, "cancelled")
+    assert queue.cancel("missing") is None
+    queue.shutdown()
+
+
+def test_failed_job_and_capacity():
+    """Test that handler errors are reported and the pending limit is enforced."""
+    started = threading.Event()
+    release = threading.Event()
+    
+    def handler(job):
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+    
+    queue = TaskQueue(handler, max_workers=1, max_pending=1)
+    first = queue.submit("first")
+    started.wait(5)
+    queue.submit("second")
+    with pytest.raises(TaskQueueFullError):
+        queue.submit("third")
+    
+    release.set()
+    wait_for(first, "failed")
+    assert first.to_dict()["error"] == "boom"
+    queue.shutdown()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Test cases for the template tools.
+"""
+
+import os
+import pytest
+from src.agents.code_generation_agent import CodeGenerationAgent
+from src.agents.file_system_agent import FileSystemAgent
+from src.tools.template_tools import TemplateEngine, TemplateError, template_engine
+
+
+def test_templates_are_compiled_once_and_reloaded_on_change(tmp_path):
+    """Test that a template is cached until its file changes."""
+    template = tmp_path / "greeting.py.tmpl"
+    template.write_text("def {{ name }}():\n    return {'greeting': '{{name}}'}\n")
+    engine = TemplateEngine(str(tmp_path))
+    
+    assert engine.names() == ["greeting.py"]
+    assert engine.render("greeting.py", name="hello") == "def hello():\n    return {'greeting': 'hello'}\n"
+    assert engine.get("greeting.py") is engine.get("greeting.py")
+    
+    template.write_text("{{ name }} = 1\n")
+    os.utime(template, ns=(template.stat().st_atime_ns, template.stat().st_mtime_ns + 10 ** 9))
+    assert engine.render("greeting.py", name="value") == "value = 1\n"
+
+
+def test_template_errors():
+    """Test that unknown templates, bad names and missing parameters are reported."""
+    with pytest.raises(TemplateError, match="missing parameters: function_name"):
+        template_engine.render("factorial.py")
+    with pytest.raises(TemplateError, match="Unknown template"):
+        template_engine.render("missing.py")
+    with pytest.raises(TemplateError, match="Invalid template name"):
+        template_engine.render("../agents/api_agent.py")
+
+
+def test_code_generation_renders_many_files(tmp_path):
+    """Test that one template renders into several parameterized files in a batch."""
+    agent = CodeGenerationAgent(FileSystemAgent(str(tmp_path)))
+    
+    result = agent.generate_files("api_agent.py", {
+        "src/agents/weather_agent.py": {"class_name": "WeatherAgent", "instance_name": "weather_agent"},
+        "src/agents/news_agent.py": {"class_name": "NewsAgent", "instance_name": "news_agent"},
+    })
+    assert result["success"]
+    assert sorted(result["written"]) == ["src/agents/news_agent.py", "src/agents/weather_agent.py"]
+    assert "registry.provide(__name__, weather_agent=WeatherAgent)" in (tmp_path / "src" / "agents" / "weather_agent.py").read_text()
+    assert not agent.generate_file("factorial.py", "src/utils.py")
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+Test cases for the testing tools.
+"""
+
+import os
+import pytest
+from src.agents import testing_agent
+from src.tools.testing_tools import (
+    TestImpactMap,
+    TestDurations,
+    TestResultCache,
+    PytestForkServer,
+    OutputTail,
+    shard_test_files
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small project whose tests import its modules directly and transitively."""
+    files = {
+        "pkg/__init__.py": "",
+        "pkg/core.py": "VALUE = 1\n",
+        "pkg/helpers.py": "from .core import VALUE\n\n\ndef double():\n    return VALUE * 2\n",
+        "pkg/unused.py": "OTHER = 3\n",
+        "tests/test_core.py": "from pkg.core import VALUE\n\n\ndef test_value():\n    assert VALUE == 1\n",
+        "tests/test_helpers.py": "from pkg import helpers\n\n\ndef test_double():\n    assert helpers.double() == 2\n",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+def test_impacted_tests_follow_imports(project, tmp_path_factory):
+    """Test that changes select the tests importing them, directly or transitively."""
+    impact_map = TestImpactMap(str(project), str(tmp_path_factory.mktemp("cache") / "impact.json"))
+    
+    assert impact_map.impacted_tests(["pkg/core.py"]) == ["tests/test_core.py", "tests/test_helpers.py"]
+    assert impact_map.impacted_tests(["pkg/helpers.py"]) == ["tests/test_helpers.py"]
+    assert impact_map.impacted_tests(["tests/test_core.py"]) == ["tests/test_core.py"]
+    assert impact_map.impacted_tests(["pkg/unused.py"]) == []
+
+
+def test_untraceable_changes_need_the_full_suite(project, tmp_path_factory):
+    """Test that non-Python files, conftest.py and unknown modules select everything."""
+    impact_map = TestImpactMap(str(project), str(tmp_path_factory.mktemp("cache") / "impact.json"))
+    
+    assert impact_map.impacted_tests(["requirements.txt"]) is None
+    assert impact_map.impacted_tests(["tests/conftest.py"]) is None
+    assert impact_map.impacted_tests(["pkg/missing.py"]) is None
+
+
+def test_cache_is_refreshed_incrementally(project, tmp_path_factory):
+    """Test that the cache survives a new instance and picks up changed imports."""
+    cache_path = str(tmp_path_factory.mktemp("cache") / "impact.json")
+    TestImpactMap(str(project), cache_path).impacted_tests(["pkg/core.py"])
+    assert os.path.exists(cache_path)
+    
+    (project / "tests" / "test_unused.py").write_text("from pkg.unused import OTHER\n")
+    assert TestImpactMap(str(project), cache_path).impacted_tests(["pkg/unused.py"]) == ["tests/test_unused.py"]
+
+
+def test_testing_agent_runs_only_impacted_tests(project, tmp_path_factory, monkeypatch):
+    """Test that the TestingAgent runs the selected test files and reports them."""
+    monkeypatch.setenv("GENESIS_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    agent = testing_agent.TestingAgent(str(project))
+    
+    result = agent.run_impacted_tests(["pkg/helpers.py"])
+    assert result["success"]
+    assert result["selected_tests"] == ["tests/test_helpers.py"]
+    assert "test_double" in result["output"]
+    assert "test_value" not in result["output"]
+    
+    result = agent.run_impacted_tests(["pkg/unused.py"])
+    assert result["success"] and result["selected_tests"] == []
+
+
+def test_shards_are_balanced_by_duration(tmp_path):
+    """Test that the longest files are spread over the shards first."""
+    durations = TestDurations(path=str(tmp_path / "durations.json"))
+    durations.update({"a.py": 8.0, "b.py": 5.0, "c.py": 4.0, "d.py": 3.0})
+    
+    shards = shard_test_files({"a.py": 1, "b.py": 1, "c.py": 1, "d.py": 1}, 2, durations)
+    assert sorted(map(sorted, shards)) == [["a.py", "d.py"], ["b.py", "c.py"]]
+    assert shard_test_files({"a.py": 1}, 4, durations) == [["a.py"]]
+
+
+def test_sharded_run_merges_reports(project, tmp_path_factory, monkeypatch):
+    """Test that a sharded run reports every shard and records file durations."""
+    monkeypatch.setenv("GENESIS_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    (project / "tests" / "test_failing.py").write_text("def test_broken():\n    assert 1 == 2\n")
+    agent = testing_agent.TestingAgent(str(project), workers=2)
+    
+    result = agent.run_pytest_suite()
+    assert not result["success"]
+    assert len(result["shards"]) == 2
+    assert (result["summary"]["passed"], result["summary"]["failed"]) == (2, 1)
+    assert result["summary"]["failures"][0]["test"] == "tests/test_failing.py::test_broken"
+    assert agent.durations.get("tests/test_core.py") is not None
+
+
+@pytest.mark.skipif(not PytestForkServer.is_supported(), reason="needs os.fork")
+def test_fork_server_reimports_changed_modules(project):
+    """Test that warm runs see source changes and report startup and execution time."""
+    server = PytestForkServer(str(project), preload=["pkg.core"])
+    try:
+        result = server.run(["-q", "tests/test_core.py"])
+        assert result["returncode"] == 0
+        assert result["purged_modules"] == []
+        assert result["timing"]["startup"] is not None and result["timing"]["execution"] is not None
+        
+        core = project / "pkg" / "core.py"
+        core.write_text("VALUE = 2\n")
+        os.utime(core, ns=(core.stat().st_atime_ns, core.stat().st_mtime_ns + 10 ** 9))
+        lines = []
+        result = server.run(["-q", "tests/test_core.py"], on_output=lines.append)
+        assert result["returncode"] == 1
+        assert "pkg.core" in result["purged_modules"]
+        assert any("1 failed" in line for line in lines)
+    finally:
+        server.stop()
+
+
+def test_fork_server_preload_is_configurable(project, monkeypatch):
+    """Test that the preloaded modules come from GENESIS_PRELOAD_MODULES when it is set."""
+    monkeypatch.delenv("GENESIS_PRELOAD_MODULES", raising=False)
+    assert PytestForkServer(str(project)).preload == ["requests", "flask"]
+    monkeypatch.setenv("GENESIS_PRELOAD_MODULES", "pkg.core, pkg.helpers,")
+    assert PytestForkServer(str(project)).preload == ["pkg.core", "pkg.helpers"]
+
+
+def test_failures_are_summarized_while_streaming(project, tmp_path_factory, monkeypatch):
+    """Test that failures are reported per test with their location and message."""
+    monkeypatch.setenv("GENESIS_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    (project / "tests" / "test_failing.py").write_text(
+        "def test_broken():\n    print('x' * 100000)\n    assert 1 == 2\n"
+    )
+    agent = testing_agent.TestingAgent(str(project))
+    events = []
+    
+    result = agent.run_pytest_suite(on_event=events.append)
+    assert not result["success"]
+    assert result["summary"]["passed"] == 2
+    failure = result["summary"]["failures"][0]
+    assert (failure["test"], failure["file"], failure["line"]) == ("tests/test_failing.py::test_broken", "tests/test_failing.py", 3)
+    assert "assert 1 == 2" in failure["message"]
+    assert len(failure["traceback"]) <= 2010
+    assert len(result["output"]) <= 70000
+    assert "1 failed" in result["output"]
+    assert sorted(event["outcome"] for event in events) == ["failed", "passed", "passed"]
+    assert testing_agent.TestingAgent.describe_failures(result).startswith("tests/test_failing.py::test_broken (tests/test_failing.py:3)")
+
+
+def test_output_tail_is_bounded():
+    """Test that only the end of long output is kept."""
+    tail = OutputTail(max_chars=10)
+    for index in range(100):
+        tail.append(f"line {index}\n")
+    assert tail.text() == "... (99 earlier lines omitted)\nline 99\n"
+    assert tail.last_line() == "line 99"
+
+
+def test_unchanged_passing_tests_come_from_the_cache(project, tmp_path_factory, monkeypatch):
+    """Test that only test files whose dependencies changed run again."""
+    monkeypatch.setenv("GENESIS_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    monkeypatch.delenv("GENESIS_TEST_CACHE", raising=False)
+    assert not testing_agent.TestingAgent(str(project)).cache_results
+    agent = testing_agent.TestingAgent(str(project), cache_results=True)
+    tests = ["tests/test_core.py", "tests/test_helpers.py"]
+    
+    assert agent.run_pytest_suite(test_paths=tests)["cached_tests"] == []
+    result = agent.run_pytest_suite(test_paths=tests)
+    assert result["cached_tests"] == tests
+    assert result["summary"]["passed"] == 2 and result["summary"]["cached"] == 2
+    
+    (project / "pkg" / "helpers.py").write_text("from .core import VALUE\n\n\ndef double():\n    return VALUE + VALUE\n")
+    result = agent.run_pytest_suite(test_paths=tests)
+    assert result["cached_tests"] == ["tests/test_core.py"]
+    assert "test_double" in result["output"]
+    
+    # The whole suite is collected by pytest, and explicit opt-outs are honored
+    assert "cached_tests" not in agent.run_pytest_suite()
+    assert "cached_tests" not in agent.run_pytest_suite(test_paths=tests, use_cache=False)
+
+
+def test_fingerprints_scan_the_project_once(project, tmp_path_factory, monkeypatch):
+    """Test that all fingerprints of a run come from one scan and cover everything tests may depend on."""
+    impact_map = TestImpactMap(str(project), str(tmp_path_factory.mktemp("cache") / "impact.json"))
+    scans = []
+    project_files = TestImpactMap._project_files
+    monkeypatch.setattr(TestImpactMap, "_project_files", lambda self: scans.append(1) or project_files(self))
+    
+    first = impact_map.fingerprints()
+    assert sorted(first) == ["tests/test_core.py", "tests/test_helpers.py"] and len(scans) == 1
+    
+    (project / "pkg" / "helpers.py").write_text("from .core import VALUE\n\n\ndef double():\n    return VALUE + VALUE\n")
+    second = impact_map.fingerprints(["tests/test_core.py", "tests/./test_helpers.py", "tests/test_missing.py"])
+    assert second["tests/test_core.py"] == first["tests/test_core.py"]
+    assert second["tests/test_helpers.py"] not in (None, first["tests/test_helpers.py"])
+    assert second["tests/test_missing.py"] is None and len(scans) == 2
+    
+    # Files that imports don't reach, such as templates, change every fingerprint
+    (project / "pkg" / "template.txt").write_text("{{ value }}\n")
+    third = impact_map.fingerprints()
+    assert all(third[path] != second[path] for path in third)
+    
+    # Code run in subprocesses can't be traced, so such test files are never cached
+    (project / "tests" / "test_spawn.py").write_text("import subprocess\n\n\ndef test_spawn():\n    pass\n")
+    assert impact_map.fingerprints(["tests/test_spawn.py"]) == {"tests/test_spawn.py": None}
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache persists and keeps only the most recently used results."""
+    path = str(tmp_path / "results.sqlite3")
+    cache = TestResultCache(path=path, max_entries=2)
+    cache.put("a", "tests/test_a.py", 1)
+    cache.put("b", "tests/test_b.py", 1)
+    assert cache.get("a") is not None
+    cache.put("c", "tests/test_c.py", 1)
+    cache.close()
+    
+    reopened = TestResultCache(path=path, max_entries=2)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == {"test_file": "tests/test_a.py", "tests": 1}
+    assert reopened.get("c") is not None
@@ -2,8 +2,9 @@
 Test cases for utility functions.
 """
 
+import math
 import pytest
-from src.utils import calculate_factorial
+from src.utils import FactorialMemo, factorials, calculate_factorial
 
 
 def test_calculate_factorial():
@@ -18,3 +19,25 @@ def test_calculate_factorial():
     # Test edge cases
     with pytest.raises(ValueError):
         calculate_factorial(-1)
+
+
+def test_calculate_factorial_matches_math_factorial():
+    """Test large inputs, where the product is built by binary splitting."""
+    for n in (20, 21, 100, 1023, 1024, 5000):
+        assert calculate_factorial(n) == math.factorial(n)
+
+
+def test_factorials():
+    """Test the batch API and the bounded memo table."""
+    ns = [300, 5, 0, 300, 1200, 299]
+    assert factorials(ns) == [math.factorial(n) for n in ns]
+    assert factorials([]) == []
+    
+    memo = FactorialMemo(max_bytes=2000)
+    assert factorials(ns, memo) == [math.factorial(n) for n in ns]
+    assert calculate_factorial(310, memo) == math.factorial(310)
+    assert memo.nearest(1199)[0] == 310
+    assert len(memo) == 3  # 0!, 5! and 299! were least recently used and dropped to stay within budget
+    
+    with pytest.raises(ValueError):
+        factorials([3, -1])
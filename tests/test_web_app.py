@@ -0,0 +1,115 @@
+"""
+Test cases for the web application's task and history endpoints.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+import pytest
+from src import web_app
+from src.agents.registry import registry
+from src.task_history import TaskHistoryStore
+from src.task_queue import TaskQueue
+
+
+@pytest.fixture
+def web(monkeypatch):
+    """Serve the web app with a stub orchestrator and a one-worker queue holding one pending job."""
+    started = threading.Event()
+    release = threading.Event()
+    
+    def handler(job):
+        started.set()
+        while not release.wait(0.01):
+            if job.is_cancelled():
+                return {"success": False, "message": "Task cancelled"}
+        return {"success": True, "message": job.task}
+    
+    queue = TaskQueue(handler, max_workers=1, max_pending=1)
+    history = TaskHistoryStore()
+    monkeypatch.setattr(web_app, "_task_queue", queue)
+    monkeypatch.setitem(registry._instances, "orchestrator_agent", SimpleNamespace(task_history=history))
+    yield SimpleNamespace(client=web_app.app.test_client(), queue=queue, history=history, started=started,
+                          release=release)
+    release.set()
+    queue.shutdown()
+
+
+def test_tasks_are_queued_and_polled(web):
+    """Test that a task is accepted with 202 and its job can be polled until it completes."""
+    response = web.client.post("/api/task", json={"task": "first"})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert web.client.get(f"/api/task/{job_id}").get_json()["status"] in ("queued", "running")
+    
+    web.release.set()
+    web.queue.get(job_id).future.result(timeout=5)
+    job = web.client.get(f"/api/task/{job_id}").get_json()
+    assert (job["status"], job["result"]["message"]) == ("completed", "first")
+    assert web.client.post("/api/task", json={}).status_code == 400
+
+
+def test_unknown_jobs_are_not_found(web):
+    """Test that polling, cancelling and streaming an unknown job answer 404."""
+    assert web.client.get("/api/task/missing").status_code == 404
+    assert web.client.post("/api/task/missing/cancel").status_code == 404
+    assert web.client.get("/api/task/missing/events").status_code == 404
+
+
+def test_full_queue_and_cancellation(web):
+    """Test that a full queue answers 503 and queued and running jobs can be cancelled."""
+    running = web.client.post("/api/task", json={"task": "running"}).get_json()["job_id"]
+    assert web.started.wait(5)
+    queued = web.client.post("/api/task", json={"task": "queued"}).get_json()["job_id"]
+    response = web.client.post("/api/task", json={"task": "rejected"})
+    assert response.status_code == 503 and "error" in response.get_json()
+    
+    assert web.client.post(f"/api/task/{queued}/cancel").get_json()["status"] == "cancelled"
+    web.client.post(f"/api/task/{running}/cancel")
+    web.queue.get(running).future.result(timeout=5)
+    assert web.client.get(f"/api/task/{running}").get_json()["status"] == "cancelled"
+
+
+def test_history_is_paged_with_a_cursor(web):
+    """Test that history pages follow next_cursor and reject invalid cursors."""
+    for index in range(3):
+        web.history.record_completed(f"task-{index}", f"goal {index}", {"success": True})
+    
+    first = web.client.get("/api/history?limit=2").get_json()
+    assert [item["task_id"] for item in first["items"]] == ["task-2", "task-1"]
+    second = web.client.get(f"/api/history?limit=2&cursor={first['next_cursor']}").get_json()
+    assert [item["task_id"] for item in second["items"]] == ["task-0"] and second["next_cursor"] is None
+    assert web.client.get("/api/history?cursor=invalid").status_code == 400
+
+
+def _read_events(response):
+    """Parse a Server-Sent Events response body into its event payloads."""
+    body = response.get_data(as_text=True)
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def test_task_events_are_streamed_until_completion(web):
+    """Test that a job's event stream replays its events in order and ends at task_completed."""
+    job_id = web.client.post("/api/task", json={"task": "streamed"}).get_json()["job_id"]
+    web_app.event_bus.publish("step_started", task_id=job_id, step=0)
+    web_app.event_bus.publish("step_completed", task_id=job_id, step=0)
+    web_app.event_bus.publish("task_completed", task_id=job_id, result={"success": True})
+    
+    response = web.client.get(f"/api/task/{job_id}/events")
+    assert response.mimetype == "text/event-stream"
+    events = _read_events(response)
+    assert [event["type"] for event in events] == ["step_started", "step_completed", "task_completed"]
+    assert [event["id"] for event in events] == sorted(event["id"] for event in events)
+
+
+def test_jobs_cancelled_before_starting_still_complete_their_stream(web, monkeypatch):
+    """Test that a job cancelled while queued gets a synthesized task_completed event."""
+    monkeypatch.setattr(web_app, "EVENT_STREAM_KEEPALIVE", 0.01)
+    web.client.post("/api/task", json={"task": "running"})
+    assert web.started.wait(5)
+    queued = web.client.post("/api/task", json={"task": "queued"}).get_json()["job_id"]
+    web.client.post(f"/api/task/{queued}/cancel")
+    
+    events = _read_events(web.client.get(f"/api/task/{queued}/events"))
+    assert [event["type"] for event in events] == ["task_completed"]
+    assert events[0]["data"]["result"]["status"] == "cancelled"
\ No newline at end of file